@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark of every MCP tool against the local INE/Censo stub
+
+Each tool is called through FastMCP (argument validation and result
+conversion included) against benchmarks/stub_server.py, so runs need no
+network and can be compared with each other. Per tool it reports p50/p99
+latency, throughput at the chosen concurrency, peak Python memory of one
+call (tracemalloc) and the upstream requests and bytes per call.
+
+Cache modes:
+    cold  the response cache is cleared before every call (default); local
+          stores (series catalogue, search index, series histories) keep
+          their contents, as in a long-running server
+    warm  responses cached by the warm-up call are reused
+
+Usage:
+    python benchmarks/bench_tools.py --iterations 20 --concurrency 4 --json before.json
+    python benchmarks/bench_tools.py --tools Get_Table_Data,Censo_Get_Data --compare before.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import stub_server
+
+# One representative call per tool in tools.py
+TOOL_ARGS: Dict[str, Dict[str, Any]] = {
+    "List_Operations": {},
+    "Get_Operation_Info": {"operation_code": "IPC"},
+    "Get_Operation_Tables": {"operation_code": "IPC"},
+    "Get_Operation_Variables": {"operation_code": "IPC"},
+    "Get_Variable_Values_Operation": {"variable_id": 115, "operation_code": "IPC"},
+    "Get_Table_Groups": {"table_id": 50902},
+    "Get_Group_Values": {"table_id": 50902, "group_id": 81497},
+    "Get_Table_Series": {"table_id": 50902},
+    "Get_Table_Data": {"table_id": 50902, "last_periods": 12},
+    "Get_Series_Info": {"series_code": "IPC251856"},
+    "Get_Series_Values": {"series_code": "IPC251856"},
+    "Get_Series_Data": {"series_code": "IPC251856", "last_periods": 24},
+    "Get_Multiple_Series_Data": {"series_codes": ["IPC251856", "IPC251852", "IPC251855"], "last_periods": 12},
+    "Get_Operation_Series": {"operation_code": "IPC", "name_filter": "Madrid"},
+    "Index_Operation_Series": {"operation_code": "IPC"},
+    "Search_Operation_Series": {"operation_code": "IPC", "name_filter": "Madrid"},
+    "Get_Operation_Data_Filtered": {"operation_code": "IPC", "periodicity": 1, "last_periods": 1,
+                                    "filter_g1": "115:29"},
+    "Get_Series_Metadata_Operation": {"operation_code": "IPC", "periodicity": 1, "filter_g1": "115:29"},
+    "Get_All_Variables": {},
+    "Get_Variable_Values": {"variable_id": 115},
+    "Get_Child_Values": {"variable_id": 70, "value_id": 8997},
+    "Get_Periodicities": {},
+    "Get_Publications": {},
+    "Get_Classifications": {},
+    "Search_Data": {"query": "precios consumo"},
+    "Get_Latest_Data": {"operation_code": "IPC", "all_tables": True},
+    "Get_Cache_Stats": {},
+    "Get_Upstream_Metrics": {},
+    "Censo_List_Tables": {},
+    "Censo_List_Variables": {"tabla": "per.ppal"},
+    "Censo_Get_Data": {"tabla": "per.ppal", "variables": "ID_RESIDENCIA_N1,ID_SEXO"},
+    "Censo_Population_By_Location": {"level": "N1"},
+    "Censo_Population_Pyramid": {},
+    "Censo_Housing_By_Tenure": {},
+    "Censo_Households_By_Size": {},
+    "Censo_Education_Level": {},
+    "Censo_Nationality": {},
+    "Censo_Family_Nuclei": {},
+}
+
+
+def configure(server, cache_dir: str) -> None:
+    """Point mcp_ine at the stub; must run before mcp_ine is imported"""
+    os.environ.update(stub_server.urls(server))
+    os.environ['INE_CACHE_DIR'] = cache_dir
+    os.environ.setdefault('INE_RATE_LIMIT', '0')  # measure the tools, not the client-side throttle
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(int(q * len(ordered) + 0.5) - 1, 0))]
+
+
+def failed(result: Any) -> bool:
+    """Whether a call_tool result carries an INE-style error"""
+    if isinstance(result, tuple):  # (content, structured output)
+        result = result[1]
+    if isinstance(result, dict) and set(result) == {'result'}:
+        result = result['result']
+    if isinstance(result, list) and result and isinstance(result[0], dict):
+        result = result[0]
+    return isinstance(result, dict) and 'error' in result
+
+
+async def bench_tool(mcp, response_cache, stub: stub_server.StubConfig, name: str, arguments: Dict[str, Any],
+                     iterations: int, concurrency: int, cold: bool) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def call() -> None:
+        nonlocal errors
+        async with semaphore:
+            if cold:
+                response_cache.clear()
+            started = time.perf_counter()
+            try:
+                errors += failed(await mcp.call_tool(name, arguments))
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    await call()  # warm-up: connections, lazy indexes, warm cache
+    latencies.clear()
+    errors = 0
+    requests_before, bytes_before = stub.requests, stub.bytes
+    started = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(iterations)))
+    wall = time.perf_counter() - started
+    upstream_requests, upstream_bytes = stub.requests - requests_before, stub.bytes - bytes_before
+
+    # Peak memory of one call, measured separately: tracemalloc slows everything down
+    if cold:
+        response_cache.clear()
+    tracemalloc.start()
+    try:
+        await mcp.call_tool(name, arguments)
+    except Exception:
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    ms = lambda seconds: round(seconds * 1000, 2) if seconds is not None else None
+    return {"calls": iterations, "errors": errors, "p50_ms": ms(percentile(latencies, 0.5)),
+            "p99_ms": ms(percentile(latencies, 0.99)), "mean_ms": ms(sum(latencies) / len(latencies)),
+            "throughput": round(iterations / wall, 2), "peak_kib": round(peak / 1024, 1),
+            "upstream_requests": round(upstream_requests / iterations, 2),
+            "upstream_kib": round(upstream_bytes / 1024 / iterations, 1)}
+
+
+def print_table(results: Dict[str, Dict[str, Any]], baseline: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+    columns = [("p50_ms", "p50 ms"), ("p99_ms", "p99 ms"), ("throughput", "calls/s"), ("peak_kib", "peak KiB"),
+               ("upstream_requests", "req/call"), ("upstream_kib", "KiB/call"), ("errors", "errors")]
+    width = max(len(name) for name in results) + 2
+    print(f"{'tool':<{width}}" + ''.join(f"{title:>16}" for _, title in columns))
+    for name, row in results.items():
+        cells = []
+        for key, _ in columns:
+            value, before = row.get(key), (baseline or {}).get(name, {}).get(key)
+            cell = f"{value}"
+            if before and value is not None and key in ('p50_ms', 'p99_ms', 'throughput', 'peak_kib'):
+                cell += f" ({(value - before) / before * 100:+.0f}%)"
+            cells.append(f"{cell:>16}")
+        print(f"{name:<{width}}" + ''.join(cells))
+
+
+async def run(args: argparse.Namespace, stub: stub_server.StubConfig) -> Dict[str, Any]:
+    from mcp_ine import tools  # noqa: F401  (registers the tools)
+    from mcp_ine.common import mcp, response_cache
+
+    names = [name.strip() for name in args.tools.split(',')] if args.tools else list(TOOL_ARGS)
+    unknown = [name for name in names if name not in TOOL_ARGS]
+    if unknown:
+        raise SystemExit(f"Unknown tools: {', '.join(unknown)}")
+    registered = {t.name for t in await mcp.list_tools()}
+    missing = sorted(registered - set(TOOL_ARGS))
+    if missing:
+        print(f"Not benchmarked (no arguments defined): {', '.join(missing)}", file=sys.stderr)
+
+    results = {}
+    for name in names:
+        results[name] = await bench_tool(mcp, response_cache, stub, name, TOOL_ARGS[name], args.iterations,
+                                         args.concurrency, args.cache == 'cold')
+        print(f"  {name}: p50 {results[name]['p50_ms']} ms", file=sys.stderr)
+    return {"settings": {"iterations": args.iterations, "concurrency": args.concurrency, "cache": args.cache,
+                         "latency": stub.latency, "jitter": stub.jitter, "series": stub.series,
+                         "points": stub.points, "python": sys.version.split()[0]},
+            "tools": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--iterations', type=int, default=20, help='Measured calls per tool')
+    parser.add_argument('--concurrency', type=int, default=1, help='Calls of the same tool in flight at once')
+    parser.add_argument('--cache', choices=('cold', 'warm'), default='cold')
+    parser.add_argument('--tools', help='Comma-separated tool names (default: all)')
+    parser.add_argument('--json', help='Write the results to this file')
+    parser.add_argument('--compare', help='Results file of an earlier run to show changes against')
+    stub_server.add_arguments(parser)
+    args = parser.parse_args()
+
+    stub = stub_server.config_from(args)
+    server = stub_server.start(stub)
+    with tempfile.TemporaryDirectory(prefix='mcp-ine-bench-') as cache_dir:
+        configure(server, cache_dir)
+        report = asyncio.run(run(args, stub))
+    server.shutdown()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)["tools"]
+    print_table(report["tools"], baseline)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Load test of one mcp-ine server process driven over the MCP protocol
+
+Starts benchmarks/stub_server.py and the server (server.main, stdio
+transport) as subprocesses, then keeps N tool calls in flight for a fixed
+time at each concurrency step. Calls are drawn from a weighted mix of
+kinds:
+
+    search  Search_Data over the local search index
+    table   Get_Table_Data / Get_Series_Data (Tempus DATOS_*)
+    censo   Censo_Get_Data / Censo_Population_By_Location (SDC21 POSTs)
+
+Per step it reports throughput, latency percentiles, errors, MCP ping
+round trip, the server's event-loop lag (from Get_Upstream_Metrics) and
+upstream requests per call. Arguments are drawn from --keys variants per
+kind, so a small value means mostly response-cache hits.
+
+Usage:
+    python benchmarks/loadtest.py --concurrency 1,4,16,64 --duration 10
+    python benchmarks/loadtest.py --mix search=1,table=3,censo=1 --keys 5000 --latency 0.1 --json load.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+
+import stub_server
+from bench_tools import percentile, failed
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+SERVER = "import asyncio; from mcp_ine import server; asyncio.run(server.main())"
+
+QUERIES = ("precios consumo", "paro", "poblacion", "producto interior bruto", "vivienda", "salarios",
+           "turismo", "Madrid", "industria", "comercio exterior")
+CENSO_TABLES = ("per.ppal", "per.estu", "per.ocu", "hog", "nuc", "viv.fam", "viv.ppal")
+CENSO_VARIABLES = ("ID_RESIDENCIA_N1,ID_SEXO", "ID_RESIDENCIA_N2,ID_SEXO", "ID_RESIDENCIA_N1,ID_EDAD",
+                   "ID_SEXO,ID_EDAD", "ID_RESIDENCIA_N1", "ID_RESIDENCIA_N3")
+LEVELS = ("N1", "N2", "N3")
+
+
+def tool_call(kind: str, key: int) -> Tuple[str, Dict[str, Any]]:
+    """Tool name and arguments of argument variant key for a mix kind"""
+    if kind == 'search':
+        return "Search_Data", {"query": QUERIES[key % len(QUERIES)], "max_results": 10}
+    if kind == 'table':
+        if key % 2:
+            return "Get_Series_Data", {"series_code": f"IPC{251856 + key // 2}", "last_periods": 24}
+        return "Get_Table_Data", {"table_id": 50902 + key // 2, "last_periods": 12}
+    if kind == 'censo':
+        if key % 4 == 3:
+            return "Censo_Population_By_Location", {"level": LEVELS[key // 4 % len(LEVELS)]}
+        return "Censo_Get_Data", {"tabla": CENSO_TABLES[key % len(CENSO_TABLES)],
+                                  "variables": CENSO_VARIABLES[key // len(CENSO_TABLES) % len(CENSO_VARIABLES)]}
+    raise ValueError(f"Unknown mix kind: {kind}")
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(','):
+        kind, _, weight = part.partition('=')
+        kind = kind.strip()
+        if kind not in ('search', 'table', 'censo'):
+            raise SystemExit(f"Unknown mix kind: {kind} (use search, table, censo)")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+def bucket_quantile(bounds: List[float], counts: List[int], q: float) -> Optional[float]:
+    """Upper bound of the bucket holding the q-quantile of per-bucket counts (None beyond the last bucket)"""
+    total, seen = sum(counts), 0
+    if not total:
+        return None
+    for bound, count in zip(bounds, counts):
+        seen += count
+        if seen >= q * total:
+            return bound
+    return None
+
+
+def structured(result: Any) -> Any:
+    """Structured output of a CallToolResult, falling back to its JSON text content"""
+    data = result.structuredContent
+    if data is None and result.content:
+        try:
+            data = json.loads(result.content[0].text)
+        except (AttributeError, ValueError):
+            return None
+    if isinstance(data, dict) and set(data) == {'result'}:
+        data = data['result']
+    return data
+
+
+async def server_metrics(session: ClientSession) -> Dict[str, Any]:
+    """Event-loop lag histogram and upstream totals from Get_Upstream_Metrics"""
+    data = structured(await session.call_tool("Get_Upstream_Metrics", {})) or {}
+    lag = data.pop('event_loop', {})
+    totals = {'requests': 0, 'errors': 0, 'cache_hits': 0, 'cache_misses': 0}
+    for endpoints in data.values():
+        for endpoint in endpoints.values():
+            for name in totals:
+                totals[name] += endpoint.get(name) or 0
+    return {'lag': lag, 'upstream': totals}
+
+
+async def sample(probe, interval: float, samples: List[float], stop: asyncio.Event) -> None:
+    """Append probe() durations every interval seconds until stop is set"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            await probe()
+        except Exception:
+            pass
+        samples.append(time.perf_counter() - started)
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def client_lag(interval: float, samples: List[float], stop: asyncio.Event) -> None:
+    """Lag of the harness's own loop: when it saturates, server figures stop meaning anything"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        due = loop.time() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(loop.time() - due, 0.0))
+
+
+async def run_step(session: ClientSession, concurrency: int, args: argparse.Namespace, mix: Dict[str, float],
+                   rng: random.Random) -> Dict[str, Any]:
+    kinds, weights = list(mix), list(mix.values())
+    latencies: Dict[str, List[float]] = {kind: [] for kind in kinds}
+    errors: Dict[str, int] = {kind: 0 for kind in kinds}
+    timeout = timedelta(seconds=args.timeout)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + args.duration
+
+    async def worker() -> None:
+        while loop.time() < deadline:
+            kind = rng.choices(kinds, weights)[0]
+            name, arguments = tool_call(kind, rng.randrange(args.keys))
+            started = time.perf_counter()
+            try:
+                result = await session.call_tool(name, arguments, read_timeout_seconds=timeout)
+                errors[kind] += bool(result.isError) or failed(structured(result))
+            except Exception:
+                errors[kind] += 1
+            latencies[kind].append(time.perf_counter() - started)
+
+    before = await server_metrics(session)
+    stop, pings, lags = asyncio.Event(), [], []
+    monitors = [asyncio.create_task(sample(session.send_ping, 0.1, pings, stop)),
+                asyncio.create_task(client_lag(0.05, lags, stop))]
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+    stop.set()
+    await asyncio.gather(*monitors)
+    after = await server_metrics(session)
+
+    ms = lambda seconds: round(seconds * 1000, 2) if seconds is not None else None
+    every = [value for values in latencies.values() for value in values]
+    calls, failures = len(every), sum(errors.values())
+    lag_before, lag_after = before['lag'], after['lag']
+    lag_counts = [b - a for a, b in zip(lag_before.get('counts', []), lag_after.get('counts', []))]
+    lag_samples = sum(lag_counts)
+    upstream = {name: after['upstream'][name] - before['upstream'][name] for name in before['upstream']}
+    lookups = upstream['cache_hits'] + upstream['cache_misses']
+    return {"concurrency": concurrency, "calls": calls, "errors": failures, "throughput": round(calls / wall, 2),
+            "p50_ms": ms(percentile(every, 0.5)), "p95_ms": ms(percentile(every, 0.95)),
+            "p99_ms": ms(percentile(every, 0.99)), "max_ms": ms(max(every, default=None)),
+            "ping_p99_ms": ms(percentile(pings, 0.99)),
+            "loop_lag_p99_ms": ms(bucket_quantile(lag_after.get('buckets', []), lag_counts, 0.99)),
+            "loop_lag_mean_ms": ms((lag_after['sum'] - lag_before['sum']) / lag_samples) if lag_samples else None,
+            "client_lag_max_ms": ms(max(lags, default=None)),
+            "upstream_requests": round(upstream['requests'] / calls, 2) if calls else None,
+            "upstream_errors": upstream['errors'],
+            "hit_ratio": round(upstream['cache_hits'] / lookups, 3) if lookups else None,
+            "kinds": {kind: {"calls": len(latencies[kind]), "errors": errors[kind],
+                             "p50_ms": ms(percentile(latencies[kind], 0.5)),
+                             "p99_ms": ms(percentile(latencies[kind], 0.99))} for kind in kinds}}
+
+
+def print_table(steps: List[Dict[str, Any]]) -> None:
+    columns = [("concurrency", "conc"), ("throughput", "calls/s"), ("p50_ms", "p50 ms"), ("p95_ms", "p95 ms"),
+               ("p99_ms", "p99 ms"), ("max_ms", "max ms"), ("ping_p99_ms", "ping p99"),
+               ("loop_lag_p99_ms", "lag p99"), ("loop_lag_mean_ms", "lag mean"), ("client_lag_max_ms", "client lag"),
+               ("upstream_requests", "req/call"), ("hit_ratio", "hit ratio"), ("errors", "errors")]
+    print(''.join(f"{title:>11}" for _, title in columns))
+    for step in steps:
+        print(''.join(f"{step.get(key)!s:>11}" for key, _ in columns))
+
+
+def start_stub(args: argparse.Namespace) -> Tuple[subprocess.Popen, Dict[str, str]]:
+    """Run the stub in its own process, so its threads do not compete with the harness loop"""
+    argv = [sys.executable, os.path.join(HERE, 'stub_server.py'), '--port', '0', '--latency', str(args.latency),
+            '--jitter', str(args.jitter), '--series', str(args.series), '--points', str(args.points),
+            '--pages', str(args.pages), '--page-size', str(args.page_size)]
+    if args.payloads:
+        argv += ['--payloads', args.payloads]
+    process = subprocess.Popen(argv, stdout=subprocess.PIPE, text=True)
+    urls = dict(process.stdout.readline().strip().split('=', 1) for _ in range(2))
+    return process, urls
+
+
+async def run(args: argparse.Namespace, urls: Dict[str, str], workdir: str) -> Dict[str, Any]:
+    mix, rng = parse_mix(args.mix), random.Random(args.seed)
+    env = {**os.environ, **urls, 'INE_CACHE_DIR': os.path.join(workdir, 'cache'),
+           'PYTHONPATH': os.pathsep.join(filter(None, [os.path.join(ROOT, 'src'),
+                                                       os.environ.get('PYTHONPATH')]))}
+    env.setdefault('INE_RATE_LIMIT', '0')  # measure the server, not the client-side throttle
+    params = StdioServerParameters(command=sys.executable, args=['-c', SERVER], env=env, cwd=workdir)
+    steps = []
+    with open(os.path.join(workdir, 'server.stderr'), 'w') as errlog:
+        async with stdio_client(params, errlog=errlog) as (read, write), ClientSession(read, write) as session:
+            await session.initialize()
+            for kind in mix:  # warm-up: connections, search index, release calendar
+                for key in range(min(args.keys, 4)):
+                    await session.call_tool(*tool_call(kind, key))
+            for concurrency in args.concurrency:
+                step = await run_step(session, concurrency, args, mix, rng)
+                print(f"  concurrency {concurrency}: {step['throughput']} calls/s, p99 {step['p99_ms']} ms",
+                      file=sys.stderr)
+                steps.append(step)
+    return {"settings": {"concurrency": args.concurrency, "duration": args.duration, "mix": mix, "keys": args.keys,
+                         "latency": args.latency, "jitter": args.jitter, "series": args.series,
+                         "points": args.points, "python": sys.version.split()[0]},
+            "steps": steps}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--concurrency', default='1,4,16,64',
+                        help='Comma-separated calls in flight, one step each')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds per concurrency step')
+    parser.add_argument('--mix', default='search=1,table=2,censo=1', help='Weighted call kinds (search, table, censo)')
+    parser.add_argument('--keys', type=int, default=1000, help='Argument variants per kind (fewer: more cache hits)')
+    parser.add_argument('--timeout', type=float, default=60, help='Seconds before a call counts as failed')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='Write the results to this file')
+    stub_server.add_arguments(parser)
+    args = parser.parse_args()
+    args.concurrency = [int(n) for n in args.concurrency.split(',')]
+    args.keys = max(args.keys, 1)
+
+    stub, urls = start_stub(args)
+    try:
+        with tempfile.TemporaryDirectory(prefix='mcp-ine-load-') as workdir:
+            report = asyncio.run(run(args, urls, workdir))
+    finally:
+        stub.terminate()
+        stub.wait()
+
+    print_table(report["steps"])
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the INE Tempus API and the Censo 2021 (SDC21) API
+
+Serves INE-shaped JSON for every Tempus function the tools call and answers
+Censo POSTs, with configurable latency and payload size, so benchmarks and
+load tests run without network access. Point the server at it with:
+
+    INE_BASE_URL=http://127.0.0.1:8765/wstempus/js
+    INE_CENSO_URL=http://127.0.0.1:8765/Censo2021/api
+
+Recorded responses can replace the generated ones: a file named
+FUNCTION.json or FUNCTION_INPUT.json (e.g. DATOS_TABLA_50902.json) in the
+--payloads directory is served as is.
+
+Usage:
+    python benchmarks/stub_server.py --port 8765 --latency 0.05 --series 50 --points 120
+"""
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+
+class StubConfig:
+    """Latency and payload size of the stub's responses"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, series: int = 20, points: int = 60,
+                 pages: int = 2, page_size: int = 100, payloads: Optional[str] = None):
+        self.latency = latency        # seconds added to every response
+        self.jitter = jitter          # extra uniform random delay, seconds
+        self.series = series          # series per table / items per catalogue list
+        self.points = points          # data points per series
+        self.pages = pages            # full pages returned by paged functions
+        self.page_size = page_size    # items per page of paged functions
+        self.payloads = payloads      # directory of recorded responses
+        self.requests = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+
+    def delay(self) -> float:
+        return self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def count(self, nbytes: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.bytes += nbytes
+
+
+# =============================================================================
+# INE-shaped payloads
+# =============================================================================
+
+OPERATIONS = [("IPC", 25, "Índice de Precios de Consumo"), ("EPA", 30, "Encuesta de Población Activa"),
+              ("IPV", 15, "Índice de Precios de Vivienda"), ("PIB", 353, "Contabilidad Nacional Trimestral"),
+              ("ETDP", 293, "Estadística de Transmisiones de Derechos de la Propiedad")]
+PROVINCES = ["Madrid", "Barcelona", "Valencia", "Sevilla", "Málaga", "Zaragoza", "Murcia", "Ávila"]
+
+
+def _ms(year: int, month: int) -> int:
+    return int(datetime(year, month, 1, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def _points(count: int) -> List[Dict[str, Any]]:
+    """The last `count` monthly data points up to the current month"""
+    now = datetime.now(timezone.utc)
+    end = now.year * 12 + now.month - 1
+    return [{"Fecha": _ms(m // 12, m % 12 + 1), "FK_TipoDato": 1, "FK_Periodo": m % 12 + 1, "Anyo": m // 12,
+             "Valor": round(100 + (m % 120) * 0.37, 3), "Secreto": False}
+            for m in range(end - count + 1, end + 1)]
+
+
+def _metadata(i: int) -> List[Dict[str, Any]]:
+    province = PROVINCES[i % len(PROVINCES)]
+    return [{"Id": 28 + i % len(PROVINCES), "FK_Variable": 115, "Nombre": province, "Codigo": f"{i % 52:02d}",
+             "Variable": {"Id": 115, "Nombre": "Provincias", "Codigo": "PROV"}},
+            {"Id": 72, "FK_Variable": 3, "Nombre": "Índice", "Codigo": "",
+             "Variable": {"Id": 3, "Nombre": "Tipo de dato", "Codigo": ""}}]
+
+
+def _series(code: str, i: int, metadata: bool) -> Dict[str, Any]:
+    series = {"Id": 1000 + i, "COD": f"{code}{i}", "FK_Operacion": 25, "FK_Periodicidad": 1 if i % 4 else 12,
+              "FK_Publicacion": 8, "FK_Clasificacion": 90, "FK_Escala": 1, "FK_Unidad": 133, "Decimales": 3,
+              "Nombre": f"{PROVINCES[i % len(PROVINCES)]}. General. Índice. Serie {i}."}
+    if metadata:
+        series["MetaData"] = _metadata(i)
+    return series
+
+
+def _range(points: List[Dict[str, Any]], date: str) -> List[Dict[str, Any]]:
+    """Points within a date=YYYYMMDD:YYYYMMDD range"""
+    start, _, end = date.partition(':')
+    low = datetime.strptime(start, '%Y%m%d').replace(tzinfo=timezone.utc).timestamp() * 1000 if start else 0
+    high = datetime.strptime(end, '%Y%m%d').replace(tzinfo=timezone.utc).timestamp() * 1000 if end else float('inf')
+    return [p for p in points if low <= p["Fecha"] <= high]
+
+
+def tempus_payload(config: StubConfig, function: str, input_param: Optional[str],
+                   query: Dict[str, str]) -> Tuple[int, Any]:
+    """Status and body for a Tempus GET"""
+    page = int(query.get('page', '1') or 1)
+    metadata = 'M' in query.get('tip', '')
+    paged = function in ('OPERACIONES_DISPONIBLES', 'VARIABLES', 'VARIABLES_OPERACION', 'SERIES_OPERACION')
+    if paged and page > config.pages:
+        return 200, []
+    size = config.page_size if paged else config.series
+    offset = (page - 1) * size
+
+    points = _points(config.points)
+    if 'nult' in query:
+        points = points[-int(query['nult']):]
+    elif 'date' in query:
+        points = _range(points, query['date'])
+
+    if function == 'OPERACIONES_DISPONIBLES':
+        return 200, [{"Id": op_id, "Cod_IOE": f"30{op_id:03d}", "Nombre": name, "Codigo": code}
+                     for code, op_id, name in (OPERATIONS[i % len(OPERATIONS)] for i in range(offset, offset + size))]
+    if function == 'OPERACION':
+        code, op_id, name = next((op for op in OPERATIONS if input_param in (op[0], str(op[1]))), OPERATIONS[0])
+        return 200, {"Id": op_id, "Cod_IOE": f"30{op_id:03d}", "Nombre": name, "Codigo": code}
+    if function == 'TABLAS_OPERACION':
+        return 200, [{"Id": 50902 + i, "Nombre": f"Índices por provincias. Tabla {i}", "Codigo": "",
+                      "FK_Periodicidad": 1, "FK_Publicacion": 8, "Anyo_Periodo_ini": "2002",
+                      "FechaRef_fin": None, "Ultima_Modificacion": _ms(2025, 1)}
+                     for i in range(max(config.series // 4, 2))]
+    if function in ('VARIABLES', 'VARIABLES_OPERACION'):
+        return 200, [{"Id": i + 1, "Nombre": f"Variable {i + 1}", "Codigo": f"V{i + 1}"}
+                     for i in range(offset, offset + size)]
+    if function in ('VALORES_VARIABLE', 'VALORES_VARIABLEOPERACION', 'VALORES_HIJOS', 'VALORES_GRUPOSTABLA',
+                    'VALORES_SERIE'):
+        return 200, [{"Id": 28 + i, "FK_Variable": 115, "Nombre": PROVINCES[i % len(PROVINCES)], "Codigo": f"{i:02d}"}
+                     for i in range(config.series)]
+    if function == 'GRUPOS_TABLA':
+        return 200, [{"Id": 81497, "Nombre": "Provincias"}, {"Id": 81498, "Nombre": "Tipo de dato"}]
+    if function in ('SERIES_OPERACION', 'SERIES_TABLA', 'SERIE_METADATAOPERACION'):
+        return 200, [_series(input_param or 'IPC', i, metadata or function == 'SERIE_METADATAOPERACION')
+                     for i in range(offset, offset + size)]
+    if function == 'SERIE':
+        return 200, {**_series('IPC', 0, metadata), "COD": input_param}
+    if function == 'DATOS_SERIE':
+        return 200, {**_series('IPC', 0, metadata), "COD": input_param, "Data": points}
+    if function in ('DATOS_TABLA', 'DATOS_METADATAOPERACION'):
+        return 200, [{**_series(f'T{input_param}-', i, metadata), "Data": points} for i in range(config.series)]
+    if function in ('PUBLICACIONES', 'PUBLICACIONES_OPERACION'):
+        return 200, [{"Id": 8, "Nombre": "Índice de Precios de Consumo", "FK_Periodicidad": 1}]
+    if function == 'PUBLICACIONFECHA_PUBLICACION':
+        now = time.time()
+        return 200, [{"Id": i, "Nombre": "Publicación", "FK_Periodo": 1, "Anyo": 2025,
+                      "Fecha": int((now + days * 86400) * 1000)} for i, days in enumerate((-20, 10, 40))]
+    if function == 'PERIODICIDADES':
+        return 200, [{"Id": 1, "Nombre": "Mensual", "Codigo": "M"}, {"Id": 3, "Nombre": "Trimestral", "Codigo": "T"},
+                     {"Id": 12, "Nombre": "Anual", "Codigo": "A"}]
+    if function in ('CLASIFICACIONES', 'CLASIFICACIONES_OPERACION'):
+        return 200, [{"Id": 90, "Nombre": "Base 2021", "Fecha": _ms(2021, 1)}]
+    return 404, {"status": f"Unknown function {function}"}
+
+
+def censo_payload(config: StubConfig, body: Dict[str, Any]) -> Dict[str, Any]:
+    """SDC21 response: metadata plus one row per combination of the grouping variables"""
+    variables, metrics = body.get('variables') or [], body.get('metrica') or ['SPERSONAS']
+    rows = max(config.series * 4, 1)
+    return {"metadata": [{"Variable": v, "Nombre": v.replace('ID_', '').title()} for v in variables],
+            "data": [{**{v: str((r >> (2 * k)) % 4 + 1) for k, v in enumerate(variables)},
+                      **{m: 1000 + r * 17 for m in metrics}} for r in range(rows)]}
+
+
+# =============================================================================
+# HTTP server
+# =============================================================================
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def log_message(self, *args):
+        pass
+
+    @property
+    def config(self) -> StubConfig:
+        return self.server.config
+
+    def _send(self, status: int, body: Any) -> None:
+        data = body if isinstance(body, bytes) else json.dumps(body, ensure_ascii=False).encode('utf-8')
+        time.sleep(self.config.delay())
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):  # client gave up, e.g. a cancelled read-ahead page
+            self.close_connection = True
+            return
+        self.config.count(len(data))
+
+    def _recorded(self, *names: str) -> Optional[bytes]:
+        if not self.config.payloads:
+            return None
+        for name in names:
+            path = os.path.join(self.config.payloads, f"{name}.json")
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    return f.read()
+        return None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        # /wstempus/js/{language}/{function}[/{input}]
+        parts = [p for p in url.path.split('/') if p]
+        if len(parts) < 4 or parts[:2] != ['wstempus', 'js']:
+            return self._send(404, {"status": "Not found"})
+        function, input_param = parts[3], parts[4] if len(parts) > 4 else None
+        recorded = self._recorded(f"{function}_{input_param}", function) if input_param else self._recorded(function)
+        if recorded is not None:
+            return self._send(200, recorded)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        self._send(*tempus_payload(self.config, function, input_param, query))
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        if urlsplit(self.path).path.rstrip('/') != '/Censo2021/api':
+            return self._send(404, {"status": "Not found"})
+        recorded = self._recorded(f"CENSO_{body.get('tabla')}")
+        self._send(200, recorded if recorded is not None else censo_payload(self.config, body))
+
+
+def start(config: Optional[StubConfig] = None, host: str = '127.0.0.1', port: int = 0) -> ThreadingHTTPServer:
+    """Start the stub in a background thread; server.server_address gives the bound port"""
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    server.config = config or StubConfig()
+    threading.Thread(target=server.serve_forever, name='ine-stub', daemon=True).start()
+    return server
+
+
+def urls(server: ThreadingHTTPServer) -> Dict[str, str]:
+    """INE_BASE_URL, INE_CENSO_URL and INE_PAGE_SIZE values pointing at a running stub"""
+    host, port = server.server_address[:2]
+    return {'INE_BASE_URL': f"http://{host}:{port}/wstempus/js", 'INE_CENSO_URL': f"http://{host}:{port}/Censo2021/api",
+            'INE_PAGE_SIZE': str(server.config.page_size)}
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Stub options shared by the benchmark and load-test scripts"""
+    parser.add_argument('--latency', type=float, default=0.02, help='Seconds added to every stub response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra random delay per response, seconds')
+    parser.add_argument('--series', type=int, default=20, help='Series per table and items per catalogue list')
+    parser.add_argument('--points', type=int, default=60, help='Data points per series')
+    parser.add_argument('--pages', type=int, default=2, help='Full pages returned by paged functions')
+    parser.add_argument('--page-size', type=int, default=100, help='Items per page of paged functions')
+    parser.add_argument('--payloads', help='Directory of recorded responses (FUNCTION[_INPUT].json, CENSO_tabla.json)')
+
+
+def config_from(args: argparse.Namespace) -> StubConfig:
+    return StubConfig(args.latency, args.jitter, args.series, args.points, args.pages, args.page_size, args.payloads)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    add_arguments(parser)
+    args = parser.parse_args()
+    server = start(config_from(args), args.host, args.port)
+    for name, value in urls(server).items():
+        print(f"{name}={value}", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
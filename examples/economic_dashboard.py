@@ -4,9 +4,10 @@ Example: Economic Dashboard
 Get the latest economic indicators from INE
 """
 
+import asyncio
 from mcp_ine.tools import Get_Latest_Data
 
-def main():
+async def main():
     print("=" * 50)
     print("SPANISH ECONOMIC DASHBOARD")
     print("=" * 50)
@@ -15,7 +16,7 @@ def main():
     # Consumer Price Index
     print("📊 Consumer Price Index (IPC)")
     try:
-        cpi = Get_Latest_Data("IPC")
+        cpi = await Get_Latest_Data("IPC")
         print(f"   {cpi}")
     except Exception as e:
         print(f"   Error: {e}")
@@ -24,7 +25,7 @@ def main():
     # Industrial Production
     print("🏭 Industrial Production (IPI)")
     try:
-        ipi = Get_Latest_Data("IPI")
+        ipi = await Get_Latest_Data("IPI")
         print(f"   {ipi}")
     except Exception as e:
         print(f"   Error: {e}")
@@ -33,7 +34,7 @@ def main():
     # Housing Prices
     print("🏠 Housing Price Index (IPV)")
     try:
-        ipv = Get_Latest_Data("IPV")
+        ipv = await Get_Latest_Data("IPV")
         print(f"   {ipv}")
     except Exception as e:
         print(f"   Error: {e}")
@@ -42,7 +43,7 @@ def main():
     # Employment
     print("👥 Labor Force Survey (EPA)")
     try:
-        epa = Get_Latest_Data("EPA")
+        epa = await Get_Latest_Data("EPA")
         print(f"   {epa}")
     except Exception as e:
         print(f"   Error: {e}")
@@ -51,4 +52,4 @@ def main():
     print("=" * 50)
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -4,10 +4,11 @@ Example: Search and Discovery
 Find relevant datasets using search and filters
 """
 
+import asyncio
 from mcp_ine.tools import Search_Data, List_Operations
 import json
 
-def main():
+async def main():
     print("=" * 50)
     print("SEARCH AND DISCOVERY")
     print("=" * 50)
@@ -16,7 +17,7 @@ def main():
     # Search for housing-related data
     print("🔍 Searching for 'vivienda' (housing)...")
     try:
-        results = Search_Data(query="vivienda", max_results=5)
+        results = await Search_Data(query="vivienda", max_results=5)
         print(f"Found {len(results)} operations/tables:")
         print(json.dumps(results, indent=2, ensure_ascii=False))
     except Exception as e:
@@ -29,7 +30,7 @@ def main():
     # List price-related operations
     print("💰 Price-related operations...")
     try:
-        operations = List_Operations(filter_text="precio")
+        operations = await List_Operations(filter_text="precio")
         print(f"Found {len(operations)} operations:")
         for op in operations[:10]:
             print(f"  - {op.get('Nombre', 'N/A')} ({op.get('Codigo', 'N/A')})")
@@ -43,7 +44,7 @@ def main():
     # Search for employment data
     print("👥 Searching for employment data...")
     try:
-        results = Search_Data(query="empleo", max_results=3)
+        results = await Search_Data(query="empleo", max_results=3)
         print(f"Found {len(results)} results:")
         print(json.dumps(results, indent=2, ensure_ascii=False))
     except Exception as e:
@@ -53,4 +54,4 @@ def main():
     print("=" * 50)
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
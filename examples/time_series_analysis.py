@@ -4,10 +4,11 @@ Example: Time Series Analysis
 Analyze CPI trends over the last 2 years
 """
 
+import asyncio
 from mcp_ine.tools import Get_Table_Data
 import json
 
-def main():
+async def main():
     print("=" * 50)
     print("CPI TIME SERIES ANALYSIS")
     print("=" * 50)
@@ -17,10 +18,9 @@ def main():
     
     try:
         # Get 2 years of monthly CPI data
-        data = Get_Table_Data(
+        data = await Get_Table_Data(
             table_id=50902,      # National CPI table
-            last_periods=24,     # Last 24 months
-            period_type="M"      # Monthly data
+            last_periods=24      # Last 24 months
         )
         
         if data and len(data) > 0:
@@ -59,4 +59,4 @@ def main():
     print("=" * 50)
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -0,0 +1,113 @@
+"""Circuit breaker - Fail fast while an upstream host is erroring"""
+import threading, time
+from collections import deque
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a host whose circuit is open"""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"{host} is unavailable (circuit open); retrying in {retry_in:.0f}s")
+        self.host, self.retry_in = host, retry_in
+
+
+class CircuitBreaker:
+    """Closed -> open -> half-open state machine for one host
+
+    The circuit opens when at least `min_calls` calls finished in the last
+    `window` seconds and the share of failures reaches `threshold`. After
+    `cooldown` seconds one probe call is let through (half-open): success
+    closes the circuit, failure opens it again. A probe that never reports
+    back is replaced after another cooldown.
+    """
+
+    def __init__(self, threshold: float = 0.5, min_calls: int = 5, window: float = 60, cooldown: float = 30):
+        self.threshold, self.min_calls, self.window, self.cooldown = threshold, max(min_calls, 1), window, cooldown
+        self.state = 'closed'
+        self.opened_at = 0.0
+        self.probe_at: Optional[float] = None
+        self._calls: deque = deque()  # (finished, ok)
+        self._lock = threading.Lock()
+        self.counters = {'opened': 0, 'rejected': 0}
+
+    def allow(self) -> float:
+        """0 when a call may go ahead, otherwise the seconds until the next probe"""
+        with self._lock:
+            if self.state == 'closed':
+                return 0.0
+            now = time.monotonic()
+            if self.state == 'open' and now - self.opened_at >= self.cooldown:
+                self.state = 'half_open'
+            if self.state == 'half_open' and (self.probe_at is None or now - self.probe_at >= self.cooldown):
+                self.probe_at = now
+                return 0.0
+            self.counters['rejected'] += 1
+            return max(self.opened_at + self.cooldown - now, 0.0) or self.cooldown
+
+    def record(self, ok: bool) -> None:
+        """Report how a call that was allowed ended"""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == 'half_open':
+                self.probe_at = None
+                if ok:
+                    self.state = 'closed'
+                    self._calls.clear()
+                else:
+                    self._open(now)
+                return
+            self._calls.append((now, ok))
+            while self._calls and self._calls[0][0] < now - self.window:
+                self._calls.popleft()
+            failures = sum(1 for _, success in self._calls if not success)
+            if (self.state == 'closed' and len(self._calls) >= self.min_calls
+                    and failures >= self.threshold * len(self._calls)):
+                self._open(now)
+
+    def _open(self, now: float) -> None:
+        self.state, self.opened_at = 'open', now
+        self.counters['opened'] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            failures = sum(1 for _, ok in self._calls if not ok)
+            return {'state': self.state, 'recent_calls': len(self._calls), 'recent_failures': failures,
+                    **self.counters}
+
+
+class HostBreakers:
+    """One circuit breaker per upstream host; a threshold of 0 disables them"""
+
+    def __init__(self, threshold: float = 0.5, min_calls: int = 5, window: float = 60, cooldown: float = 30):
+        self.threshold, self.min_calls, self.window, self.cooldown = threshold, min_calls, window, cooldown
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[CircuitBreaker]:
+        if self.threshold <= 0:
+            return None
+        host = urlsplit(url).netloc
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    host, CircuitBreaker(self.threshold, self.min_calls, self.window, self.cooldown))
+        return breaker
+
+    def check(self, url: str) -> None:
+        """Raise CircuitOpenError when the host's circuit does not let this call through"""
+        breaker = self.get(url)
+        retry_in = breaker.allow() if breaker else 0.0
+        if retry_in:
+            raise CircuitOpenError(urlsplit(url).netloc, retry_in)
+
+    def record(self, url: str, ok: bool) -> None:
+        breaker = self.get(url)
+        if breaker:
+            breaker.record(ok)
+
+    def stats(self) -> Dict[str, Any]:
+        """Circuit state and recent failures per host"""
+        return {host: breaker.stats() for host, breaker in list(self._breakers.items())}
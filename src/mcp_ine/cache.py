@@ -0,0 +1,225 @@
+"""Response cache - In-memory LRU backed by a persistent SQLite tier"""
+import asyncio, hashlib, json, logging, os, sqlite3, threading, time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+logger = logging.getLogger('mcp_ine')
+
+
+def cache_key(url: str, params: Optional[Dict] = None) -> str:
+    """Canonical cache key: URL plus sorted query parameters"""
+    if not params:
+        return url
+    items = sorted((str(k), str(v)) for k, v in params.items() if v is not None)
+    return f"{url}?{urlencode(items)}" if items else url
+
+
+def payload_key(url: str, payload: Dict[str, Any]) -> str:
+    """Canonical cache key for a JSON POST: URL plus key-sorted payload"""
+    return f"{url}#{json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':'))}"
+
+
+def body_digest(body: str) -> str:
+    """Content hash used to detect unchanged bodies when INE sends no validators"""
+    return hashlib.sha256(body.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    size: int  # bytes of the raw JSON body, counted against the memory budget
+    expires: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    digest: Optional[str] = None
+
+    @property
+    def fresh(self) -> bool:
+        return self.expires > time.time()
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers from the stored validators"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Two-tier cache for decoded upstream responses
+
+    Memory tier: LRU of decoded objects, bounded by entry count and by the
+    total size of their JSON bodies (the bodies themselves are not kept).
+    Disk tier: SQLite file with the raw JSON bodies, so the cache survives
+    restarts. Values handed out are shared between callers and must be
+    treated as read-only.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 512,
+                 retention: float = 7 * 86400, max_bytes: int = 128 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.retention = retention
+        self._memory: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0, 'revalidated': 0}
+        if path:
+            self._open(path)
+
+    def _open(self, path: str) -> None:
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS responses ("
+                       "key TEXT PRIMARY KEY, body TEXT NOT NULL, expires REAL NOT NULL)")
+            columns = {row[1] for row in db.execute("PRAGMA table_info(responses)")}
+            for column in ('etag', 'last_modified', 'digest'):
+                if column not in columns:
+                    db.execute(f"ALTER TABLE responses ADD COLUMN {column} TEXT")
+            db.execute("DELETE FROM responses WHERE expires < ?", (time.time() - self.retention,))
+            self._db = db
+        except sqlite3.Error as e:
+            logger.warning(f"Disk cache disabled ({path}): {e}")
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= previous.size
+        self._memory[key] = entry
+        self._memory_bytes += entry.size
+        while self._memory and (len(self._memory) > self.max_entries or self._memory_bytes > self.max_bytes):
+            self._memory_bytes -= self._memory.popitem(last=False)[1].size
+
+    def _find(self, key: str):
+        """Return (entry, tier) from memory or disk, fresh or not"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry, 'memory'
+            if self._db is None:
+                return None, None
+            try:
+                row = self._db.execute("SELECT body, expires, etag, last_modified, digest "
+                                       "FROM responses WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Disk cache read failed: {e}")
+                return None, None
+            if row is None:
+                return None, None
+            entry = CacheEntry(json.loads(row[0]), len(row[0]), *row[1:])
+            self._remember(key, entry)
+            return entry, 'disk'
+
+    def _memory_entry(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+            return entry
+
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        """Find an entry in memory or on disk, fresh or not"""
+        return self._find(key)[0]
+
+    async def lookup_async(self, key: str) -> Optional[CacheEntry]:
+        """lookup() with the disk tier (SELECT and decode) in a worker thread; memory hits stay inline"""
+        entry = self._memory_entry(key)
+        if entry is not None or self._db is None:
+            return entry
+        return (await asyncio.to_thread(self._find, key))[0]
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a fresh cached value, counting hits and misses"""
+        return self._count(*self._find(key))
+
+    async def get_async(self, key: str) -> Optional[Any]:
+        """get() with the disk tier in a worker thread; memory hits stay inline"""
+        entry, tier = self._memory_entry(key), 'memory'
+        if entry is None and self._db is not None:
+            entry, tier = await asyncio.to_thread(self._find, key)
+        return self._count(entry, tier)
+
+    def _count(self, entry: Optional[CacheEntry], tier: Optional[str]) -> Optional[Any]:
+        if entry is None or not entry.fresh:
+            self.counters['misses'] += 1
+            return None
+        self.counters[f'{tier}_hits'] += 1
+        return entry.value
+
+    def put(self, key: str, value: Any, ttl: float, body: Optional[str] = None,
+            etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Store a decoded value, its raw JSON body and validators for ttl seconds"""
+        if ttl <= 0:
+            return
+        body = body if body is not None else json.dumps(value)
+        entry = CacheEntry(value, len(body), time.time() + ttl, etag, last_modified, body_digest(body))
+        with self._lock:
+            self._remember(key, entry)
+            self.counters['stores'] += 1
+            if self._db is not None:
+                try:
+                    self._db.execute("INSERT OR REPLACE INTO responses "
+                                     "(key, body, expires, etag, last_modified, digest) VALUES (?, ?, ?, ?, ?, ?)",
+                                     (key, body, entry.expires, etag, last_modified, entry.digest))
+                except sqlite3.Error as e:
+                    logger.warning(f"Disk cache write failed: {e}")
+
+    def refresh(self, key: str, entry: CacheEntry, ttl: float, etag: Optional[str] = None,
+                last_modified: Optional[str] = None) -> Any:
+        """Extend an unchanged entry (304 or identical body) and return its existing value
+
+        The decoded object is kept as is, so anything derived from it stays valid.
+        """
+        entry.expires = time.time() + max(ttl, 0)
+        entry.etag = etag or entry.etag
+        entry.last_modified = last_modified or entry.last_modified
+        with self._lock:
+            self._remember(key, entry)
+            self.counters['revalidated'] += 1
+            if self._db is not None:
+                try:
+                    self._db.execute("UPDATE responses SET expires = ?, etag = ?, last_modified = ? WHERE key = ?",
+                                     (entry.expires, entry.etag, entry.last_modified, key))
+                except sqlite3.Error as e:
+                    logger.warning(f"Disk cache write failed: {e}")
+        return entry.value
+
+    def set_expiry(self, key: str, expires: float) -> None:
+        """Override when an entry expires (e.g. at the next scheduled release)"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                entry.expires = expires
+            if self._db is not None:
+                try:
+                    self._db.execute("UPDATE responses SET expires = ? WHERE key = ?", (expires, key))
+                except sqlite3.Error as e:
+                    logger.warning(f"Disk cache write failed: {e}")
+
+    def clear(self) -> None:
+        """Drop every cached entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and tier sizes"""
+        hits = self.counters['memory_hits'] + self.counters['disk_hits']
+        lookups = hits + self.counters['misses']
+        disk_entries = None
+        if self._db is not None:
+            with self._lock:
+                disk_entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {**self.counters, 'hit_ratio': round(hits / lookups, 4) if lookups else None,
+                'memory_entries': len(self._memory), 'memory_bytes': self._memory_bytes,
+                'disk_entries': disk_entries}
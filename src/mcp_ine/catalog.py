@@ -0,0 +1,176 @@
+"""Series catalogue - Persistent local index of the series of each operation"""
+import hashlib, json, logging, os, sqlite3, threading, time, unicodedata
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger('mcp_ine')
+
+
+def fold(text: Any) -> str:
+    """Lowercase and strip accents, so 'Población' matches 'poblacion'"""
+    decomposed = unicodedata.normalize('NFKD', str(text or ''))
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def _fk(value: Any) -> Any:
+    """FK_* fields are plain ids, or objects with an Id at higher detail levels"""
+    return value.get('Id') if isinstance(value, dict) else value
+
+
+def _series_values(series: Dict[str, Any]) -> List[tuple]:
+    """(variable id, variable name, value id, value code, value name) pairs from tip=M MetaData"""
+    pairs = []
+    for value in series.get('MetaData') or []:
+        if not isinstance(value, dict):
+            continue
+        variable = value.get('Variable') if isinstance(value.get('Variable'), dict) else {}
+        pairs.append((variable.get('Id', value.get('FK_Variable')), variable.get('Nombre'),
+                      value.get('Id'), value.get('Codigo'), value.get('Nombre')))
+    return pairs
+
+
+class SeriesCatalog:
+    """SQLite index of SERIES_OPERACION (tip=M) pages, refreshed page by page
+
+    Each page's content hash is stored, so a refresh only rewrites the pages
+    that changed. Queries by name, periodicity and variable values are
+    answered locally without upstream calls.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._lock = threading.Lock()
+        self._db = self._open(path or ':memory:')
+
+    def _open(self, path: str) -> sqlite3.Connection:
+        try:
+            if path != ':memory:':
+                os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        except sqlite3.Error as e:
+            logger.warning(f"Series catalogue kept in memory ({path}): {e}")
+            db = sqlite3.connect(':memory:', check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript("""
+            CREATE TABLE IF NOT EXISTS operations (operation TEXT PRIMARY KEY, refreshed REAL NOT NULL,
+                                                   pages INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS pages (operation TEXT NOT NULL, page INTEGER NOT NULL, digest TEXT NOT NULL,
+                                              PRIMARY KEY (operation, page));
+            CREATE TABLE IF NOT EXISTS series (cod TEXT PRIMARY KEY, operation TEXT NOT NULL, page INTEGER NOT NULL,
+                                               name TEXT, folded TEXT, periodicity INTEGER, unit INTEGER,
+                                               scale INTEGER, data TEXT NOT NULL);
+            CREATE INDEX IF NOT EXISTS series_operation ON series (operation, periodicity);
+            CREATE INDEX IF NOT EXISTS series_page ON series (operation, page);
+            CREATE TABLE IF NOT EXISTS series_values (cod TEXT NOT NULL, variable INTEGER, variable_name TEXT,
+                                                      value INTEGER, code TEXT, name TEXT, folded TEXT);
+            CREATE INDEX IF NOT EXISTS series_values_cod ON series_values (cod);
+            CREATE INDEX IF NOT EXISTS series_values_folded ON series_values (folded, cod);
+            CREATE INDEX IF NOT EXISTS series_values_code ON series_values (code, cod);
+        """)
+        return db
+
+    @staticmethod
+    def page_digest(page: List[Dict[str, Any]]) -> str:
+        return hashlib.sha1(json.dumps(page, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+    def page_changed(self, operation: str, page: int, digest: str) -> bool:
+        with self._lock:
+            row = self._db.execute("SELECT digest FROM pages WHERE operation = ? AND page = ?",
+                                   (operation, page)).fetchone()
+        return row is None or row[0] != digest
+
+    def store_page(self, operation: str, page: int, series: List[Dict[str, Any]], digest: str) -> None:
+        """Replace the indexed series of one page"""
+        rows, values = [], []
+        for s in series:
+            if not isinstance(s, dict) or not s.get('COD'):
+                continue
+            rows.append((s['COD'], operation, page, s.get('Nombre'), fold(s.get('Nombre')),
+                         _fk(s.get('FK_Periodicidad')), _fk(s.get('FK_Unidad')), _fk(s.get('FK_Escala')),
+                         json.dumps(s, ensure_ascii=False)))
+            values.extend((s['COD'], *pair, fold(pair[4])) for pair in _series_values(s))
+        with self._lock:
+            db = self._db
+            db.execute("BEGIN")
+            try:
+                db.execute("DELETE FROM series_values WHERE cod IN "
+                           "(SELECT cod FROM series WHERE operation = ? AND page = ?)", (operation, page))
+                db.execute("DELETE FROM series WHERE operation = ? AND page = ?", (operation, page))
+                db.executemany("DELETE FROM series_values WHERE cod = ?", [(r[0],) for r in rows])
+                db.executemany("INSERT OR REPLACE INTO series VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                db.executemany("INSERT INTO series_values VALUES (?, ?, ?, ?, ?, ?, ?)", values)
+                db.execute("INSERT OR REPLACE INTO pages VALUES (?, ?, ?)", (operation, page, digest))
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    def finish(self, operation: str, pages: int) -> None:
+        """Drop pages past the last one and mark the operation as refreshed"""
+        with self._lock:
+            db = self._db
+            db.execute("BEGIN")
+            db.execute("DELETE FROM series_values WHERE cod IN "
+                       "(SELECT cod FROM series WHERE operation = ? AND page > ?)", (operation, pages))
+            db.execute("DELETE FROM series WHERE operation = ? AND page > ?", (operation, pages))
+            db.execute("DELETE FROM pages WHERE operation = ? AND page > ?", (operation, pages))
+            db.execute("INSERT OR REPLACE INTO operations VALUES (?, ?, ?)", (operation, time.time(), pages))
+            db.execute("COMMIT")
+
+    def refreshed(self, operation: str) -> Optional[float]:
+        """When the operation was last fully indexed, or None if never"""
+        with self._lock:
+            row = self._db.execute("SELECT refreshed FROM operations WHERE operation = ?", (operation,)).fetchone()
+        return row[0] if row else None
+
+    def search(self, operation: str, name_filter: Optional[str] = None, periodicity: Optional[int] = None,
+               values: Optional[List[str]] = None, limit: int = 100,
+               include_metadata: bool = False) -> List[Dict[str, Any]]:
+        """Indexed series of an operation matching every given criterion
+
+        Each entry of `values` must match one of the series' variable values,
+        by code or accent-insensitive name; 'Variable=Value' also constrains
+        the variable name.
+        """
+        sql, args = ["SELECT data FROM series s WHERE operation = ?"], [operation]
+        if name_filter:
+            sql.append("AND folded LIKE ? ESCAPE '\\'")
+            args.append('%' + fold(name_filter).replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+        if periodicity:
+            sql.append("AND periodicity = ?")
+            args.append(periodicity)
+        for term in values or []:
+            variable, _, value = str(term).rpartition('=')
+            sql.append("AND EXISTS (SELECT 1 FROM series_values v WHERE v.cod = s.cod AND (v.folded = ? OR v.code = ?)")
+            args += [fold(value.strip()), value.strip()]
+            if variable.strip():
+                sql.append("AND (lower(v.variable_name) = lower(?) OR CAST(v.variable AS TEXT) = ?)")
+                args += [variable.strip(), variable.strip()]
+            sql.append(")")
+        sql.append("ORDER BY page, rowid LIMIT ?")
+        args.append(limit)
+        with self._lock:
+            rows = self._db.execute(' '.join(sql), args).fetchall()
+        result = [json.loads(row[0]) for row in rows]
+        if not include_metadata:
+            for s in result:
+                s.pop('MetaData', None)
+        return result
+
+    def operations(self) -> List[str]:
+        """Codes of every indexed operation"""
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT operation FROM operations")]
+
+    def documents(self, operation: str) -> List[tuple]:
+        """(ref, code, name, operation, operation id) of each indexed series, for the search index"""
+        with self._lock:
+            return [(cod, cod, name, operation, None) for cod, name in
+                    self._db.execute("SELECT cod, name FROM series WHERE operation = ?", (operation,))]
+
+    def stats(self) -> Dict[str, Any]:
+        """Indexed operations with their series counts and refresh times"""
+        with self._lock:
+            rows = self._db.execute("SELECT o.operation, o.refreshed, o.pages, COUNT(s.cod) FROM operations o "
+                                    "LEFT JOIN series s ON s.operation = o.operation GROUP BY o.operation").fetchall()
+        return {op: {'series': count, 'pages': pages,
+                     'refreshed': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(refreshed))}
+                for op, refreshed, pages, count in rows}
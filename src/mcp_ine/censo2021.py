@@ -7,12 +7,18 @@ Content-Type: application/json
 This module provides access to Spain's 2021 Census data through the SDC21 API.
 """
 
-import requests
+import asyncio
+import os
+import time
 from typing import List, Dict, Any, Optional
-from .common import logger
+from .common import (logger, sessions, async_clients, coalesced, coalesced_async, response_cache, send, send_async,
+                     serve_stale, serve_stale_async, upstream_metrics, tracer, _cache_ttl)
+from .breaker import CircuitOpenError
+from .tracing import KIND_CLIENT
+from .cache import payload_key
 
 # Censo 2021 API Configuration
-CENSO_API_URL = "https://www.ine.es/Censo2021/api"
+CENSO_API_URL = os.getenv('INE_CENSO_URL', 'https://www.ine.es/Censo2021/api')
 
 # Available tables in SDC21
 CENSO_TABLES = {
@@ -89,6 +95,77 @@ CENSO_NUCLEUS_VARIABLES = {
 }
 
 
+def _censo_payload(tabla: str, metrica: List[str], variables: List[str], idioma: str,
+                   filtro: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Build SDC21 request body"""
+    payload = {
+        "idioma": idioma,
+        "metrica": metrica,
+        "tabla": tabla,
+        "variables": variables
+    }
+    
+    if filtro:
+        payload["filtro"] = filtro
+    return payload
+
+
+def _censo_store(tabla: str, key: str, response: Any) -> Dict[str, Any]:
+    """Decode and cache an SDC21 response (requests or httpx)"""
+    decoding = time.perf_counter()
+    with tracer.span('json_decode', tabla=tabla, bytes=len(response.content)):
+        data = response.json()
+    upstream_metrics.decode('censo', tabla, time.perf_counter() - decoding)
+    response_cache.put(key, data, _cache_ttl('CENSO2021'), response.text)
+    return data
+
+
+def _censo_post(payload: Dict[str, Any], key: str) -> Dict[str, Any]:
+    """POST a payload to the SDC21 API, caching the response under key"""
+    tabla, response, started = payload['tabla'], None, time.perf_counter()
+    try:
+        response = send(CENSO_API_URL, lambda: sessions.get(CENSO_API_URL).post(
+            CENSO_API_URL,
+            json=payload,
+            headers={"Content-Type": "application/json"},
+            timeout=60
+        ), key)
+        upstream_metrics.request('censo', tabla, time.perf_counter() - started, len(response.content),
+                                 response.status_code < 400)
+        tracer.annotate(status_code=response.status_code, bytes=len(response.content))
+        response.raise_for_status()
+        return _censo_store(tabla, key, response)
+    except Exception as e:
+        logger.error(f"Censo 2021 API error: {e}")
+        if response is None and not isinstance(e, CircuitOpenError):
+            upstream_metrics.request('censo', tabla, time.perf_counter() - started, ok=False)
+        cached = serve_stale('censo', tabla, key, e)
+        return cached if cached is not None else {"error": str(e)}
+
+
+async def _censo_post_async(payload: Dict[str, Any], key: str) -> Dict[str, Any]:
+    """Async version of _censo_post; decoding and the cache store run in a worker thread"""
+    tabla, response, started = payload['tabla'], None, time.perf_counter()
+    try:
+        response = await send_async(CENSO_API_URL, lambda: async_clients.get(CENSO_API_URL).post(
+            CENSO_API_URL,
+            json=payload,
+            headers={"Content-Type": "application/json"},
+            timeout=60
+        ), key)
+        upstream_metrics.request('censo', tabla, time.perf_counter() - started, len(response.content),
+                                 response.status_code < 400)
+        tracer.annotate(status_code=response.status_code, bytes=len(response.content))
+        response.raise_for_status()
+        return await asyncio.to_thread(_censo_store, tabla, key, response)
+    except Exception as e:
+        logger.error(f"Censo 2021 API error: {e}")
+        if response is None and not isinstance(e, CircuitOpenError):
+            upstream_metrics.request('censo', tabla, time.perf_counter() - started, ok=False)
+        cached = await serve_stale_async('censo', tabla, key, e)
+        return cached if cached is not None else {"error": str(e)}
+
+
 def censo_request(
     tabla: str,
     metrica: List[str],
@@ -109,28 +186,34 @@ def censo_request(
     Returns:
         API response with metadata and data arrays
     """
-    payload = {
-        "idioma": idioma,
-        "metrica": metrica,
-        "tabla": tabla,
-        "variables": variables
-    }
-    
-    if filtro:
-        payload["filtro"] = filtro
-    
-    try:
-        response = requests.post(
-            CENSO_API_URL,
-            json=payload,
-            headers={"Content-Type": "application/json"},
-            timeout=60
-        )
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        logger.error(f"Censo 2021 API error: {e}")
-        return {"error": str(e)}
+    payload = _censo_payload(tabla, metrica, variables, idioma, filtro)
+    key = payload_key(CENSO_API_URL, payload)
+    with tracer.span('censo_request', KIND_CLIENT, tabla=tabla):
+        cached = response_cache.get(key)
+        upstream_metrics.cache('censo', tabla, cached is not None)
+        tracer.annotate(cache='hit' if cached is not None else 'miss')
+        if cached is not None:
+            return cached
+        return coalesced(key, lambda: _censo_post(payload, key))
+
+
+async def censo_request_async(
+    tabla: str,
+    metrica: List[str],
+    variables: List[str],
+    idioma: str = "ES",
+    filtro: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """Execute a Censo 2021 SDC21 API request without blocking the event loop"""
+    payload = _censo_payload(tabla, metrica, variables, idioma, filtro)
+    key = payload_key(CENSO_API_URL, payload)
+    with tracer.span('censo_request', KIND_CLIENT, tabla=tabla):
+        cached = await response_cache.get_async(key)
+        upstream_metrics.cache('censo', tabla, cached is not None)
+        tracer.annotate(cache='hit' if cached is not None else 'miss')
+        if cached is not None:
+            return cached
+        return await coalesced_async(key, lambda: _censo_post_async(payload, key))
 
 
 def get_censo_tables() -> Dict[str, Any]:
@@ -212,6 +295,28 @@ def get_censo_data(
     )
 
 
+async def get_censo_data_async(
+    tabla: str,
+    variables: List[str],
+    metrica: Optional[str] = None,
+    idioma: str = "ES"
+) -> Dict[str, Any]:
+    """Async version of get_censo_data"""
+    if tabla not in CENSO_TABLES:
+        return {"error": f"Unknown table: {tabla}. Available: {list(CENSO_TABLES.keys())}"}
+    
+    # Auto-detect metric if not provided
+    if not metrica:
+        metrica = CENSO_METRICS.get(tabla, ["SPERSONAS"])[0]
+    
+    return await censo_request_async(
+        tabla=tabla,
+        metrica=[metrica],
+        variables=variables,
+        idioma=idioma
+    )
+
+
 def get_population_by_location(
     level: str = "N1",
     idioma: str = "ES"
@@ -235,6 +340,20 @@ def get_population_by_location(
     )
 
 
+async def get_population_by_location_async(
+    level: str = "N1",
+    idioma: str = "ES"
+) -> Dict[str, Any]:
+    """Async version of get_population_by_location"""
+    variable = f"ID_RESIDENCIA_{level}"
+    return await censo_request_async(
+        tabla="per.ppal",
+        metrica=["SPERSONAS"],
+        variables=[variable],
+        idioma=idioma
+    )
+
+
 def get_population_pyramid(
     location_level: str = "N1",
     location_value: Optional[str] = None,
@@ -266,6 +385,27 @@ def get_population_pyramid(
     )
 
 
+async def get_population_pyramid_async(
+    location_level: str = "N1",
+    location_value: Optional[str] = None,
+    idioma: str = "ES"
+) -> Dict[str, Any]:
+    """Async version of get_population_pyramid"""
+    variables = ["ID_GRUPO_Q_EDAD", "ID_SEXO"]
+    
+    filtro = None
+    if location_value:
+        filtro = [{"variable": f"ID_RESIDENCIA_{location_level}", "valores": [location_value]}]
+    
+    return await censo_request_async(
+        tabla="per.ppal",
+        metrica=["SPERSONAS"],
+        variables=variables,
+        idioma=idioma,
+        filtro=filtro
+    )
+
+
 def get_housing_by_tenure(
     location_level: str = "N1",
     idioma: str = "ES"
@@ -288,6 +428,19 @@ def get_housing_by_tenure(
     )
 
 
+async def get_housing_by_tenure_async(
+    location_level: str = "N1",
+    idioma: str = "ES"
+) -> Dict[str, Any]:
+    """Async version of get_housing_by_tenure"""
+    return await censo_request_async(
+        tabla="viv.fam",
+        metrica=["SVIVIENDAS"],
+        variables=[f"ID_RESIDENCIA_{location_level}", "ID_TENEN_VIV"],
+        idioma=idioma
+    )
+
+
 def get_households_by_size(
     location_level: str = "N1",
     idioma: str = "ES"
@@ -310,6 +463,19 @@ def get_households_by_size(
     )
 
 
+async def get_households_by_size_async(
+    location_level: str = "N1",
+    idioma: str = "ES"
+) -> Dict[str, Any]:
+    """Async version of get_households_by_size"""
+    return await censo_request_async(
+        tabla="hog",
+        metrica=["SHOGARES"],
+        variables=[f"ID_RESIDENCIA_{location_level}", "ID_TAM_HOG_6"],
+        idioma=idioma
+    )
+
+
 def get_education_level(
     location_level: str = "N1",
     idioma: str = "ES"
@@ -332,6 +498,19 @@ def get_education_level(
     )
 
 
+async def get_education_level_async(
+    location_level: str = "N1",
+    idioma: str = "ES"
+) -> Dict[str, Any]:
+    """Async version of get_education_level"""
+    return await censo_request_async(
+        tabla="per.ppal",
+        metrica=["SPERSONAS"],
+        variables=[f"ID_RESIDENCIA_{location_level}", "ID_ESREAL_GR5"],
+        idioma=idioma
+    )
+
+
 def get_nationality_data(
     level: int = 1,
     location_level: str = "N1",
@@ -356,6 +535,20 @@ def get_nationality_data(
     )
 
 
+async def get_nationality_data_async(
+    level: int = 1,
+    location_level: str = "N1",
+    idioma: str = "ES"
+) -> Dict[str, Any]:
+    """Async version of get_nationality_data"""
+    return await censo_request_async(
+        tabla="per.ppal",
+        metrica=["SPERSONAS"],
+        variables=[f"ID_RESIDENCIA_{location_level}", f"ID_NACIONALIDAD_N{level}"],
+        idioma=idioma
+    )
+
+
 def get_family_nuclei(
     nucleus_type: bool = True,
     location_level: str = "N1",
@@ -382,3 +575,21 @@ def get_family_nuclei(
         variables=variables,
         idioma=idioma
     )
+
+
+async def get_family_nuclei_async(
+    nucleus_type: bool = True,
+    location_level: str = "N1",
+    idioma: str = "ES"
+) -> Dict[str, Any]:
+    """Async version of get_family_nuclei"""
+    variables = [f"ID_RESIDENCIA_{location_level}"]
+    if nucleus_type:
+        variables.append("ID_TIPO_NUC_1")
+    
+    return await censo_request_async(
+        tabla="nuc",
+        metrica=["SNUCLEOS"],
+        variables=variables,
+        idioma=idioma
+    )
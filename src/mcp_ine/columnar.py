@@ -0,0 +1,129 @@
+"""Columnar series - Array-backed Data columns instead of one dict per datapoint"""
+import math
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+NAN = float('nan')
+
+
+def _pack(bits: Iterable[bool]) -> bytearray:
+    """Bit-pack booleans, point i at bit i % 8 of byte i // 8"""
+    packed = bytearray()
+    for i, bit in enumerate(bits):
+        if i % 8 == 0:
+            packed.append(0)
+        if bit:
+            packed[-1] |= 1 << (i % 8)
+    return packed
+
+
+def _bit(packed: bytearray, i: int) -> bool:
+    return bool(packed[i >> 3] >> (i & 7) & 1)
+
+
+@dataclass
+class SeriesColumns:
+    """One series' Data as int64 Fecha (ms), float64 Valor (NaN when missing)
+    and a bit-packed Secreto flag column; other series fields stay in `header`"""
+    header: Dict[str, Any]
+    fecha: array = field(default_factory=lambda: array('q'))
+    valor: array = field(default_factory=lambda: array('d'))
+    secreto: bytearray = field(default_factory=bytearray)
+
+    @classmethod
+    def from_series(cls, series: Dict[str, Any]) -> 'SeriesColumns':
+        data = series.get('Data') or []
+        return cls({k: v for k, v in series.items() if k != 'Data'},
+                   array('q', (int(p.get('Fecha') or 0) for p in data)),
+                   array('d', (NAN if p.get('Valor') is None else float(p['Valor']) for p in data)),
+                   _pack(bool(p.get('Secreto')) for p in data))
+
+    def __len__(self) -> int:
+        return len(self.fecha)
+
+    def is_secret(self, i: int) -> bool:
+        return _bit(self.secreto, i)
+
+    def tail(self, n: int) -> 'SeriesColumns':
+        """Last n points"""
+        start = max(len(self) - n, 0)
+        return SeriesColumns(self.header, self.fecha[start:], self.valor[start:],
+                             _pack(self.is_secret(i) for i in range(start, len(self))))
+
+    def to_numpy(self):
+        """(fecha int64, valor float64, secreto bool) NumPy views over the same buffers"""
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("to_numpy() requires numpy (pip install mcp-ine[numpy])") from e
+        secreto = np.unpackbits(np.frombuffer(bytes(self.secreto), dtype=np.uint8), bitorder='little')
+        return (np.frombuffer(self.fecha, dtype=np.int64), np.frombuffer(self.valor, dtype=np.float64),
+                secreto[:len(self)].astype(bool))
+
+    def to_json(self) -> Dict[str, Any]:
+        """JSON-safe columns: Fecha and Valor lists (NaN as null), Secreto as indices of flagged points"""
+        return {**self.header, 'Fecha': self.fecha.tolist(),
+                'Valor': [None if math.isnan(v) else v for v in self.valor],
+                'Secreto': [i for i in range(len(self)) if self.is_secret(i)]}
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Back to the Tempus Data shape (Fecha, Valor, Secreto only)"""
+        return [{'Fecha': f, 'Valor': None if math.isnan(v) else v, 'Secreto': self.is_secret(i)}
+                for i, (f, v) in enumerate(zip(self.fecha, self.valor))]
+
+
+@dataclass
+class TableColumns:
+    """Every series of a table in shared columns; series i spans
+    offsets[i]:offsets[i + 1] of fecha, valor and secreto"""
+    headers: List[Dict[str, Any]]
+    offsets: array
+    fecha: array
+    valor: array
+    secreto: bytearray
+
+    @classmethod
+    def empty(cls) -> 'TableColumns':
+        return cls([], array('q', [0]), array('q'), array('d'), bytearray())
+
+    @classmethod
+    def from_table(cls, table: Iterable[Dict[str, Any]]) -> 'TableColumns':
+        columns = cls.empty()
+        for series in table:
+            columns.append(series)
+        return columns
+
+    def append(self, series: Dict[str, Any]) -> None:
+        """Add one series (e.g. as it is decoded from a stream); error items are skipped"""
+        if not isinstance(series, dict) or 'error' in series:
+            return
+        data = series.get('Data') or []
+        start = len(self.fecha)
+        self.headers.append({k: v for k, v in series.items() if k != 'Data'})
+        self.fecha.extend(int(p.get('Fecha') or 0) for p in data)
+        self.valor.extend(NAN if p.get('Valor') is None else float(p['Valor']) for p in data)
+        for i, p in enumerate(data, start):
+            if i % 8 == 0:
+                self.secreto.append(0)
+            if p.get('Secreto'):
+                self.secreto[-1] |= 1 << (i % 8)
+        self.offsets.append(len(self.fecha))
+
+    def __len__(self) -> int:
+        return len(self.headers)
+
+    def series(self, i: int) -> SeriesColumns:
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return SeriesColumns(self.headers[i], self.fecha[start:end], self.valor[start:end],
+                             _pack(_bit(self.secreto, j) for j in range(start, end)))
+
+    def find(self, code: str) -> Optional[SeriesColumns]:
+        """Series by COD"""
+        for i, header in enumerate(self.headers):
+            if header.get('COD') == code:
+                return self.series(i)
+        return None
+
+    def to_json(self) -> List[Dict[str, Any]]:
+        return [self.series(i).to_json() for i in range(len(self))]
@@ -1,7 +1,23 @@
-import os, logging, requests
-from typing import Dict, Any, Optional
+import os, logging, asyncio, functools, inspect, time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, Iterator, AsyncIterator, List, Callable, Awaitable, Tuple
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
+from .transport import HostSessions, AsyncHostClients
+from .cache import ResponseCache, CacheEntry, cache_key, body_digest
+from .flight import SingleFlight
+from .releases import ReleaseCalendar, RELEASE_FUNCTIONS
+from .catalog import SeriesCatalog
+from .search import SearchIndex
+from .store import SeriesStore
+from .streaming import iter_json_items, aiter_json_items
+from .cursors import CursorStore
+from .ratelimit import RateLimiter, RETRY_STATUSES, TRANSIENT_ERRORS
+from .breaker import HostBreakers, CircuitOpenError
+from .metrics import UpstreamMetrics, LoopLag
+from .tracing import Tracer, FileExporter, OtlpExporter, KIND_SERVER, KIND_CLIENT
+from .recording import Recorder
 
 # Minimal logging - only file, avoid stderr noise in MCP
 logging.basicConfig(
@@ -16,11 +32,116 @@ load_dotenv()
 # Configuration
 INE_LANGUAGE = os.getenv('INE_LANGUAGE', 'ES')
 INE_DEFAULT_PERIODS = int(os.getenv('INE_DEFAULT_PERIODS', '12'))
-INE_BASE_URL = "https://servicios.ine.es/wstempus/js"
+INE_BASE_URL = os.getenv('INE_BASE_URL', 'https://servicios.ine.es/wstempus/js').rstrip('/')
+INE_POOL_CONNECTIONS = int(os.getenv('INE_POOL_CONNECTIONS', '4'))
+INE_POOL_MAXSIZE = int(os.getenv('INE_POOL_MAXSIZE', '16'))
+INE_CACHE_ENABLED = os.getenv('INE_CACHE_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+INE_CACHE_DIR = os.path.expanduser(os.getenv('INE_CACHE_DIR', '~/.cache/mcp-ine'))
+INE_CACHE_MEMORY_ENTRIES = int(os.getenv('INE_CACHE_MEMORY_ENTRIES', '512'))
+INE_CACHE_MEMORY_MB = float(os.getenv('INE_CACHE_MEMORY_MB', '128'))
+INE_CACHE_DEFAULT_TTL = int(os.getenv('INE_CACHE_DEFAULT_TTL', '300'))
+INE_PAGE_CONCURRENCY = int(os.getenv('INE_PAGE_CONCURRENCY', '4'))
+INE_PAGE_SIZE = int(os.getenv('INE_PAGE_SIZE', '500'))
+INE_MAX_PAGES = int(os.getenv('INE_MAX_PAGES', '1000'))
+INE_BATCH_CONCURRENCY = int(os.getenv('INE_BATCH_CONCURRENCY', '8'))
+INE_RELEASE_CALENDAR = os.getenv('INE_RELEASE_CALENDAR', 'true').lower() not in ('0', 'false', 'no')
+INE_RELEASE_MAX_TTL = int(os.getenv('INE_RELEASE_MAX_TTL', str(45 * 86400)))
+INE_CATALOG_MAX_AGE = int(os.getenv('INE_CATALOG_MAX_AGE', '86400'))
+INE_SEARCH_MAX_AGE = int(os.getenv('INE_SEARCH_MAX_AGE', '86400'))
+INE_SERIES_STORE = os.getenv('INE_SERIES_STORE', 'true').lower() not in ('0', 'false', 'no')
+INE_SERIES_REVISION = int(os.getenv('INE_SERIES_REVISION', '3'))
+INE_STREAM_DECODE = os.getenv('INE_STREAM_DECODE', 'false').lower() in ('1', 'true', 'yes')
+INE_STREAM_CHUNK = 64 * 1024
+INE_SHARD_PERIODS = int(os.getenv('INE_SHARD_PERIODS', '60'))
+INE_CHUNK_ITEMS = int(os.getenv('INE_CHUNK_ITEMS', '500'))
+INE_CHUNK_BYTES = int(os.getenv('INE_CHUNK_BYTES', str(256 * 1024)))
+INE_CURSOR_TTL = int(os.getenv('INE_CURSOR_TTL', '900'))
+INE_RATE_LIMIT = float(os.getenv('INE_RATE_LIMIT', '10'))
+INE_RATE_BURST = int(os.getenv('INE_RATE_BURST', '20'))
+INE_RETRY_ATTEMPTS = int(os.getenv('INE_RETRY_ATTEMPTS', '3'))
+INE_RETRY_BASE_DELAY = float(os.getenv('INE_RETRY_BASE_DELAY', '0.5'))
+INE_RETRY_MAX_DELAY = float(os.getenv('INE_RETRY_MAX_DELAY', '30'))
+INE_BREAKER_THRESHOLD = float(os.getenv('INE_BREAKER_THRESHOLD', '0.5'))
+INE_BREAKER_MIN_CALLS = int(os.getenv('INE_BREAKER_MIN_CALLS', '5'))
+INE_BREAKER_WINDOW = float(os.getenv('INE_BREAKER_WINDOW', '60'))
+INE_BREAKER_COOLDOWN = float(os.getenv('INE_BREAKER_COOLDOWN', '30'))
+INE_TRACE_FILE = os.getenv('INE_TRACE_FILE', '')
+INE_TRACE_ENDPOINT = os.getenv('INE_TRACE_ENDPOINT', '')
+INE_RECORD_MODE = os.getenv('INE_RECORD_MODE', '').lower()
+INE_RECORD_ARCHIVE = os.path.expanduser(os.getenv('INE_RECORD_ARCHIVE', os.path.join(INE_CACHE_DIR, 'recordings.db')))
+INE_LOOP_LAG_INTERVAL = float(os.getenv('INE_LOOP_LAG_INTERVAL', '0.1'))
+
+# Cache lifetime in seconds per Tempus function: catalogues rarely change, DATOS_* do
+CACHE_TTLS = {
+    'OPERACIONES_DISPONIBLES': 7 * 86400, 'OPERACION': 7 * 86400,
+    'PERIODICIDADES': 30 * 86400, 'CLASIFICACIONES': 30 * 86400, 'CLASIFICACIONES_OPERACION': 30 * 86400,
+    'VARIABLES': 7 * 86400, 'VARIABLES_OPERACION': 7 * 86400, 'VALORES_VARIABLE': 7 * 86400,
+    'VALORES_VARIABLEOPERACION': 7 * 86400, 'VALORES_HIJOS': 7 * 86400,
+    'TABLAS_OPERACION': 86400, 'GRUPOS_TABLA': 86400, 'VALORES_GRUPOSTABLA': 86400,
+    'SERIE': 86400, 'VALORES_SERIE': 86400, 'SERIES_TABLA': 86400, 'SERIES_OPERACION': 86400,
+    'SERIE_METADATAOPERACION': 86400,
+    'PUBLICACIONES': 6 * 3600, 'PUBLICACIONES_OPERACION': 6 * 3600, 'PUBLICACIONFECHA_PUBLICACION': 86400,
+    'DATOS_TABLA': 900, 'DATOS_SERIE': 900, 'DATOS_METADATAOPERACION': 900,
+    'CENSO2021': 30 * 86400,  # Censo 2021 (SDC21) POST responses: published figures that do not change
+}
+# Overrides, e.g. INE_CACHE_TTLS="DATOS_TABLA=600,VARIABLES=86400"
+CACHE_TTLS.update({k.strip().upper(): int(v) for k, v in
+                   (item.split('=', 1) for item in os.getenv('INE_CACHE_TTLS', '').split(',') if '=' in item)})
 
 if INE_LANGUAGE not in ['ES', 'EN']:
     INE_LANGUAGE = 'ES'
 
+# Keep-alive connection pools, one per upstream host (servicios.ine.es, www.ine.es).
+# INE_POOL_CONNECTIONS is the number of urllib3 pools a requests session caches; an
+# httpx client has a single pool, so the async clients only take INE_POOL_MAXSIZE
+sessions = HostSessions(INE_POOL_CONNECTIONS, INE_POOL_MAXSIZE)
+async_clients = AsyncHostClients(INE_POOL_MAXSIZE, INE_POOL_MAXSIZE)
+
+# Token bucket per upstream host plus retries of 429/5xx/timeouts, shared by Tempus and Censo calls
+rate_limiter = RateLimiter(INE_RATE_LIMIT, INE_RATE_BURST, INE_RETRY_ATTEMPTS, INE_RETRY_BASE_DELAY,
+                           INE_RETRY_MAX_DELAY)
+
+# Per-host circuit breakers: fail fast (serving stale cache entries) while a host keeps erroring
+circuit_breakers = HostBreakers(INE_BREAKER_THRESHOLD, INE_BREAKER_MIN_CALLS, INE_BREAKER_WINDOW,
+                                INE_BREAKER_COOLDOWN)
+
+# Latency, bytes, decode time, errors and cache hits per Tempus function and Censo table
+upstream_metrics = UpstreamMetrics()
+
+# Event-loop lag sampled while the server runs (started by server.main)
+loop_lag = LoopLag(INE_LOOP_LAG_INTERVAL)
+
+# Spans per tool call, upstream request, JSON decode and filtering; off unless a file or collector is set
+tracer = Tracer(OtlpExporter(INE_TRACE_ENDPOINT) if INE_TRACE_ENDPOINT
+                else FileExporter(INE_TRACE_FILE) if INE_TRACE_FILE else None)
+
+# Record upstream responses to an archive, or replay them from it without network (INE_RECORD_MODE)
+recorder = Recorder(INE_RECORD_ARCHIVE, INE_RECORD_MODE)
+
+# Tempus response cache: memory LRU in front of a persistent SQLite file
+response_cache = ResponseCache(os.path.join(INE_CACHE_DIR, 'responses.db') if INE_CACHE_ENABLED else None,
+                               INE_CACHE_MEMORY_ENTRIES, max_bytes=int(INE_CACHE_MEMORY_MB * 1024 * 1024))
+
+# One upstream call in flight per canonical request (Tempus GET URL or Censo POST payload)
+inflight = SingleFlight()
+
+# DATOS_* entries expire at their operation's next scheduled release instead of a fixed TTL
+release_calendar = ReleaseCalendar(INE_RELEASE_MAX_TTL)
+_background_tasks = set()
+
+# Local index of every series of an operation, queried without upstream calls
+series_catalog = SeriesCatalog(os.path.join(INE_CACHE_DIR, 'catalog.db') if INE_CACHE_ENABLED else None)
+
+# Full-text index over operations, tables and catalogued series behind Search_Data
+search_index = SearchIndex(os.path.join(INE_CACHE_DIR, 'search.db') if INE_CACHE_ENABLED else None)
+
+# Downloaded DATOS_SERIE/DATOS_TABLA histories: nult refreshes only ask INE for newer periods
+series_store = SeriesStore(os.path.join(INE_CACHE_DIR, 'series.db') if INE_CACHE_ENABLED else None,
+                           INE_SERIES_REVISION)
+
+# Oversized tool results, returned in chunks and continued with a cursor
+result_cursors = CursorStore(INE_CHUNK_ITEMS, INE_CHUNK_BYTES, INE_CURSOR_TTL)
+
 mcp = FastMCP(
     name="mcp_ine",
     instructions="INE (Spanish Statistical Office) public data API. Access 109+ statistical operations: "
@@ -28,14 +149,400 @@ mcp = FastMCP(
                  "Also includes Censo 2021 (Census) data: population, housing, households by location."
 )
 
+def _ine_url(function: str, input_param: Optional[str] = None) -> str:
+    """Build Tempus API URL for a function and optional input"""
+    return '/'.join([INE_BASE_URL, INE_LANGUAGE, function] + ([str(input_param)] if input_param else []))
+
+def _cache_ttl(function: str) -> int:
+    """Cache lifetime for a Tempus function (0 disables caching)"""
+    return CACHE_TTLS.get(function, INE_CACHE_DEFAULT_TTL) if INE_CACHE_ENABLED else 0
+
+# =============================================================================
+# Upstream availability: circuit breaker, stale-while-error and tool marking
+# =============================================================================
+
+# Expiry times of stale cache entries served during the current tool call
+_stale_served: ContextVar[Optional[List[float]]] = ContextVar('stale_served', default=None)
+
+def send(url: str, call, key: Optional[str] = None) -> Any:
+    """Run a blocking HTTP call through the host's circuit breaker and rate limiter
+
+    With a request key, the response is recorded to (or, when replaying,
+    answered from) the recording archive.
+    """
+    if key is not None and recorder.replaying:
+        return recorder.replay(key)
+    circuit_breakers.check(url)
+    started = time.perf_counter()
+    try:
+        response = rate_limiter.send(url, call)
+    except TRANSIENT_ERRORS:
+        circuit_breakers.record(url, False)
+        raise
+    circuit_breakers.record(url, response.status_code not in RETRY_STATUSES)
+    if key is not None and recorder.recording:
+        recorder.record(key, url, response, time.perf_counter() - started)  # reads a streamed body in full
+    return response
+
+async def send_async(url: str, call, key: Optional[str] = None) -> Any:
+    """Async version of send"""
+    if key is not None and recorder.replaying:
+        return recorder.replay(key)
+    circuit_breakers.check(url)
+    started = time.perf_counter()
+    try:
+        response = await rate_limiter.send_async(url, call)
+    except TRANSIENT_ERRORS:
+        circuit_breakers.record(url, False)
+        raise
+    circuit_breakers.record(url, response.status_code not in RETRY_STATUSES)
+    if key is not None and recorder.recording:
+        await response.aread()
+        recorder.record(key, url, response, time.perf_counter() - started)
+    return response
+
+def _unavailable(e: Exception) -> bool:
+    """Open circuit, timeout, dropped connection or a 429/5xx that outlasted the retries"""
+    status = getattr(getattr(e, 'response', None), 'status_code', None)
+    return isinstance(e, (CircuitOpenError,) + TRANSIENT_ERRORS) or status in RETRY_STATUSES
+
+def serve_stale(source: str, name: str, key: str, e: Exception,
+                entry: Optional[CacheEntry] = None) -> Optional[Any]:
+    """Last cached value for key when the upstream failure is an outage, else None
+
+    The tool call serving it is flagged, so its result gets a staleness note.
+    """
+    if not _unavailable(e):
+        return None
+    return _stale_value(source, name, key, e, entry or response_cache.lookup(key))
+
+async def serve_stale_async(source: str, name: str, key: str, e: Exception,
+                            entry: Optional[CacheEntry] = None) -> Optional[Any]:
+    """Async version of serve_stale; the disk-tier lookup runs in a worker thread"""
+    if not _unavailable(e):
+        return None
+    return _stale_value(source, name, key, e, entry or await response_cache.lookup_async(key))
+
+def _stale_value(source: str, name: str, key: str, e: Exception, entry: Optional[CacheEntry]) -> Optional[Any]:
+    if entry is None:
+        return None
+    logger.warning(f"Serving stale cache entry for {key}: {e}")
+    upstream_metrics.stale(source, name)
+    served = _stale_served.get()
+    if served is not None:
+        served.append(entry.expires)
+    return entry.value
+
+def _flag_stale(served: List[float]) -> None:
+    mine = _stale_served.get()
+    if mine is not None:
+        mine.extend(served)
+
+def _with_stale(fn: Callable[[], Any]) -> Tuple[Any, List[float]]:
+    """fn() and the expiry times of the stale entries it served"""
+    served = []
+    token = _stale_served.set(served)
+    try:
+        return fn(), served
+    finally:
+        _stale_served.reset(token)
+
+async def _with_stale_async(fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, List[float]]:
+    """Async version of _with_stale (runs in the shared task's own context)"""
+    served = []
+    _stale_served.set(served)
+    return await fn(), served
+
+def coalesced(key: str, fn: Callable[[], Any]) -> Any:
+    """inflight.do(key, fn) whose stale-entry flags reach every caller sharing the result, not just the leader"""
+    result, served = inflight.do(key, lambda: _with_stale(fn))
+    _flag_stale(served)
+    return result
+
+async def coalesced_async(key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+    """Async version of coalesced"""
+    result, served = await inflight.do_async(key, lambda: _with_stale_async(fn))
+    _flag_stale(served)
+    return result
+
+def _mark_stale(result: Any, served: List[float]) -> Any:
+    if not served:
+        return result
+    since = datetime.fromtimestamp(min(served), timezone.utc).strftime('%Y-%m-%d %H:%M UTC')
+    note = f"INE API unavailable: some data was served from cache and may be out of date (expired {since})"
+    if isinstance(result, list):
+        return result + [{"_info": note, "_stale": True}]
+    if isinstance(result, dict):
+        return {**result, "_stale": True, "_stale_info": note}
+    return result
+
+def _traced(span: Any, result: Any) -> None:
+    """Record a tool result's size and error on its span"""
+    if isinstance(result, list):
+        span.set(items=len(result))
+        if result and isinstance(result[0], dict) and "error" in result[0]:
+            span.fail(str(result[0]["error"]))
+    elif isinstance(result, dict) and "error" in result:
+        span.fail(str(result["error"]))
+
+def tool(**kwargs):
+    """mcp.tool() whose calls are traced as root spans and whose results are
+    marked when stale cache entries were served during the call"""
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, **kw):
+                served = []
+                token = _stale_served.set(served)
+                try:
+                    with tracer.span(fn.__name__, KIND_SERVER, tool=fn.__name__) as span:
+                        result = await fn(*args, **kw)
+                        if span is not None:
+                            _traced(span, result)
+                finally:
+                    _stale_served.reset(token)
+                return _mark_stale(result, served)
+        else:
+            @functools.wraps(fn)
+            def wrapper(*args, **kw):
+                served = []
+                token = _stale_served.set(served)
+                try:
+                    with tracer.span(fn.__name__, KIND_SERVER, tool=fn.__name__) as span:
+                        result = fn(*args, **kw)
+                        if span is not None:
+                            _traced(span, result)
+                finally:
+                    _stale_served.reset(token)
+                return _mark_stale(result, served)
+        return mcp.tool(**kwargs)(wrapper)
+    return decorator
+
+# =============================================================================
+# Tempus requests
+# =============================================================================
+
+def _ine_fetch(function: str, input_param: Optional[str], url: str, params: Optional[Dict], key: str) -> Any:
+    """Fetch a Tempus URL, revalidating an expired cache entry when there is one"""
+    stale, response, started = response_cache.lookup(key), None, time.perf_counter()
+    try:
+        session, headers = sessions.get(url), stale.conditional_headers() if stale else None
+        response = send(url, lambda: session.get(url, params=params, timeout=30, headers=headers), key)
+        upstream_metrics.request('tempus', function, time.perf_counter() - started, len(response.content),
+                                 response.status_code < 400)
+        tracer.annotate(status_code=response.status_code, bytes=len(response.content))
+        data = _ine_store(function, key, response, stale)
+    except Exception as e:
+        logger.error(f"INE API error: {url} - {e}")
+        if response is None and not isinstance(e, CircuitOpenError):
+            upstream_metrics.request('tempus', function, time.perf_counter() - started, ok=False)
+        cached = serve_stale('tempus', function, key, e, stale)
+        return cached if cached is not None else {"error": str(e)}
+    release_calendar.observe(function, input_param, data)
+    if _release_aware(function):
+        _apply_release_expiry(function, input_param, key, data)
+    return data
+
+async def _ine_fetch_async(function: str, input_param: Optional[str], url: str, params: Optional[Dict],
+                           key: str) -> Any:
+    """Async version of _ine_fetch; the release lookup runs in the background, and cache
+    reads, decoding and stores run in worker threads"""
+    stale, response, started = await response_cache.lookup_async(key), None, time.perf_counter()
+    try:
+        client, headers = async_clients.get(url), stale.conditional_headers() if stale else None
+        response = await send_async(url, lambda: client.get(url, params=params, timeout=30, headers=headers),
+                                    key)
+        upstream_metrics.request('tempus', function, time.perf_counter() - started, len(response.content),
+                                 response.status_code < 400)
+        tracer.annotate(status_code=response.status_code, bytes=len(response.content))
+        data = await asyncio.to_thread(_ine_store, function, key, response, stale)
+    except Exception as e:
+        logger.error(f"INE API error: {url} - {e}")
+        if response is None and not isinstance(e, CircuitOpenError):
+            upstream_metrics.request('tempus', function, time.perf_counter() - started, ok=False)
+        cached = await serve_stale_async('tempus', function, key, e, stale)
+        return cached if cached is not None else {"error": str(e)}
+    release_calendar.observe(function, input_param, data)
+    if _release_aware(function):
+        spawn(_apply_release_expiry_async(function, input_param, key, data))
+    return data
+
+def spawn(coro) -> asyncio.Future:
+    """Run a coroutine in the background, keeping a reference until it finishes"""
+    if tracer.enabled:
+        coro = tracer.detached(coro, getattr(coro, '__qualname__', 'background'))
+    task = asyncio.ensure_future(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+def _release_aware(function: str) -> bool:
+    return INE_RELEASE_CALENDAR and INE_CACHE_ENABLED and function in RELEASE_FUNCTIONS
+
+def _apply_release_expiry(function: str, input_param: Optional[str], key: str, data: Any) -> None:
+    """Resolve the governing publications (cached catalogue calls) and expire at the next release"""
+    need, tried = release_calendar.missing(function, input_param, data), set()
+    while need and need not in tried:
+        tried.add(need)
+        result = ine_request(*need)
+        if isinstance(result, dict) and "error" in result:
+            return
+        release_calendar.observe(*need, result)
+        need = release_calendar.missing(function, input_param, data)
+    expires = release_calendar.expiry(function, input_param, data)
+    if expires:
+        response_cache.set_expiry(key, expires)
+
+async def _apply_release_expiry_async(function: str, input_param: Optional[str], key: str, data: Any) -> None:
+    """Async version of _apply_release_expiry"""
+    need, tried = release_calendar.missing(function, input_param, data), set()
+    while need and need not in tried:
+        tried.add(need)
+        result = await ine_request_async(*need)
+        if isinstance(result, dict) and "error" in result:
+            return
+        release_calendar.observe(*need, result)
+        need = release_calendar.missing(function, input_param, data)
+    expires = release_calendar.expiry(function, input_param, data)
+    if expires:
+        await asyncio.to_thread(response_cache.set_expiry, key, expires)
+
+def _ine_store(function: str, key: str, response: Any, stale: Optional[Any]) -> Any:
+    """Decode and cache a Tempus response (requests or httpx)
+
+    A 304, or a body whose hash matches the stale entry, only refreshes the TTL
+    and returns the already decoded object.
+    """
+    ttl = _cache_ttl(function)
+    etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+    if stale is not None and response.status_code == 304:
+        return response_cache.refresh(key, stale, ttl, etag, last_modified)
+    response.raise_for_status()
+    body = response.text
+    if stale is not None and stale.digest == body_digest(body):
+        return response_cache.refresh(key, stale, ttl, etag, last_modified)
+    decoding = time.perf_counter()
+    with tracer.span('json_decode', function=function, bytes=len(body)):
+        data = response.json()
+    upstream_metrics.decode('tempus', function, time.perf_counter() - decoding)
+    response_cache.put(key, data, ttl, body, etag, last_modified)
+    return data
+
 def ine_request(function: str, input_param: Optional[str] = None, 
                 params: Optional[Dict] = None) -> Any:
     """Execute INE API request"""
-    url = '/'.join([INE_BASE_URL, INE_LANGUAGE, function] + ([str(input_param)] if input_param else []))
+    url = _ine_url(function, input_param)
+    key = cache_key(url, params)
+    with tracer.span('ine_request', KIND_CLIENT, function=function, input=input_param, url=url):
+        cached = response_cache.get(key)
+        upstream_metrics.cache('tempus', function, cached is not None)
+        tracer.annotate(cache='hit' if cached is not None else 'miss')
+        if cached is not None:
+            return cached
+        return coalesced(key, lambda: _ine_fetch(function, input_param, url, params, key))
+
+async def ine_request_async(function: str, input_param: Optional[str] = None,
+                            params: Optional[Dict] = None) -> Any:
+    """Execute INE API request without blocking the event loop"""
+    url = _ine_url(function, input_param)
+    key = cache_key(url, params)
+    with tracer.span('ine_request', KIND_CLIENT, function=function, input=input_param, url=url):
+        cached = await response_cache.get_async(key)
+        upstream_metrics.cache('tempus', function, cached is not None)
+        tracer.annotate(cache='hit' if cached is not None else 'miss')
+        if cached is not None:
+            return cached
+        return await coalesced_async(key, lambda: _ine_fetch_async(function, input_param, url, params, key))
+
+def _counted(chunks: Iterator[bytes], received: List[int]) -> Iterator[bytes]:
+    """Pass chunks through, adding their size to received[0]"""
+    for chunk in chunks:
+        received[0] += len(chunk)
+        yield chunk
+
+async def _acounted(chunks: AsyncIterator[bytes], received: List[int]) -> AsyncIterator[bytes]:
+    """Async version of _counted"""
+    async for chunk in chunks:
+        received[0] += len(chunk)
+        yield chunk
+
+def ine_stream(function: str, input_param: Optional[str] = None, params: Optional[Dict] = None) -> Iterator[Any]:
+    """Execute INE API request, yielding the items of the JSON array as they download
+
+    Only one item is decoded and held at a time; the body is not kept, so
+    streamed responses are served from the cache when fresh but not stored in it.
+    A failure is yielded as a final {"error": ...} item, unless it happens
+    before the first item during an outage and a stale entry can be served.
+    """
+    url = _ine_url(function, input_param)
+    key = cache_key(url, params)
+    cached, started = response_cache.get(key), False
+    upstream_metrics.cache('tempus', function, cached is not None)
+    if cached is not None:
+        yield from cached if isinstance(cached, list) else [cached]
+        return
+    timer, received, failure = time.perf_counter(), [0], None
+    span = tracer.start('ine_request', KIND_CLIENT, function=function, input=input_param, url=url, stream=True)
+    try:
+        response = send(url, lambda: sessions.get(url).get(url, params=params, timeout=30, stream=True), key)
+        with response:
+            response.raise_for_status()
+            chunks = _counted(response.iter_content(INE_STREAM_CHUNK), received)
+            for item in iter_json_items(chunks):
+                started = True
+                yield item
+    except Exception as e:
+        logger.error(f"INE API error: {url} - {e}")
+        failure = e
+        cached = None if started else serve_stale('tempus', function, key, e)
+        if cached is None:
+            yield {"error": str(e)}
+        else:
+            yield from cached if isinstance(cached, list) else [cached]
+    finally:
+        if not isinstance(failure, CircuitOpenError):
+            upstream_metrics.request('tempus', function, time.perf_counter() - timer, received[0], failure is None)
+        if span is not None:
+            span.set(bytes=received[0])
+        tracer.finish(span, failure)
+
+async def ine_stream_async(function: str, input_param: Optional[str] = None,
+                           params: Optional[Dict] = None) -> AsyncIterator[Any]:
+    """Async version of ine_stream"""
+    url = _ine_url(function, input_param)
+    key = cache_key(url, params)
+    cached, started = await response_cache.get_async(key), False
+    upstream_metrics.cache('tempus', function, cached is not None)
+    if cached is not None:
+        for item in cached if isinstance(cached, list) else [cached]:
+            yield item
+        return
+    timer, received, failure = time.perf_counter(), [0], None
+    span = tracer.start('ine_request', KIND_CLIENT, function=function, input=input_param, url=url, stream=True)
     try:
-        response = requests.get(url, params=params, timeout=30)
-        response.raise_for_status()
-        return response.json()
+        client = async_clients.get(url)
+        response = await send_async(
+            url, lambda: client.send(client.build_request('GET', url, params=params, timeout=30), stream=True), key)
+        try:
+            response.raise_for_status()
+            chunks = _acounted(response.aiter_bytes(INE_STREAM_CHUNK), received)
+            async for item in aiter_json_items(chunks):
+                started = True
+                yield item
+        finally:
+            await response.aclose()
     except Exception as e:
         logger.error(f"INE API error: {url} - {e}")
-        return {"error": str(e)}
+        failure = e
+        cached = None if started else await serve_stale_async('tempus', function, key, e)
+        if cached is None:
+            yield {"error": str(e)}
+        else:
+            for item in cached if isinstance(cached, list) else [cached]:
+                yield item
+    finally:
+        if not isinstance(failure, CircuitOpenError):
+            upstream_metrics.request('tempus', function, time.perf_counter() - timer, received[0], failure is None)
+        if span is not None:
+            span.set(bytes=received[0])
+        tracer.finish(span, failure)
@@ -0,0 +1,85 @@
+"""Concurrency helpers - Bounded concurrent pagination over paged Tempus endpoints"""
+import asyncio
+import logging
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, List
+
+logger = logging.getLogger('mcp_ine')
+
+
+class Page(list):
+    """Page filtered while it was decoded; size is the number of items upstream sent"""
+
+    def __init__(self, items=(), size: int = 0):
+        super().__init__(items)
+        self.size = size
+
+
+def _size(page: Any) -> int:
+    return page.size if isinstance(page, Page) else len(page)
+
+
+def _is_last(page: Any, page_size: int) -> bool:
+    """Empty, error, or short page: nothing comes after it"""
+    if not isinstance(page, list) or not _size(page):
+        return True
+    if page and isinstance(page[0], dict) and "error" in page[0]:
+        return True
+    return _size(page) < page_size
+
+
+async def iter_pages(fetch_page: Callable[[int], Awaitable[List[Any]]], concurrency: int = 4, start: int = 1,
+                     page_size: int = 0, max_pages: int = 0) -> AsyncIterator[List[Any]]:
+    """Yield pages in order while fetching up to `concurrency` pages ahead
+
+    The first page is fetched alone: shorter than `page_size` (the endpoint's
+    documented size; learnt from the first page when 0) it is the only one.
+    After that the read-ahead window doubles with each full page up to
+    `concurrency`. The stream ends at the first empty, error or short page
+    (the error page itself is yielded), at a page identical to the previous
+    one (an endpoint that ignores `page`), or after `max_pages` pages. Pages
+    still in flight are cancelled when the stream ends or the consumer stops
+    iterating.
+    """
+    first = await fetch_page(start)
+    yield first
+    page_size = page_size or (_size(first) if isinstance(first, list) else 0)
+    if _is_last(first, page_size):
+        return
+    pending: deque = deque()
+    next_page, number, window, previous = start + 1, start, 1, first
+    try:
+        while True:
+            while len(pending) < window and (not max_pages or next_page < start + max_pages):
+                pending.append(asyncio.ensure_future(fetch_page(next_page)))
+                next_page += 1
+            if not pending:
+                logger.warning(f"Stopped paging after {max_pages} pages")
+                return
+            page, number = await pending.popleft(), number + 1
+            if isinstance(page, list) and page and page == previous:
+                logger.warning(f"Page {number} repeats the previous one; stopped paging")
+                return
+            if isinstance(page, list) and page:
+                yield page
+            if _is_last(page, page_size):
+                return
+            previous, window = page, min(window * 2, max(concurrency, 1))
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def collect(items: AsyncIterator[Any]) -> List[Any]:
+    """Drain an async iterator into a list"""
+    return [item async for item in items]
+
+
+async def gather_bounded(fn: Callable[[Any], Awaitable[Any]], items: Iterable[Any], concurrency: int = 4) -> List[Any]:
+    """Await fn(item) for every item with at most `concurrency` running at once; results in input order"""
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def run(item):
+        async with semaphore:
+            return await fn(item)
+    return await asyncio.gather(*(run(item) for item in items))
@@ -0,0 +1,128 @@
+"""Result cursors - Serve oversized tool results in size-bounded chunks"""
+import asyncio, json, secrets, time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+
+@dataclass
+class _Cursor:
+    items: List[Any]
+    source: Optional[AsyncIterator[Any]]
+    envelope: Optional[Dict[str, Any]]
+    expires: float
+    key: str = 'Data'  # envelope key of the chunked items
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+def _size(item: Any) -> int:
+    return len(json.dumps(item, ensure_ascii=False, default=str).encode('utf-8'))
+
+
+class CursorStore:
+    """Results too large for one response, kept server-side behind opaque cursors
+
+    A result is a list of items, an async iterator of items (read lazily, so
+    continuing resumes the same upstream scan instead of restarting it), a
+    series dict whose Data points are chunked or a Censo 2021 dict whose data
+    rows are chunked. Each chunk holds at most
+    `max_items` items and about `max_bytes` of JSON (always at least one item).
+    A cursor names an offset into the stored result, so repeating a call with
+    the same cursor returns the same chunk.
+    """
+
+    def __init__(self, max_items: int = 500, max_bytes: int = 256 * 1024, ttl: int = 900, capacity: int = 256):
+        self.max_items, self.max_bytes, self.ttl, self.capacity = max(max_items, 1), max_bytes, ttl, capacity
+        self._cursors: 'OrderedDict[str, _Cursor]' = OrderedDict()
+        self.counters = {'opened': 0, 'resumed': 0, 'expired': 0}
+
+    async def chunk(self, result: Any) -> Any:
+        """First chunk of a result, with a cursor when more remain; small results are returned as is"""
+        envelope, key = None, 'Data'
+        if isinstance(result, dict):
+            key = next((k for k in ('Data', 'data') if isinstance(result.get(k), list)), None)
+            if "error" in result or key is None:
+                return result
+            envelope, result = {k: v for k, v in result.items() if k != key}, result[key]
+        if isinstance(result, list):
+            cursor = _Cursor(result, None, envelope, time.time() + self.ttl, key=key)
+        elif hasattr(result, '__anext__'):
+            cursor = _Cursor([], result, envelope, time.time() + self.ttl, key=key)
+        else:
+            return result
+        await self._evict()
+        cursor_id = secrets.token_urlsafe(12)
+        self._cursors[cursor_id] = cursor
+        first = await self._read(cursor_id, cursor, 0)
+        if cursor_id in self._cursors:
+            self.counters['opened'] += 1
+        return first
+
+    async def resume(self, token: str) -> Optional[Any]:
+        """Chunk a cursor points at, or None when it is unknown or has expired"""
+        cursor_id, _, offset = (token or '').partition('.')
+        await self._evict(room=False)
+        cursor = self._cursors.get(cursor_id)
+        if cursor is None or cursor.expires < time.time() or not offset.isdigit():
+            return None
+        self._cursors.move_to_end(cursor_id)
+        cursor.expires = time.time() + self.ttl
+        self.counters['resumed'] += 1
+        return await self._read(cursor_id, cursor, int(offset))
+
+    async def _read(self, cursor_id: str, cursor: _Cursor, offset: int) -> Any:
+        async with cursor.lock:
+            items, size, end = cursor.items, 0, offset
+            while end - offset < self.max_items:
+                if end == len(items) and not await self._pull(cursor):
+                    break
+                size += _size(items[end])
+                if size > self.max_bytes and end > offset:
+                    break
+                end += 1
+            more = end < len(items) or await self._pull(cursor)
+        if not more and offset == 0:
+            self._cursors.pop(cursor_id, None)  # fitted in one chunk: nothing to resume
+        return self._wrap(cursor.envelope, cursor.key, items[offset:end], f"{cursor_id}.{end}" if more else None,
+                          offset, len(items) if cursor.source is None else None)
+
+    @staticmethod
+    async def _pull(cursor: _Cursor) -> bool:
+        """Read one more item from the cursor's iterator; False once exhausted"""
+        if cursor.source is None:
+            return False
+        try:
+            cursor.items.append(await cursor.source.__anext__())
+            return True
+        except StopAsyncIteration:
+            cursor.source = None
+            return False
+
+    @staticmethod
+    def _wrap(envelope: Optional[Dict[str, Any]], key: str, chunk: List[Any], token: Optional[str], offset: int,
+              total: Optional[int]) -> Any:
+        if token is None:
+            return chunk if envelope is None else {**envelope, key: chunk}
+        shown = f"{offset + 1}-{offset + len(chunk)}" + (f" of {total}" if total is not None else "")
+        info = f"Showing items {shown}; call again with cursor='{token}' for the next chunk"
+        if envelope is None:
+            return chunk + [{"_info": info, "_cursor": token}]
+        return {**envelope, key: chunk, '_info': info, '_cursor': token}
+
+    async def _evict(self, room: bool = True) -> None:
+        """Drop expired cursors, then (to make room for a new one) the least recently used beyond
+        capacity; their iterators are closed, cancelling any reads they have in flight"""
+        now = time.time()
+        for cursor_id, cursor in list(self._cursors.items()):
+            if cursor.lock.locked():
+                continue
+            if cursor.expires < now or (room and len(self._cursors) >= self.capacity):
+                del self._cursors[cursor_id]
+                self.counters['expired'] += 1
+                if cursor.source is not None and hasattr(cursor.source, 'aclose'):
+                    await cursor.source.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        """Open cursors and how often they were opened, resumed and evicted"""
+        return {'open': len(self._cursors), 'streaming': sum(c.source is not None for c in self._cursors.values()),
+                **self.counters}
@@ -0,0 +1,75 @@
+"""Singleflight - Coalesce identical in-flight upstream requests"""
+import asyncio, threading, weakref
+from typing import Any, Awaitable, Callable, Dict
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; concurrent callers share its result
+
+    The shared result is the same decoded object for every waiter, so it must
+    be treated as read-only (as with cached values).
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self._tasks = weakref.WeakKeyDictionary()  # loop -> {key: task}
+        self.counters = {'executed': 0, 'coalesced': 0}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Blocking variant: threads asking for the same key wait for the leader"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.counters['executed'] += 1
+            else:
+                self.counters['coalesced'] += 1
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Async variant: the upstream call runs in its own task, so a cancelled
+        caller does not cancel it for the others; it is cancelled only once
+        every waiter is gone"""
+        tasks = self._tasks.setdefault(asyncio.get_running_loop(), {})
+        flight = tasks.get(key)
+        if flight is None:
+            flight = tasks[key] = [asyncio.ensure_future(fn()), 0]
+            flight[0].add_done_callback(lambda _: tasks.get(key) is flight and tasks.pop(key))
+            self.counters['executed'] += 1
+        else:
+            self.counters['coalesced'] += 1
+        task = flight[0]
+        flight[1] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            flight[1] -= 1
+            if flight[1] == 0 and not task.done():
+                task.cancel()
+                if tasks.get(key) is flight:
+                    del tasks[key]
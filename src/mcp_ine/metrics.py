@@ -0,0 +1,197 @@
+"""Upstream metrics - Latency, bytes, decode time, errors and cache hits per INE function"""
+import asyncio, threading
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+# Histogram bucket upper bounds, seconds
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+DECODE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None when empty or beyond the last bucket)"""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+    def summary(self) -> Dict[str, Any]:
+        return {'count': self.count, 'mean': round(self.sum / self.count, 6) if self.count else None,
+                'p50': self.quantile(0.5), 'p95': self.quantile(0.95), 'p99': self.quantile(0.99)}
+
+
+class Endpoint:
+    """Counters of one upstream endpoint (a Tempus function or a Censo table)"""
+
+    def __init__(self):
+        self.requests = self.errors = self.bytes = self.cache_hits = self.cache_misses = self.stale = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.decode = Histogram(DECODE_BUCKETS)
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.cache_hits + self.cache_misses
+        return {'requests': self.requests, 'errors': self.errors, 'bytes': self.bytes,
+                'cache_hits': self.cache_hits, 'cache_misses': self.cache_misses,
+                'hit_ratio': round(self.cache_hits / lookups, 4) if lookups else None, 'stale_served': self.stale,
+                'latency_seconds': self.latency.summary(), 'decode_seconds': self.decode.summary()}
+
+
+class UpstreamMetrics:
+    """Per-endpoint metrics, keyed by (source, name), e.g. ('tempus', 'DATOS_TABLA') or ('censo', 'per.ppal')"""
+
+    def __init__(self):
+        self._endpoints: Dict[Tuple[str, str], Endpoint] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, source: str, name: str) -> Endpoint:
+        endpoint = self._endpoints.get((source, name))
+        if endpoint is None:
+            endpoint = self._endpoints.setdefault((source, name), Endpoint())
+        return endpoint
+
+    def cache(self, source: str, name: str, hit: bool) -> None:
+        with self._lock:
+            endpoint = self._get(source, name)
+            if hit:
+                endpoint.cache_hits += 1
+            else:
+                endpoint.cache_misses += 1
+
+    def request(self, source: str, name: str, seconds: float, nbytes: int = 0, ok: bool = True) -> None:
+        """One upstream exchange: wall time (retries and rate-limit waits included), body size, outcome"""
+        with self._lock:
+            endpoint = self._get(source, name)
+            endpoint.requests += 1
+            endpoint.errors += not ok
+            endpoint.bytes += nbytes
+            endpoint.latency.observe(seconds)
+
+    def decode(self, source: str, name: str, seconds: float) -> None:
+        with self._lock:
+            self._get(source, name).decode.observe(seconds)
+
+    def stale(self, source: str, name: str) -> None:
+        with self._lock:
+            self._get(source, name).stale += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """{source: {name: metrics}}"""
+        with self._lock:
+            result: Dict[str, Dict[str, Any]] = {}
+            for (source, name), endpoint in sorted(self._endpoints.items()):
+                result.setdefault(source, {})[name] = endpoint.snapshot()
+            return result
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        counters = [('requests', 'mcp_ine_upstream_requests_total', 'Upstream requests made'),
+                    ('errors', 'mcp_ine_upstream_errors_total', 'Upstream requests that failed'),
+                    ('bytes', 'mcp_ine_upstream_response_bytes_total', 'Response body bytes received'),
+                    ('stale', 'mcp_ine_stale_served_total', 'Stale cache entries served during outages')]
+        lines: List[str] = []
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            for attribute, metric, help_text in counters:
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+                lines += [f"{metric}{_labels(key)} {getattr(e, attribute)}" for key, e in endpoints]
+            metric = 'mcp_ine_cache_lookups_total'
+            lines += [f"# HELP {metric} Response cache lookups", f"# TYPE {metric} counter"]
+            for key, e in endpoints:
+                lines.append(f"{metric}{_labels(key, result='hit')} {e.cache_hits}")
+                lines.append(f"{metric}{_labels(key, result='miss')} {e.cache_misses}")
+            for attribute, metric, help_text in (
+                    ('latency', 'mcp_ine_upstream_request_duration_seconds', 'Upstream request wall time'),
+                    ('decode', 'mcp_ine_decode_duration_seconds', 'JSON decode time')):
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+                for key, e in endpoints:
+                    histogram, cumulative = getattr(e, attribute), 0
+                    for bound, count in zip(histogram.buckets + (float('inf'),), histogram.counts):
+                        cumulative += count
+                        le = '+Inf' if bound == float('inf') else repr(bound)
+                        lines.append(f"{metric}_bucket{_labels(key, le=le)} {cumulative}")
+                    lines.append(f"{metric}_sum{_labels(key)} {histogram.sum}")
+                    lines.append(f"{metric}_count{_labels(key)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+
+class LoopLag:
+    """Event-loop lag: how late a timer that should fire every interval seconds actually fires
+
+    Lag is time the loop spent on other work (JSON decoding, filtering, a
+    blocking call) before it could run a ready callback, so it bounds how long
+    any request waits just to be looked at. An interval of 0 disables it.
+    """
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.histogram = Histogram(LAG_BUCKETS)
+        self.max = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Begin sampling on the running loop"""
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            due = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - due, 0.0)
+            with self._lock:
+                self.histogram.observe(lag)
+                self.max = max(self.max, lag)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Summary plus raw bucket counts, so a reader can diff two snapshots"""
+        with self._lock:
+            return {'interval': self.interval, 'running': self._task is not None, **self.histogram.summary(),
+                    'sum': round(self.histogram.sum, 6), 'max': round(self.max, 6), 'buckets': list(self.histogram.buckets),
+                    'counts': list(self.histogram.counts)}
+
+    def prometheus(self) -> str:
+        metric, cumulative = 'mcp_ine_event_loop_lag_seconds', 0
+        lines = [f"# HELP {metric} Delay of a periodic event-loop timer past its due time",
+                 f"# TYPE {metric} histogram"]
+        with self._lock:
+            for bound, count in zip(self.histogram.buckets + (float('inf'),), self.histogram.counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{metric}_bucket{{le="{le}"}} {cumulative}')
+            lines += [f"{metric}_sum {self.histogram.sum}", f"{metric}_count {self.histogram.count}"]
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(key: Tuple[str, str], **extra: str) -> str:
+    labels = {'source': key[0], 'endpoint': key[1], **extra}
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + '}'
@@ -0,0 +1,41 @@
+"""Field projection - Keep only the requested fields of INE objects"""
+from typing import Any, Dict, List, Optional
+
+# Marker items that are never projected away
+_PASSTHROUGH = ('error', '_info')
+
+
+class Projection:
+    """Field selection such as ['COD', 'Nombre', 'Data.Fecha', 'Data.Valor']
+
+    A dotted path selects fields inside nested objects and lists of objects;
+    a field without sub-paths is kept whole.
+    """
+
+    def __init__(self, fields: List[str]):
+        self.tree: Dict[str, Dict] = {}
+        for path in fields:
+            node = self.tree
+            for name in (part.strip() for part in str(path).split('.')):
+                if name:
+                    node = node.setdefault(name, {})
+
+    def __bool__(self) -> bool:
+        return bool(self.tree)
+
+    def apply(self, value: Any) -> Any:
+        return self._apply(value, self.tree)
+
+    def _apply(self, value: Any, tree: Dict[str, Dict]) -> Any:
+        if not tree:
+            return value
+        if isinstance(value, list):
+            return [self._apply(item, tree) for item in value]
+        if not isinstance(value, dict) or any(key in value for key in _PASSTHROUGH):
+            return value
+        return {key: self._apply(value[key], sub) for key, sub in tree.items() if key in value}
+
+
+def project(value: Any, fields: Optional[List[str]]) -> Any:
+    """Apply a field projection if one was requested"""
+    return Projection(fields).apply(value) if fields else value
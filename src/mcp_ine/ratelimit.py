@@ -0,0 +1,183 @@
+"""Rate limiting - Per-host token buckets and retries with jittered backoff"""
+import asyncio, logging, random, threading, time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+
+logger = logging.getLogger('mcp_ine')
+
+# Responses worth retrying: throttling and server-side failures
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Timeouts and dropped connections (requests and httpx)
+TRANSIENT_ERRORS = (requests.Timeout, requests.ConnectionError,
+                    httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+
+def retry_after(headers: Any) -> Optional[float]:
+    """Seconds requested by a Retry-After header (delta-seconds or HTTP-date), if any"""
+    value = headers.get('Retry-After') if headers is not None else None
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Token bucket whose refill rate adapts to upstream throttling
+
+    reserve() takes a token immediately and returns how long the caller must
+    wait before using it, so the same bucket serves threads and coroutines.
+    A 429 halves the rate (down to 1/16 of the configured one) and pauses the
+    bucket for the Retry-After period; each success restores 1/32 of it.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.max_rate = self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate) - 1
+            self.updated = now
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.paused_until - now)
+
+    def throttled(self, pause: float) -> None:
+        with self._lock:
+            self.rate = max(self.rate / 2, self.max_rate / 16)
+            self.paused_until = max(self.paused_until, time.monotonic() + pause)
+
+    def succeeded(self) -> None:
+        if self.rate < self.max_rate:
+            with self._lock:
+                self.rate = min(self.rate + self.max_rate / 32, self.max_rate)
+
+
+class RateLimiter:
+    """Client-side limits for every upstream host, shared by all requests
+
+    send() and send_async() wait for a token of the URL's host, run the call
+    and retry timeouts, dropped connections, 429 and 5xx responses up to
+    `retries` times with full-jitter exponential backoff. A Retry-After header
+    sets the minimum wait; one longer than `max_delay` is not waited out and
+    the response is returned as is. A rate of 0 disables the buckets.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 20, retries: int = 3,
+                 base_delay: float = 0.5, max_delay: float = 30.0):
+        self.rate, self.burst = rate, burst
+        self.retries, self.base_delay, self.max_delay = max(retries, 0), base_delay, max_delay
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self.counters = {'requests': 0, 'retries': 0, 'throttled': 0, 'wait_seconds': 0.0}
+
+    def bucket(self, url: str) -> Optional[TokenBucket]:
+        """Token bucket for the host of url (None when rate limiting is disabled)"""
+        if self.rate <= 0:
+            return None
+        host = urlsplit(url).netloc
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.setdefault(host, TokenBucket(self.rate, self.burst))
+        return bucket
+
+    def backoff(self, attempt: int, after: Optional[float] = None) -> Optional[float]:
+        """Delay before retry number attempt + 1, or None when no retry should be made"""
+        if attempt >= self.retries or (after is not None and after > self.max_delay):
+            return None
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        return delay if after is None else after + delay * 0.1
+
+    def _wait(self, url: str) -> float:
+        bucket = self.bucket(url)
+        wait = bucket.reserve() if bucket else 0.0
+        self.counters['requests'] += 1
+        self.counters['wait_seconds'] += wait
+        return wait
+
+    def _retry_delay(self, url: str, attempt: int, response: Any) -> Optional[float]:
+        """Backoff for a retryable response, updating the host bucket on 429"""
+        if response.status_code not in RETRY_STATUSES:
+            bucket = self.bucket(url)
+            if bucket:
+                bucket.succeeded()
+            return None
+        after = retry_after(response.headers)
+        if response.status_code == 429:
+            self.counters['throttled'] += 1
+            bucket = self.bucket(url)
+            if bucket:
+                bucket.throttled(after if after is not None else self.base_delay)
+        delay = self.backoff(attempt, after)
+        if delay is not None:
+            self.counters['retries'] += 1
+            logger.warning(f"Retrying {url} in {delay:.1f}s after HTTP {response.status_code}")
+        return delay
+
+    def send(self, url: str, call: Callable[[], Any]) -> Any:
+        """Run a blocking HTTP call (requests) under the host's limits, with retries"""
+        attempt = 0
+        while True:
+            wait = self._wait(url)
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                response = call()
+            except TRANSIENT_ERRORS as e:
+                delay = self.backoff(attempt)
+                if delay is None:
+                    raise
+                self.counters['retries'] += 1
+                logger.warning(f"Retrying {url} in {delay:.1f}s after {type(e).__name__}")
+            else:
+                delay = self._retry_delay(url, attempt, response)
+                if delay is None:
+                    return response
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    async def send_async(self, url: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Async version of send (httpx)"""
+        attempt = 0
+        while True:
+            wait = self._wait(url)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                response = await call()
+            except TRANSIENT_ERRORS as e:
+                delay = self.backoff(attempt)
+                if delay is None:
+                    raise
+                self.counters['retries'] += 1
+                logger.warning(f"Retrying {url} in {delay:.1f}s after {type(e).__name__}")
+            else:
+                delay = self._retry_delay(url, attempt, response)
+                if delay is None:
+                    return response
+                await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Request, retry and throttling counts, plus each host's current rate"""
+        return {**self.counters, 'wait_seconds': round(self.counters['wait_seconds'], 3),
+                'hosts': {host: {'rate': round(b.rate, 2), 'max_rate': b.max_rate}
+                          for host, b in list(self._buckets.items())}}
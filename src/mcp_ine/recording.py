@@ -0,0 +1,144 @@
+"""Record/replay - Archive upstream exchanges and serve them back without network"""
+import json, logging, os, sqlite3, threading, time, zlib
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+
+import requests
+
+logger = logging.getLogger('mcp_ine')
+
+# Response headers kept in the archive (validators drive cache revalidation)
+_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+def archive_key(key: str) -> str:
+    """Request key without scheme and host, so an archive replays against any mirror of the APIs"""
+    _, sep, rest = key.partition('://')
+    return '/' + rest.partition('/')[2] if sep else key
+
+
+class RecordingMissing(LookupError):
+    """Raised in replay mode for a request the archive does not hold"""
+
+    def __init__(self, key: str):
+        super().__init__(f"No recorded response for {key}")
+        self.key = key
+
+
+class RecordedResponse:
+    """Archived response with the parts of the requests/httpx response API the server uses"""
+
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes):
+        self.url, self.status_code, self.headers, self.content = url, status_code, headers, content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8')
+
+    def json(self, **kwargs: Any) -> Any:
+        return json.loads(self.content, **kwargs)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} (recorded) for url: {self.url}", response=self)
+
+    def iter_content(self, chunk_size: int = 65536) -> Iterator[bytes]:
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    async def aiter_bytes(self, chunk_size: int = 65536) -> AsyncIterator[bytes]:
+        for chunk in self.iter_content(chunk_size):
+            yield chunk
+
+    def close(self) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+    def __enter__(self) -> 'RecordedResponse':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        pass
+
+
+class Recorder:
+    """SQLite archive of upstream responses keyed by canonical request (path, query, Censo payload)
+
+    mode 'record': every final upstream response (after retries) is stored,
+    zlib-compressed, with its status, validators and wall time; a newer
+    response replaces the older one for the same request. mode 'replay':
+    requests are answered from the archive only, never from the network, and
+    an unrecorded request fails with RecordingMissing. Any other mode is off.
+    """
+
+    def __init__(self, path: Optional[str] = None, mode: str = ''):
+        self.mode = mode if mode in ('record', 'replay') else ''
+        self.path = path
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.counters = {'recorded': 0, 'replayed': 0, 'missing': 0}
+        if self.mode and path:
+            self._open(path)
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == 'record'
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == 'replay'
+
+    def _open(self, path: str) -> None:
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS recordings ("
+                       "key TEXT PRIMARY KEY, url TEXT NOT NULL, status INTEGER NOT NULL, headers TEXT NOT NULL, "
+                       "body BLOB NOT NULL, size INTEGER NOT NULL, elapsed REAL, recorded REAL NOT NULL)")
+            self._db = db
+        except sqlite3.Error as e:
+            logger.warning(f"Recording archive unavailable ({path}): {e}")
+
+    def record(self, key: str, url: str, response: Any, elapsed: Optional[float] = None) -> None:
+        """Store a response (requests or httpx, body already read); 304s are skipped"""
+        if self._db is None or response.status_code == 304:
+            return
+        content = response.content
+        headers = {name: response.headers[name] for name in _HEADERS if response.headers.get(name)}
+        row = (archive_key(key), url, response.status_code, json.dumps(headers), zlib.compress(content, 6),
+               len(content), elapsed, time.time())
+        with self._lock:
+            try:
+                self._db.execute("INSERT OR REPLACE INTO recordings VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row)
+                self.counters['recorded'] += 1
+            except sqlite3.Error as e:
+                logger.warning(f"Recording failed for {key}: {e}")
+
+    def replay(self, key: str) -> RecordedResponse:
+        """Archived response for key, or RecordingMissing"""
+        row = None
+        if self._db is not None:
+            with self._lock:
+                try:
+                    row = self._db.execute("SELECT url, status, headers, body FROM recordings WHERE key = ?",
+                                           (archive_key(key),)).fetchone()
+                except sqlite3.Error as e:
+                    logger.warning(f"Replay read failed for {key}: {e}")
+        if row is None:
+            self.counters['missing'] += 1
+            raise RecordingMissing(key)
+        self.counters['replayed'] += 1
+        return RecordedResponse(row[0], row[1], json.loads(row[2]), zlib.decompress(row[3]))
+
+    def stats(self) -> Dict[str, Any]:
+        """Mode, archived responses and their raw vs stored size"""
+        result = {'mode': self.mode or 'off', **self.counters}
+        if self._db is not None:
+            with self._lock:
+                entries, raw, stored = self._db.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(body)), 0) FROM recordings"
+                ).fetchone()
+            result.update(path=self.path, entries=entries, raw_bytes=raw, stored_bytes=stored)
+        return result
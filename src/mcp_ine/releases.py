@@ -0,0 +1,108 @@
+"""Release calendar - Expire cached INE data at the next scheduled publication"""
+import time, threading
+from typing import Any, Dict, List, Optional, Tuple
+
+# Tempus functions whose responses change when an operation publishes
+RELEASE_FUNCTIONS = ('DATOS_SERIE', 'DATOS_TABLA', 'DATOS_METADATAOPERACION')
+
+
+class ReleaseCalendar:
+    """Map cached data to its operation's publications and their release dates
+
+    Mappings are learned from responses passing through ine_request
+    (TABLAS_OPERACION, SERIE, SERIES_*, PUBLICACIONES_OPERACION,
+    PUBLICACIONFECHA_PUBLICACION); anything still unknown is reported by
+    missing() so the caller can fetch it.
+    """
+
+    def __init__(self, max_ttl: float = 45 * 86400, grace: float = 36 * 3600,
+                 dates_ttl: float = 86400):
+        self.max_ttl = max_ttl
+        self.grace = grace
+        self.dates_ttl = dates_ttl
+        self._table_publication: Dict[str, int] = {}
+        self._series_operation: Dict[str, str] = {}
+        self._operation_publications: Dict[str, List[int]] = {}
+        self._publication_dates: Dict[int, Tuple[List[float], float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, function: str, input_param: Optional[str], data: Any) -> None:
+        """Learn table, series, operation and publication links from a response"""
+        items = data if isinstance(data, list) else [data]
+        items = [i for i in items if isinstance(i, dict) and 'error' not in i]
+        with self._lock:
+            if function == 'TABLAS_OPERACION':
+                for t in items:
+                    if t.get('Id') is not None and t.get('FK_Publicacion') is not None:
+                        self._table_publication[str(t['Id'])] = t['FK_Publicacion']
+            elif function in ('SERIE', 'SERIES_OPERACION', 'SERIES_TABLA', 'SERIE_METADATAOPERACION'):
+                for s in items:
+                    if s.get('COD') and s.get('FK_Operacion') is not None:
+                        self._series_operation[s['COD']] = str(s['FK_Operacion'])
+            elif function == 'PUBLICACIONES_OPERACION' and input_param:
+                self._operation_publications[str(input_param)] = [p['Id'] for p in items if 'Id' in p]
+            elif function == 'PUBLICACIONFECHA_PUBLICACION' and input_param:
+                dates = sorted(d['Fecha'] / 1000 for d in items if isinstance(d.get('Fecha'), (int, float)))
+                self._publication_dates[int(input_param)] = (dates, time.time())
+
+    def _publications(self, function: str, input_param: Optional[str], data: Any) -> Tuple[Optional[List[int]], Optional[Tuple[str, str]]]:
+        """Publications governing a response, or the request needed to find them"""
+        key = str(input_param)
+        if function == 'DATOS_TABLA' and key in self._table_publication:
+            return [self._table_publication[key]], None
+        if function == 'DATOS_METADATAOPERACION':
+            operation = key
+        else:
+            # DATOS_SERIE is one series; for DATOS_TABLA any series identifies the operation
+            first = data[0] if isinstance(data, list) and data else data
+            code = key if function == 'DATOS_SERIE' else (first.get('COD') if isinstance(first, dict) else None)
+            if not code:
+                return None, None
+            operation = self._series_operation.get(code)
+            if operation is None:
+                return None, ('SERIE', code)
+        if operation not in self._operation_publications:
+            return None, ('PUBLICACIONES_OPERACION', operation)
+        return self._operation_publications[operation], None
+
+    def missing(self, function: str, input_param: Optional[str], data: Any) -> Optional[Tuple[str, str]]:
+        """Next (function, input) to fetch before expiry() can be computed, if any"""
+        if function not in RELEASE_FUNCTIONS:
+            return None
+        with self._lock:
+            publications, need = self._publications(function, input_param, data)
+            if need:
+                return need
+            for pub in publications or []:
+                known = self._publication_dates.get(pub)
+                if known is None or time.time() - known[1] > self.dates_ttl:
+                    return ('PUBLICACIONFECHA_PUBLICACION', str(pub))
+        return None
+
+    def expiry(self, function: str, input_param: Optional[str], data: Any) -> Optional[float]:
+        """Timestamp the response stays valid until, or None to use the fixed TTL
+
+        Data is valid until the next release of its operation (capped at
+        max_ttl). Right after a release INE may still be publishing, so within
+        the grace period the fixed TTL applies until the next window.
+        """
+        if function not in RELEASE_FUNCTIONS:
+            return None
+        now = time.time()
+        with self._lock:
+            publications, _ = self._publications(function, input_param, data)
+            if not publications:
+                return None
+            dates = [d for pub in publications for d in self._publication_dates.get(pub, ([], 0))[0]]
+        upcoming = [d for d in dates if d > now]
+        if not upcoming:
+            return None
+        if any(now - self.grace < d <= now for d in dates):
+            return None
+        return min(min(upcoming), now + self.max_ttl)
+
+    def stats(self) -> Dict[str, int]:
+        """Number of learned mappings"""
+        return {'tables': len(self._table_publication), 'series': len(self._series_operation),
+                'operations': len(self._operation_publications),
+                'publications': len(self._publication_dates)}
@@ -1,6 +1,16 @@
 """INE API Resources - Read operations for INE statistical data"""
-from typing import Optional, List, Dict, Any
-from .common import ine_request, logger
+import asyncio, time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing, closing
+from typing import Optional, List, Dict, Any, AsyncIterator, Callable
+from .common import (ine_request, ine_request_async, ine_stream, ine_stream_async, logger, spawn, inflight,
+                     series_catalog, search_index, series_store, INE_PAGE_CONCURRENCY, INE_CATALOG_MAX_AGE,
+                     INE_SEARCH_MAX_AGE, INE_SERIES_STORE, INE_STREAM_DECODE, INE_SHARD_PERIODS,
+                     INE_BATCH_CONCURRENCY, INE_PAGE_SIZE, INE_MAX_PAGES, tracer)
+from .concurrency import iter_pages, gather_bounded, Page
+from .columnar import SeriesColumns, TableColumns
+from .sharding import date_shards, merge_shards
+from .projection import Projection
 
 # =============================================================================
 # Helper functions
@@ -17,6 +27,157 @@ def _safe_result(data: Any) -> List[Dict[str, Any]]:
         return [data]
     return data if isinstance(data, list) else [data]
 
+def _use_store(nult: Optional[int], date: Optional[str], friendly: bool) -> bool:
+    """Last-N requests in the default representation are served through the series store"""
+    return INE_SERIES_STORE and bool(nult) and not date and not friendly
+
+async def _stream_fields_async(function: str, input_param: Optional[str], params: Optional[Dict[str, Any]],
+                               fields: List[str], keep: Optional[Callable[[Dict[str, Any]], bool]] = None) -> Page:
+    """A listing decoded one item at a time, each item cut down to `fields` as soon as it is decoded
+
+    Only the projected items are held, never the whole decoded list. Items
+    failing `keep` are dropped before projection; Page.size counts every item
+    upstream sent, so paging still sees a full page. A fresh cached response
+    is served from the cache, but a downloaded one is not stored in it.
+    """
+    projection, kept, size = Projection(fields), Page(), 0
+    async with aclosing(ine_stream_async(function, input_param, params or None)) as stream:
+        async for item in stream:
+            if not isinstance(item, dict) or "error" in item:
+                kept.append(item)
+                continue
+            size += 1
+            if keep is None or keep(item):
+                kept.append(projection.apply(item))
+    kept.size = size
+    return kept
+
+def _store_request(function: str, input_param: str, params: Dict[str, Any]):
+    """Store key, request params (date=since: when the store can be refreshed incrementally) and whether incremental"""
+    key = series_store.key(function, input_param, params)
+    since = series_store.since(key, params.get('nult'))
+    if since is None:
+        return key, params, False
+    return key, {**{k: v for k, v in params.items() if k != 'nult'}, 'date': f"{since}:"}, True
+
+def _store_merge(key: str, data: Any, nult: int, incremental: bool) -> List[Dict[str, Any]]:
+    """Merge a response into the store and read back the last nult periods"""
+    series = data if isinstance(data, list) else [data]
+    # A full-window request that came back short holds the whole history
+    full = not incremental and max((len(s.get('Data') or []) for s in series if isinstance(s, dict)), default=0) < nult
+    series_store.merge(key, series, full)
+    return series_store.read(key, nult)
+
+def _synced_request(function: str, input_param: str, params: Dict[str, Any]) -> Any:
+    """ine_request that only downloads periods newer than the stored ones (plus the revision window)"""
+    key, request, incremental = _store_request(function, input_param, params)
+    data = ine_request(function, input_param, request)
+    if isinstance(data, dict) and "error" in data:
+        return data
+    return _store_merge(key, data, params['nult'], incremental)
+
+async def _synced_request_async(function: str, input_param: str, params: Dict[str, Any]) -> Any:
+    """Async version of _synced_request; store reads and merges run in worker threads"""
+    key, request, incremental = await asyncio.to_thread(_store_request, function, input_param, params)
+    data = await ine_request_async(function, input_param, request)
+    if isinstance(data, dict) and "error" in data:
+        return data
+    return await asyncio.to_thread(_store_merge, key, data, params['nult'], incremental)
+
+_table_periodicities: Dict[str, int] = {}  # a table keeps its periodicity
+
+def _periodicity(info: Any) -> Optional[int]:
+    return info.get('FK_Periodicidad') if isinstance(info, dict) else None
+
+def _shard_periodicity(function: str, input_param: str) -> Optional[int]:
+    """Periodicity of a series (SERIE, cached) or of a table's first series
+
+    SERIES_TABLA is streamed and dropped after its first series rather than
+    downloaded whole, and the answer is remembered per table.
+    """
+    if function == "DATOS_SERIE":
+        return _periodicity(ine_request("SERIE", input_param))
+    if input_param not in _table_periodicities:
+        with closing(ine_stream("SERIES_TABLA", input_param)) as stream:
+            periodicity = _periodicity(next(stream, None))
+        if periodicity is None:
+            return None
+        _table_periodicities[input_param] = periodicity
+    return _table_periodicities[input_param]
+
+async def _shard_periodicity_async(function: str, input_param: str) -> Optional[int]:
+    """Async version of _shard_periodicity"""
+    if function == "DATOS_SERIE":
+        return _periodicity(await ine_request_async("SERIE", input_param))
+    if input_param not in _table_periodicities:
+        async with aclosing(ine_stream_async("SERIES_TABLA", input_param)) as stream:
+            periodicity = _periodicity(await anext(stream, None))
+        if periodicity is None:
+            return None
+        _table_periodicities[input_param] = periodicity
+    return _table_periodicities[input_param]
+
+def _merge_shard_responses(responses: List[Any]) -> Any:
+    for response in responses:
+        if isinstance(response, dict) and "error" in response:
+            return response
+    return merge_shards(responses) or responses[0]
+
+def _sharded_request(function: str, input_param: str, params: Dict[str, Any]) -> Any:
+    """Fetch a long date range as concurrent shards of INE_SHARD_PERIODS periods; None if it fits in one"""
+    if not INE_SHARD_PERIODS or len(date_shards(params['date'], 1, INE_SHARD_PERIODS)) < 2:
+        return None
+    shards = date_shards(params['date'], _shard_periodicity(function, input_param), INE_SHARD_PERIODS)
+    if len(shards) < 2:
+        return None
+    with ThreadPoolExecutor(max(INE_PAGE_CONCURRENCY, 1)) as pool:
+        responses = list(pool.map(lambda shard: ine_request(function, input_param, {**params, 'date': shard}),
+                                  shards))
+    return _merge_shard_responses(responses)
+
+async def _sharded_request_async(function: str, input_param: str, params: Dict[str, Any]) -> Any:
+    """Async version of _sharded_request"""
+    if not INE_SHARD_PERIODS or len(date_shards(params['date'], 1, INE_SHARD_PERIODS)) < 2:
+        return None
+    shards = date_shards(params['date'], await _shard_periodicity_async(function, input_param), INE_SHARD_PERIODS)
+    if len(shards) < 2:
+        return None
+    responses = await gather_bounded(lambda shard: ine_request_async(function, input_param, {**params, 'date': shard}),
+                                     shards, INE_PAGE_CONCURRENCY)
+    return _merge_shard_responses(responses)
+
+def _data_request(function: str, input_param: str, params: Dict[str, Any]) -> Any:
+    """DATOS_SERIE / DATOS_TABLA through the series store (nult), date shards (long ranges) or one request"""
+    if _use_store(params.get('nult'), params.get('date'), 'A' in params.get('tip', '')):
+        return _synced_request(function, input_param, params)
+    if params.get('date') and not params.get('nult'):
+        sharded = _sharded_request(function, input_param, params)
+        if sharded is not None:
+            return sharded
+    return ine_request(function, input_param, params if params else None)
+
+async def _data_request_async(function: str, input_param: str, params: Dict[str, Any]) -> Any:
+    """Async version of _data_request"""
+    if _use_store(params.get('nult'), params.get('date'), 'A' in params.get('tip', '')):
+        return await _synced_request_async(function, input_param, params)
+    if params.get('date') and not params.get('nult'):
+        sharded = await _sharded_request_async(function, input_param, params)
+        if sharded is not None:
+            return sharded
+    return await ine_request_async(function, input_param, params if params else None)
+
+def _operation_matches(op: Dict[str, Any], filter_text: str) -> bool:
+    fl = filter_text.lower()
+    return fl in op.get('Codigo', '').lower() or fl in op.get('Nombre', '').lower()
+
+def _filter_operations(result: Any, filter_text: Optional[str]) -> List[Dict[str, Any]]:
+    """Filter operations by code or name"""
+    if filter_text and isinstance(result, list):
+        with tracer.span('filter', filter_text=filter_text, items_in=len(result)):
+            result = [op for op in result if _operation_matches(op, filter_text)]
+            tracer.annotate(items_out=len(result))
+    return _safe_result(result)
+
 # =============================================================================
 # Operations
 # =============================================================================
@@ -25,30 +186,56 @@ def list_operations(filter_text: Optional[str] = None, det: int = None,
                    geo: int = None, page: int = None) -> List[Dict[str, Any]]:
     """List available INE statistical operations (OPERACIONES_DISPONIBLES)"""
     params = {k: v for k, v in {'det': det, 'geo': geo, 'page': page}.items() if v is not None}
-    result = ine_request("OPERACIONES_DISPONIBLES", params=params)
-    
-    if filter_text and isinstance(result, list):
-        fl = filter_text.lower()
-        result = [op for op in result if fl in op.get('Codigo', '').lower() or fl in op.get('Nombre', '').lower()]
-    
-    return _safe_result(result)
+    return _filter_operations(ine_request("OPERACIONES_DISPONIBLES", params=params), filter_text)
+
+async def list_operations_async(filter_text: Optional[str] = None, det: int = None, 
+                               geo: int = None, page: int = None,
+                               fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Async version of list_operations; with fields, operations are filtered and projected while decoding"""
+    params = {k: v for k, v in {'det': det, 'geo': geo, 'page': page}.items() if v is not None}
+    if fields:
+        return await _stream_fields_async("OPERACIONES_DISPONIBLES", None, params, fields,
+                                          (lambda op: _operation_matches(op, filter_text)) if filter_text else None)
+    return _filter_operations(await ine_request_async("OPERACIONES_DISPONIBLES", params=params), filter_text)
 
 def get_operation(operation_code: str, det: int = None) -> Dict[str, Any]:
     """Get details of a specific operation (OPERACION)"""
     params = {'det': det} if det else None
     return ine_request("OPERACION", operation_code, params)
 
+async def get_operation_async(operation_code: str, det: int = None) -> Dict[str, Any]:
+    """Async version of get_operation"""
+    params = {'det': det} if det else None
+    return await ine_request_async("OPERACION", operation_code, params)
+
 def get_operation_variables(operation_code: str, page: int = None) -> List[Dict[str, Any]]:
     """Get all variables used in an operation (VARIABLES_OPERACION)"""
     params = {'page': page} if page else None
     return _safe_result(ine_request("VARIABLES_OPERACION", operation_code, params))
 
+async def get_operation_variables_async(operation_code: str, page: int = None,
+                                        fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Async version of get_operation_variables; with fields, variables are projected while decoding"""
+    params = {'page': page} if page else None
+    if fields:
+        return await _stream_fields_async("VARIABLES_OPERACION", operation_code, params, fields)
+    return _safe_result(await ine_request_async("VARIABLES_OPERACION", operation_code, params))
+
 def get_variable_values_operation(variable_id: int, operation_code: str, 
                                   det: int = None) -> List[Dict[str, Any]]:
     """Get variable values for a specific operation (VALORES_VARIABLEOPERACION)"""
     params = {'det': det} if det else None
     return _safe_result(ine_request("VALORES_VARIABLEOPERACION", f"{variable_id}/{operation_code}", params))
 
+async def get_variable_values_operation_async(variable_id: int, operation_code: str, det: int = None,
+                                              fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Async version of get_variable_values_operation; with fields, values are projected while decoding"""
+    params = {'det': det} if det else None
+    if fields:
+        return await _stream_fields_async("VALORES_VARIABLEOPERACION", f"{variable_id}/{operation_code}", params,
+                                          fields)
+    return _safe_result(await ine_request_async("VALORES_VARIABLEOPERACION", f"{variable_id}/{operation_code}", params))
+
 # =============================================================================
 # Tables
 # =============================================================================
@@ -61,15 +248,34 @@ def get_operation_tables(operation_code: str, det: int = None, geo: int = None,
         params['tip'] = 'A'
     return _safe_result(ine_request("TABLAS_OPERACION", operation_code, params))
 
+async def get_operation_tables_async(operation_code: str, det: int = None, geo: int = None,
+                                    friendly: bool = False, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Async version of get_operation_tables; with fields, tables are projected while decoding"""
+    params = {k: v for k, v in {'det': det, 'geo': geo}.items() if v is not None}
+    if friendly:
+        params['tip'] = 'A'
+    if fields:
+        return await _stream_fields_async("TABLAS_OPERACION", operation_code, params, fields)
+    return _safe_result(await ine_request_async("TABLAS_OPERACION", operation_code, params))
+
 def get_table_groups(table_id: int) -> List[Dict[str, Any]]:
     """Get selection groups for a table (GRUPOS_TABLA)"""
     return _safe_result(ine_request("GRUPOS_TABLA", str(table_id)))
 
+async def get_table_groups_async(table_id: int) -> List[Dict[str, Any]]:
+    """Async version of get_table_groups"""
+    return _safe_result(await ine_request_async("GRUPOS_TABLA", str(table_id)))
+
 def get_group_values(table_id: int, group_id: int, det: int = None) -> List[Dict[str, Any]]:
     """Get values of a group in a table (VALORES_GRUPOSTABLA)"""
     params = {'det': det} if det else None
     return _safe_result(ine_request("VALORES_GRUPOSTABLA", f"{table_id}/{group_id}", params))
 
+async def get_group_values_async(table_id: int, group_id: int, det: int = None) -> List[Dict[str, Any]]:
+    """Async version of get_group_values"""
+    params = {'det': det} if det else None
+    return _safe_result(await ine_request_async("VALORES_GRUPOSTABLA", f"{table_id}/{group_id}", params))
+
 def get_table_series(table_id: int, det: int = None, friendly: bool = False,
                     metadata: bool = False, tv: str = None) -> List[Dict[str, Any]]:
     """Get series codes from a table without data (SERIES_TABLA)"""
@@ -79,6 +285,17 @@ def get_table_series(table_id: int, det: int = None, friendly: bool = False,
         params['tip'] = tip
     return _safe_result(ine_request("SERIES_TABLA", str(table_id), params))
 
+async def get_table_series_async(table_id: int, det: int = None, friendly: bool = False, metadata: bool = False,
+                                tv: str = None, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Async version of get_table_series; with fields, series are projected while decoding"""
+    params = {k: v for k, v in {'det': det, 'tv': tv}.items() if v is not None}
+    tip = _build_tip_param(friendly, metadata)
+    if tip:
+        params['tip'] = tip
+    if fields:
+        return await _stream_fields_async("SERIES_TABLA", str(table_id), params, fields)
+    return _safe_result(await ine_request_async("SERIES_TABLA", str(table_id), params))
+
 def get_table_data(table_id: int, nult: int = None, date: str = None, det: int = None,
                   friendly: bool = False, metadata: bool = False, tv: str = None) -> List[Dict[str, Any]]:
     """Get data from a table (DATOS_TABLA)"""
@@ -86,7 +303,16 @@ def get_table_data(table_id: int, nult: int = None, date: str = None, det: int =
     tip = _build_tip_param(friendly, metadata)
     if tip:
         params['tip'] = tip
-    return _safe_result(ine_request("DATOS_TABLA", str(table_id), params))
+    return _safe_result(_data_request("DATOS_TABLA", str(table_id), params))
+
+async def get_table_data_async(table_id: int, nult: int = None, date: str = None, det: int = None,
+                              friendly: bool = False, metadata: bool = False, tv: str = None) -> List[Dict[str, Any]]:
+    """Async version of get_table_data"""
+    params = {k: v for k, v in {'nult': nult, 'date': date, 'det': det, 'tv': tv}.items() if v is not None}
+    tip = _build_tip_param(friendly, metadata)
+    if tip:
+        params['tip'] = tip
+    return _safe_result(await _data_request_async("DATOS_TABLA", str(table_id), params))
 
 # =============================================================================
 # Series
@@ -101,11 +327,25 @@ def get_series_info(series_code: str, det: int = None, friendly: bool = False,
         params['tip'] = tip
     return ine_request("SERIE", series_code, params if params else None)
 
+async def get_series_info_async(series_code: str, det: int = None, friendly: bool = False,
+                               metadata: bool = False) -> Dict[str, Any]:
+    """Async version of get_series_info"""
+    params = {'det': det} if det else {}
+    tip = _build_tip_param(friendly, metadata)
+    if tip:
+        params['tip'] = tip
+    return await ine_request_async("SERIE", series_code, params if params else None)
+
 def get_series_values(series_code: str, det: int = None) -> List[Dict[str, Any]]:
     """Get variables/values that define a series (VALORES_SERIE)"""
     params = {'det': det} if det else None
     return _safe_result(ine_request("VALORES_SERIE", series_code, params))
 
+async def get_series_values_async(series_code: str, det: int = None) -> List[Dict[str, Any]]:
+    """Async version of get_series_values"""
+    params = {'det': det} if det else None
+    return _safe_result(await ine_request_async("VALORES_SERIE", series_code, params))
+
 def get_series_data(series_code: str, nult: int = None, date: str = None, det: int = None,
                    friendly: bool = False, metadata: bool = False) -> Dict[str, Any]:
     """Get data from a series (DATOS_SERIE)"""
@@ -113,7 +353,42 @@ def get_series_data(series_code: str, nult: int = None, date: str = None, det: i
     tip = _build_tip_param(friendly, metadata)
     if tip:
         params['tip'] = tip
-    return ine_request("DATOS_SERIE", series_code, params if params else None)
+    result = _data_request("DATOS_SERIE", series_code, params)
+    return result[0] if isinstance(result, list) and result else result
+
+async def get_series_data_async(series_code: str, nult: int = None, date: str = None, det: int = None,
+                               friendly: bool = False, metadata: bool = False) -> Dict[str, Any]:
+    """Async version of get_series_data"""
+    params = {k: v for k, v in {'nult': nult, 'date': date, 'det': det}.items() if v is not None}
+    tip = _build_tip_param(friendly, metadata)
+    if tip:
+        params['tip'] = tip
+    result = await _data_request_async("DATOS_SERIE", series_code, params)
+    return result[0] if isinstance(result, list) and result else result
+
+def _batch_result(codes: List[str], results: List[Any]) -> Dict[str, Any]:
+    """Split per-series responses into results and errors, keyed by series code"""
+    batch = {"results": {}, "errors": {}}
+    for code, result in zip(codes, results):
+        if isinstance(result, BaseException):
+            batch["errors"][code] = str(result)
+        elif isinstance(result, dict) and "error" in result:
+            batch["errors"][code] = result["error"]
+        else:
+            batch["results"][code] = result
+    return batch
+
+async def get_series_data_batch_async(series_codes: List[str], nult: int = None, date: str = None,
+                                      det: int = None, concurrency: int = None) -> Dict[str, Any]:
+    """Get data from several series (DATOS_SERIE) concurrently; one failing series does not fail the rest"""
+    codes = list(dict.fromkeys(series_codes))
+
+    async def fetch(code):
+        try:
+            return await get_series_data_async(code, nult, date, det)
+        except Exception as e:
+            return e
+    return _batch_result(codes, await gather_bounded(fetch, codes, concurrency or INE_BATCH_CONCURRENCY))
 
 def get_operation_series(operation_code: str, det: int = None, friendly: bool = False,
                         metadata: bool = False, page: int = None) -> List[Dict[str, Any]]:
@@ -124,6 +399,19 @@ def get_operation_series(operation_code: str, det: int = None, friendly: bool =
         params['tip'] = tip
     return _safe_result(ine_request("SERIES_OPERACION", operation_code, params if params else None))
 
+async def get_operation_series_async(operation_code: str, det: int = None, friendly: bool = False,
+                                    metadata: bool = False, page: int = None, fields: Optional[List[str]] = None,
+                                    keep: Optional[Callable[[Dict[str, Any]], bool]] = None) -> List[Dict[str, Any]]:
+    """Async version of get_operation_series; with fields, series are filtered by `keep` and
+    projected while decoding"""
+    params = {k: v for k, v in {'det': det, 'page': page}.items() if v is not None}
+    tip = _build_tip_param(friendly, metadata)
+    if tip:
+        params['tip'] = tip
+    if fields:
+        return await _stream_fields_async("SERIES_OPERACION", operation_code, params, fields, keep)
+    return _safe_result(await ine_request_async("SERIES_OPERACION", operation_code, params if params else None))
+
 # =============================================================================
 # Filtered data (metadata-based queries)
 # =============================================================================
@@ -139,6 +427,17 @@ def get_operation_data_filtered(operation_code: str, p: int = None, nult: int =
         params['tip'] = tip
     return _safe_result(ine_request("DATOS_METADATAOPERACION", operation_code, params if params else None))
 
+async def get_operation_data_filtered_async(operation_code: str, p: int = None, nult: int = None,
+                                           det: int = None, friendly: bool = False, metadata: bool = False,
+                                           g1: str = None, g2: str = None, g3: str = None, 
+                                           g4: str = None) -> List[Dict[str, Any]]:
+    """Async version of get_operation_data_filtered"""
+    params = {k: v for k, v in {'p': p, 'nult': nult, 'det': det, 'g1': g1, 'g2': g2, 'g3': g3, 'g4': g4}.items() if v is not None}
+    tip = _build_tip_param(friendly, metadata)
+    if tip:
+        params['tip'] = tip
+    return _safe_result(await ine_request_async("DATOS_METADATAOPERACION", operation_code, params if params else None))
+
 def get_series_metadata_operation(operation_code: str, p: int = None, det: int = None,
                                   friendly: bool = False, metadata: bool = False,
                                   g1: str = None, g2: str = None, g3: str = None,
@@ -150,6 +449,17 @@ def get_series_metadata_operation(operation_code: str, p: int = None, det: int =
         params['tip'] = tip
     return _safe_result(ine_request("SERIE_METADATAOPERACION", operation_code, params if params else None))
 
+async def get_series_metadata_operation_async(operation_code: str, p: int = None, det: int = None,
+                                              friendly: bool = False, metadata: bool = False,
+                                              g1: str = None, g2: str = None, g3: str = None,
+                                              g4: str = None) -> List[Dict[str, Any]]:
+    """Async version of get_series_metadata_operation"""
+    params = {k: v for k, v in {'p': p, 'det': det, 'g1': g1, 'g2': g2, 'g3': g3, 'g4': g4}.items() if v is not None}
+    tip = _build_tip_param(friendly, metadata)
+    if tip:
+        params['tip'] = tip
+    return _safe_result(await ine_request_async("SERIE_METADATAOPERACION", operation_code, params if params else None))
+
 # =============================================================================
 # Variables
 # =============================================================================
@@ -159,17 +469,40 @@ def get_all_variables(page: int = None) -> List[Dict[str, Any]]:
     params = {'page': page} if page else None
     return _safe_result(ine_request("VARIABLES", params=params))
 
+async def get_all_variables_async(page: int = None, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Async version of get_all_variables; with fields, variables are projected while decoding"""
+    params = {'page': page} if page else None
+    if fields:
+        return await _stream_fields_async("VARIABLES", None, params, fields)
+    return _safe_result(await ine_request_async("VARIABLES", params=params))
+
 def get_variable_values(variable_id: int, det: int = None, 
                        clasif: str = None) -> List[Dict[str, Any]]:
     """Get all values for a variable (VALORES_VARIABLE)"""
     params = {k: v for k, v in {'det': det, 'clasif': clasif}.items() if v is not None}
     return _safe_result(ine_request("VALORES_VARIABLE", str(variable_id), params if params else None))
 
+async def get_variable_values_async(variable_id: int, det: int = None, clasif: str = None,
+                                   fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Async version of get_variable_values; with fields, values are projected while decoding"""
+    params = {k: v for k, v in {'det': det, 'clasif': clasif}.items() if v is not None}
+    if fields:
+        return await _stream_fields_async("VALORES_VARIABLE", str(variable_id), params, fields)
+    return _safe_result(await ine_request_async("VALORES_VARIABLE", str(variable_id), params if params else None))
+
 def get_child_values(variable_id: int, value_id: int, det: int = None) -> List[Dict[str, Any]]:
     """Get child values in hierarchy (VALORES_HIJOS)"""
     params = {'det': det} if det else None
     return _safe_result(ine_request("VALORES_HIJOS", f"{variable_id}/{value_id}", params))
 
+async def get_child_values_async(variable_id: int, value_id: int, det: int = None,
+                                 fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Async version of get_child_values; with fields, values are projected while decoding"""
+    params = {'det': det} if det else None
+    if fields:
+        return await _stream_fields_async("VALORES_HIJOS", f"{variable_id}/{value_id}", params, fields)
+    return _safe_result(await ine_request_async("VALORES_HIJOS", f"{variable_id}/{value_id}", params))
+
 # =============================================================================
 # Reference data
 # =============================================================================
@@ -178,6 +511,10 @@ def get_periodicities() -> List[Dict[str, Any]]:
     """Get available periodicities (PERIODICIDADES)"""
     return _safe_result(ine_request("PERIODICIDADES"))
 
+async def get_periodicities_async() -> List[Dict[str, Any]]:
+    """Async version of get_periodicities"""
+    return _safe_result(await ine_request_async("PERIODICIDADES"))
+
 def get_publications(det: int = None, friendly: bool = False) -> List[Dict[str, Any]]:
     """Get all publications (PUBLICACIONES)"""
     params = {'det': det} if det else {}
@@ -185,6 +522,13 @@ def get_publications(det: int = None, friendly: bool = False) -> List[Dict[str,
         params['tip'] = 'A'
     return _safe_result(ine_request("PUBLICACIONES", params=params if params else None))
 
+async def get_publications_async(det: int = None, friendly: bool = False) -> List[Dict[str, Any]]:
+    """Async version of get_publications"""
+    params = {'det': det} if det else {}
+    if friendly:
+        params['tip'] = 'A'
+    return _safe_result(await ine_request_async("PUBLICACIONES", params=params if params else None))
+
 def get_operation_publications(operation_code: str, det: int = None, 
                                friendly: bool = False) -> List[Dict[str, Any]]:
     """Get publications for an operation (PUBLICACIONES_OPERACION)"""
@@ -193,10 +537,280 @@ def get_operation_publications(operation_code: str, det: int = None,
         params['tip'] = 'A'
     return _safe_result(ine_request("PUBLICACIONES_OPERACION", operation_code, params if params else None))
 
+async def get_operation_publications_async(operation_code: str, det: int = None, 
+                                           friendly: bool = False) -> List[Dict[str, Any]]:
+    """Async version of get_operation_publications"""
+    params = {'det': det} if det else {}
+    if friendly:
+        params['tip'] = 'A'
+    return _safe_result(await ine_request_async("PUBLICACIONES_OPERACION", operation_code, params if params else None))
+
+def get_publication_dates(publication_id: int) -> List[Dict[str, Any]]:
+    """Get release dates of a publication (PUBLICACIONFECHA_PUBLICACION)"""
+    return _safe_result(ine_request("PUBLICACIONFECHA_PUBLICACION", str(publication_id)))
+
+async def get_publication_dates_async(publication_id: int) -> List[Dict[str, Any]]:
+    """Async version of get_publication_dates"""
+    return _safe_result(await ine_request_async("PUBLICACIONFECHA_PUBLICACION", str(publication_id)))
+
 def get_classifications() -> List[Dict[str, Any]]:
     """Get all classifications (CLASIFICACIONES)"""
     return _safe_result(ine_request("CLASIFICACIONES"))
 
+async def get_classifications_async() -> List[Dict[str, Any]]:
+    """Async version of get_classifications"""
+    return _safe_result(await ine_request_async("CLASIFICACIONES"))
+
 def get_operation_classifications(operation_code: str) -> List[Dict[str, Any]]:
     """Get classifications for an operation (CLASIFICACIONES_OPERACION)"""
     return _safe_result(ine_request("CLASIFICACIONES_OPERACION", operation_code))
+
+async def get_operation_classifications_async(operation_code: str) -> List[Dict[str, Any]]:
+    """Async version of get_operation_classifications"""
+    return _safe_result(await ine_request_async("CLASIFICACIONES_OPERACION", operation_code))
+
+# =============================================================================
+# Auto-pagination (all pages, fetched concurrently, streamed in order)
+# =============================================================================
+
+async def _iter_items(fetch_page, concurrency: Optional[int]) -> AsyncIterator[Dict[str, Any]]:
+    """Flatten the pages of a paged endpoint into a stream of items"""
+    async with aclosing(iter_pages(fetch_page, concurrency or INE_PAGE_CONCURRENCY, page_size=INE_PAGE_SIZE,
+                                   max_pages=INE_MAX_PAGES)) as pages:
+        async for page in pages:
+            for item in page:
+                yield item
+
+async def iter_operations_async(filter_text: Optional[str] = None, det: int = None, geo: int = None,
+                                concurrency: int = None, fields: Optional[List[str]] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Stream every page of OPERACIONES_DISPONIBLES (projected to fields while decoding, if given)"""
+    if fields:  # filtered before projection; the page keeps its upstream size
+        fetch = lambda page: list_operations_async(filter_text, det, geo, page, fields)
+    else:  # filter after paging: a filtered page would look like the (short) last one
+        fetch = lambda page: list_operations_async(None, det, geo, page)
+    async with aclosing(_iter_items(fetch, concurrency)) as ops:
+        async for op in ops:
+            if fields or "error" in op or not filter_text or _filter_operations([op], filter_text):
+                yield op
+
+def iter_operation_variables_async(operation_code: str, concurrency: int = None,
+                                   fields: Optional[List[str]] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Stream every page of VARIABLES_OPERACION"""
+    return _iter_items(lambda page: get_operation_variables_async(operation_code, page, fields), concurrency)
+
+async def iter_operation_series_async(operation_code: str, det: int = None, friendly: bool = False,
+                                      metadata: bool = False, concurrency: int = None,
+                                      name_filter: Optional[str] = None, periodicity: Optional[int] = None,
+                                      fields: Optional[List[str]] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Stream every page of SERIES_OPERACION, filtering each page as it arrives
+
+    With fields, or with INE_STREAM_DECODE and a filter, pages are filtered
+    (and projected) while they download, so only the kept parts of matching
+    series are ever held in memory.
+    """
+    nf = name_filter.lower() if name_filter else None
+    matches = lambda s: ("error" in s or ((not nf or nf in s.get('Nombre', '').lower())
+                                          and (not periodicity or s.get('FK_Periodicidad') == periodicity)))
+
+    async def fetch_filtered(page: int) -> Page:
+        kept, size = Page(), 0
+        async with aclosing(stream_operation_series_async(operation_code, det, friendly, metadata, page)) as stream:
+            async for s in stream:
+                size += "error" not in s
+                if matches(s):
+                    kept.append(s)
+        kept.size = size
+        return kept
+
+    if fields:
+        fetch = lambda page: get_operation_series_async(operation_code, det, friendly, metadata, page, fields,
+                                                        matches)
+    elif INE_STREAM_DECODE and (nf or periodicity):
+        fetch = fetch_filtered
+    else:
+        fetch = lambda page: get_operation_series_async(operation_code, det, friendly, metadata, page)
+    async with aclosing(_iter_items(fetch, concurrency)) as series:
+        async for s in series:
+            if fields or matches(s):
+                yield s
+
+def iter_all_variables_async(concurrency: int = None, fields: Optional[List[str]] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Stream every page of VARIABLES"""
+    return _iter_items(lambda page: get_all_variables_async(page, fields), concurrency)
+
+# =============================================================================
+# Series catalogue (local index of SERIES_OPERACION with metadata)
+# =============================================================================
+
+def _store_catalog_page(operation: str, page: int, items: List[Dict[str, Any]]) -> bool:
+    """Re-index one SERIES_OPERACION page unless its content is unchanged; returns whether it changed"""
+    digest = series_catalog.page_digest(items)
+    if not series_catalog.page_changed(operation, page, digest):
+        return False
+    series_catalog.store_page(operation, page, items, digest)
+    return True
+
+def _index_catalog_series(operation: str) -> int:
+    """Replace an operation's series in the search index with the catalogue's (reads every series row)"""
+    return search_index.replace('series', series_catalog.documents(operation), operation)
+
+async def _index_operation_series(operation: str, operation_code: str, concurrency: Optional[int]) -> Dict[str, Any]:
+    start, pages, changed, total = time.monotonic(), 0, 0, 0
+    fetch = lambda page: get_operation_series_async(operation_code, metadata=True, page=page)
+    async with aclosing(iter_pages(fetch, concurrency or INE_PAGE_CONCURRENCY, page_size=INE_PAGE_SIZE,
+                                   max_pages=INE_MAX_PAGES)) as stream:
+        async for items in stream:
+            if not items:
+                break
+            if isinstance(items[0], dict) and "error" in items[0]:
+                return items[0]
+            pages += 1
+            total += len(items)
+            changed += await asyncio.to_thread(_store_catalog_page, operation, pages, items)
+    await asyncio.to_thread(series_catalog.finish, operation, pages)
+    if changed or pages == 0:
+        await asyncio.to_thread(_index_catalog_series, operation)
+    return {"operation": operation, "series": total, "pages": pages, "changed_pages": changed,
+            "seconds": round(time.monotonic() - start, 2)}
+
+async def index_operation_series_async(operation_code: str, concurrency: int = None) -> Dict[str, Any]:
+    """Build or refresh the local catalogue of an operation's series (SERIES_OPERACION, tip=M)
+
+    Pages come through the response cache, so unchanged pages are revalidated
+    rather than re-downloaded, and only pages whose content changed are re-indexed.
+    """
+    operation = str(operation_code).upper()
+    return await inflight.do_async(f"catalog:{operation}",
+                                   lambda: _index_operation_series(operation, operation_code, concurrency))
+
+async def search_operation_series_async(operation_code: str, name_filter: Optional[str] = None,
+                                        periodicity: Optional[int] = None, values: Optional[List[str]] = None,
+                                        limit: int = 100, metadata: bool = False) -> Optional[List[Dict[str, Any]]]:
+    """Query the local series catalogue; None if the operation has not been indexed
+
+    A catalogue older than INE_CATALOG_MAX_AGE is still answered from, and
+    refreshed in the background.
+    """
+    operation = str(operation_code).upper()
+    refreshed = await asyncio.to_thread(series_catalog.refreshed, operation)
+    if refreshed is None:
+        return None
+    if time.time() - refreshed > INE_CATALOG_MAX_AGE:
+        spawn(index_operation_series_async(operation_code))
+    return await asyncio.to_thread(series_catalog.search, operation, name_filter, periodicity, values,
+                                   limit, metadata)
+
+# =============================================================================
+# Search index (operations, tables and catalogued series)
+# =============================================================================
+
+async def _refresh_search_index() -> Dict[str, Any]:
+    operations = [op for op in await list_operations_async() if "error" not in op]
+    if not operations:
+        return {"error": "Operations list unavailable"}
+    tables = await gather_bounded(lambda op: get_operation_tables_async(str(op.get('Codigo') or op.get('Id'))),
+                                  operations, INE_PAGE_CONCURRENCY)
+    counts = {
+        "operations": await asyncio.to_thread(search_index.replace, 'operation', [
+            (op.get('Id'), op.get('Codigo'), op.get('Nombre'), op.get('Codigo'), op.get('Id')) for op in operations]),
+        "tables": await asyncio.to_thread(search_index.replace, 'table', [
+            (t.get('Id'), t.get('Codigo'), t.get('Nombre'), op.get('Codigo'), op.get('Id'))
+            for op, op_tables in zip(operations, tables) for t in op_tables if "error" not in t]),
+    }
+    for operation in await asyncio.to_thread(series_catalog.operations):
+        await asyncio.to_thread(_index_catalog_series, operation)
+    return counts
+
+async def refresh_search_index_async() -> Dict[str, Any]:
+    """Rebuild the search index from OPERACIONES_DISPONIBLES, TABLAS_OPERACION and the series catalogue
+
+    Upstream lists come through the response cache, so a rebuild after a
+    restart mostly reads the disk tier.
+    """
+    return await inflight.do_async("search:index", _refresh_search_index)
+
+def ensure_search_index() -> None:
+    """Refresh the search index in the background when it is missing or older than INE_SEARCH_MAX_AGE"""
+    built = search_index.built()
+    if built is None or time.time() - built > INE_SEARCH_MAX_AGE:
+        spawn(refresh_search_index_async())
+
+async def search_async(query: str, limit: int = 10, operation: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Relevance-ranked matches from the local search index, built first if it does not exist yet"""
+    built = await asyncio.to_thread(search_index.built)  # waits on the index lock during a rebuild
+    if built is None:
+        await refresh_search_index_async()
+    elif time.time() - built > INE_SEARCH_MAX_AGE:
+        spawn(refresh_search_index_async())
+    return await asyncio.to_thread(search_index.search, query, limit, operation)
+
+# =============================================================================
+# Columnar data (int64 Fecha, float64 Valor, bit-packed Secreto)
+# =============================================================================
+
+async def get_series_columns_async(series_code: str, nult: int = None, date: str = None,
+                                   det: int = None, metadata: bool = False) -> Any:
+    """Series data (DATOS_SERIE) as SeriesColumns, or the error dict"""
+    data = await get_series_data_async(series_code, nult, date, det, metadata=metadata)
+    return data if not isinstance(data, dict) or "error" in data else SeriesColumns.from_series(data)
+
+async def get_table_columns_async(table_id: int, nult: int = None, date: str = None, det: int = None,
+                                  tv: str = None, metadata: bool = False) -> Any:
+    """Table data (DATOS_TABLA) as TableColumns, or the error list
+
+    With INE_STREAM_DECODE (and outside the series store), each series is
+    converted as soon as it is decoded, so memory stays bounded by one series
+    plus the columns.
+    """
+    if INE_STREAM_DECODE and not _use_store(nult, date, False):
+        columns = TableColumns.empty()
+        async with aclosing(stream_table_data_async(table_id, nult, date, det, metadata=metadata, tv=tv)) as stream:
+            async for series in stream:
+                if "error" in series:
+                    return [series]
+                columns.append(series)
+        return columns
+    data = await get_table_data_async(table_id, nult, date, det, metadata=metadata, tv=tv)
+    return data if data and "error" in data[0] else TableColumns.from_table(data)
+
+# =============================================================================
+# Field projection
+# =============================================================================
+
+async def get_table_data_fields_async(table_id: int, fields: List[str], nult: int = None, date: str = None,
+                                      det: int = None, friendly: bool = False, metadata: bool = False,
+                                      tv: str = None) -> List[Dict[str, Any]]:
+    """Table data (DATOS_TABLA) keeping only `fields` of each series
+
+    With INE_STREAM_DECODE (and outside the series store), each series is
+    projected as soon as it is decoded, so unrequested fields are never held
+    for more than one series at a time.
+    """
+    projection = Projection(fields)
+    if INE_STREAM_DECODE and not _use_store(nult, date, friendly):
+        async with aclosing(stream_table_data_async(table_id, nult, date, det, friendly, metadata, tv)) as stream:
+            return [projection.apply(series) async for series in stream]
+    return projection.apply(await get_table_data_async(table_id, nult, date, det, friendly, metadata, tv))
+
+# =============================================================================
+# Streaming decode (one series at a time while the body downloads)
+# =============================================================================
+
+def stream_table_data_async(table_id: int, nult: int = None, date: str = None, det: int = None,
+                            friendly: bool = False, metadata: bool = False,
+                            tv: str = None) -> AsyncIterator[Dict[str, Any]]:
+    """Yield the series of a table (DATOS_TABLA) one at a time as they are decoded"""
+    params = {k: v for k, v in {'nult': nult, 'date': date, 'det': det, 'tv': tv}.items() if v is not None}
+    tip = _build_tip_param(friendly, metadata)
+    if tip:
+        params['tip'] = tip
+    return ine_stream_async("DATOS_TABLA", str(table_id), params)
+
+def stream_operation_series_async(operation_code: str, det: int = None, friendly: bool = False,
+                                  metadata: bool = False, page: int = None) -> AsyncIterator[Dict[str, Any]]:
+    """Yield the series of one SERIES_OPERACION page one at a time as they are decoded"""
+    params = {k: v for k, v in {'det': det, 'page': page}.items() if v is not None}
+    tip = _build_tip_param(friendly, metadata)
+    if tip:
+        params['tip'] = tip
+    return ine_stream_async("SERIES_OPERACION", operation_code, params if params else None)
@@ -0,0 +1,124 @@
+"""Search index - Ranked, accent-folded full-text index over operations, tables and series"""
+import logging, os, re, sqlite3, threading, time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .catalog import fold
+
+logger = logging.getLogger('mcp_ine')
+
+# Rank multipliers: with equal text relevance, operations come before tables and series
+KIND_WEIGHTS = {'operation': 1.5, 'table': 1.2, 'series': 1.0}
+
+# (ref, code, name, operation code, operation id)
+Document = Tuple[Any, Optional[str], Optional[str], Optional[str], Optional[Any]]
+
+
+class SearchIndex:
+    """Inverted index in SQLite (FTS5 with BM25 ranking when available)
+
+    Documents are replaced per kind (and per operation for series), so each
+    source can be refreshed independently. Without FTS5 a plain table with
+    folded names is scanned instead.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._lock = threading.Lock()
+        self._db, self.fts = self._open(path or ':memory:')
+
+    def _open(self, path: str):
+        try:
+            if path != ':memory:':
+                os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        except sqlite3.Error as e:
+            logger.warning(f"Search index kept in memory ({path}): {e}")
+            db = sqlite3.connect(':memory:', check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("CREATE TABLE IF NOT EXISTS search_meta (kind TEXT PRIMARY KEY, built REAL NOT NULL)")
+        try:
+            db.execute("CREATE VIRTUAL TABLE IF NOT EXISTS documents USING fts5("
+                       "kind UNINDEXED, ref UNINDEXED, code, name, operation UNINDEXED, operation_id UNINDEXED, "
+                       "tokenize = 'unicode61 remove_diacritics 2')")
+            return db, True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, search falls back to substring scans: {e}")
+            db.execute("CREATE TABLE IF NOT EXISTS documents (kind TEXT, ref TEXT, code TEXT, name TEXT, "
+                       "operation TEXT, operation_id TEXT, folded TEXT)")
+            return db, False
+
+    def replace(self, kind: str, documents: Iterable[Document], operation: Optional[str] = None) -> int:
+        """Replace every document of a kind (of one operation, if given); returns the count
+
+        Documents repeating a ref already seen are skipped, so repeated upstream rows do not
+        turn into duplicate hits.
+        """
+        unique: Dict[str, tuple] = {}
+        for ref, code, name, op, op_id in documents:
+            unique.setdefault(str(ref), (kind, str(ref), code or '', name or '', op or '',
+                                         '' if op_id is None else str(op_id)))
+        rows = list(unique.values())
+        if not self.fts:
+            rows = [row + (fold(f"{row[2]} {row[3]}"),) for row in rows]
+        where, args = ("kind = ? AND operation = ?", (kind, operation)) if operation else ("kind = ?", (kind,))
+        with self._lock:
+            db = self._db
+            db.execute("BEGIN")
+            try:
+                db.execute(f"DELETE FROM documents WHERE {where}", args)
+                if rows:
+                    db.executemany(f"INSERT INTO documents VALUES ({', '.join('?' * len(rows[0]))})", rows)
+                db.execute("INSERT OR REPLACE INTO search_meta VALUES (?, ?)", (kind, time.time()))
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def built(self) -> Optional[float]:
+        """When the oldest kind was last (re)built, or None if the index is empty"""
+        with self._lock:
+            row = self._db.execute("SELECT MIN(built), COUNT(*) FROM search_meta "
+                                   "WHERE kind IN ('operation', 'table')").fetchone()
+        return row[0] if row and row[1] == 2 else None
+
+    def search(self, query: str, limit: int = 10, operation: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Documents matching every query term (any term if none match all), best first"""
+        terms = re.findall(r'\w+', fold(query))
+        if not terms:
+            return []
+        for conjunction in (' AND ', ' OR '):
+            rows = self._match(terms, conjunction, limit, operation)
+            if rows or len(terms) == 1:
+                break
+        return [{"type": kind, "ref": ref, "code": code or None, "name": name, "operation": op or None,
+                 "operation_id": op_id or None, "score": round(score, 4)}
+                for kind, ref, code, name, op, op_id, score in rows]
+
+    def _match(self, terms: List[str], conjunction: str, limit: int, operation: Optional[str]) -> List[tuple]:
+        scope, args = "", []
+        if operation:
+            scope = "AND (upper(operation) = upper(?) OR operation_id = ?)"
+            args = [str(operation), str(operation)]
+        weight = "CASE kind " + ' '.join(f"WHEN '{k}' THEN {w}" for k, w in KIND_WEIGHTS.items()) + " ELSE 1 END"
+        if self.fts:
+            # Code matches weigh more than name matches; every term also matches as a prefix
+            sql = (f"SELECT kind, ref, code, name, operation, operation_id, "
+                   f"-bm25(documents, 0, 0, 5.0, 1.0, 0, 0) * ({weight}) AS score "
+                   f"FROM documents WHERE documents MATCH ? {scope} ORDER BY score DESC LIMIT ?")
+            args = [conjunction.join(f'"{t}"*' for t in terms)] + args
+        else:
+            hits = ' + '.join("(folded LIKE ?)" for _ in terms)
+            sql = (f"SELECT kind, ref, code, name, operation, operation_id, hits * ({weight}) AS score FROM "
+                   f"(SELECT *, {hits} AS hits FROM documents) WHERE hits >= ? {scope} "
+                   f"ORDER BY score DESC, length(name) LIMIT ?")
+            args = [f"%{t}%" for t in terms] + [len(terms) if conjunction == ' AND ' else 1] + args
+        with self._lock:
+            return self._db.execute(sql, args + [limit]).fetchall()
+
+    def stats(self) -> Dict[str, Any]:
+        """Document counts per kind and when each kind was built"""
+        with self._lock:
+            counts = dict(self._db.execute("SELECT kind, COUNT(*) FROM documents GROUP BY kind").fetchall())
+            built = dict(self._db.execute("SELECT kind, built FROM search_meta").fetchall())
+        return {kind: {'documents': counts.get(kind, 0),
+                       'built': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(ts))}
+                for kind, ts in built.items()}
@@ -1,12 +1,22 @@
 import asyncio
-from .common import mcp
+from .common import mcp, sessions, async_clients, loop_lag
 
 async def main():
     # Import tools and resources
     from . import tools
+    from .resources import ensure_search_index
     
-    # Run the mcp server
-    await mcp.run_stdio_async()
+    # Build or refresh the Search_Data index while the server starts answering
+    ensure_search_index()
+    
+    # Run the mcp server, sampling event-loop lag for Get_Upstream_Metrics
+    loop_lag.start()
+    try:
+        await mcp.run_stdio_async()
+    finally:
+        loop_lag.stop()
+        await async_clients.aclose()
+        sessions.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
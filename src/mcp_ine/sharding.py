@@ -0,0 +1,50 @@
+"""Date sharding - Split long DATOS_* date ranges into concurrent requests"""
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+# Months covered by one period, per INE periodicity id (PERIODICIDADES)
+PERIOD_MONTHS = {1: 1, 2: 2, 3: 3, 4: 4, 6: 6, 12: 12}
+
+
+def _parse(value: str) -> Optional[date]:
+    try:
+        return date(int(value[:4]), int(value[4:6]), int(value[6:8])) if len(value) == 8 else None
+    except ValueError:
+        return None
+
+
+def _add_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def date_shards(date_range: str, periodicity: Optional[int], periods: int = 60,
+                today: Optional[date] = None) -> List[str]:
+    """Split 'YYYYMMDD:YYYYMMDD' (or an open 'YYYYMMDD:') into consecutive ranges of
+    about `periods` periods each; a range that fits in one shard is returned unchanged"""
+    start_text, sep, end_text = date_range.partition(':')
+    start, end = _parse(start_text), _parse(end_text) if end_text else (today or date.today())
+    if not sep or start is None or end is None or end < start:
+        return [date_range]
+    months = max(periods, 1) * PERIOD_MONTHS.get(periodicity, 1)
+    shards, lo = [], start
+    while lo <= end:
+        hi = min(_add_months(date(lo.year, lo.month, 1), months) - timedelta(days=1), end)
+        shards.append(f"{lo:%Y%m%d}:{hi:%Y%m%d}")
+        lo = hi + timedelta(days=1)
+    return shards if len(shards) > 1 else [date_range]
+
+
+def merge_shards(responses: List[Any]) -> List[Dict[str, Any]]:
+    """Merge per-shard series lists in shard order; points are deduplicated by Fecha"""
+    merged: Dict[str, Dict[str, Any]] = {}
+    for response in responses:
+        for series in response if isinstance(response, list) else [response]:
+            if not isinstance(series, dict) or 'COD' not in series:
+                continue
+            target = merged.setdefault(series['COD'], {**series, 'Data': []})
+            target['Data'].extend(series.get('Data') or [])
+    for series in merged.values():
+        points = {p.get('Fecha'): p for p in series['Data']}
+        series['Data'] = sorted(points.values(), key=lambda p: p.get('Fecha') or 0)
+    return list(merged.values())
@@ -0,0 +1,108 @@
+"""Series store - Local copy of DATOS_SERIE / DATOS_TABLA histories for incremental refresh"""
+import json, logging, os, sqlite3, threading, time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode
+
+logger = logging.getLogger('mcp_ine')
+
+
+def fecha_date(fecha: int) -> str:
+    """YYYYMMDD of an INE Fecha (ms at Madrid midnight; +12h lands on the right UTC day)"""
+    return datetime.fromtimestamp(fecha / 1000 + 43200, timezone.utc).strftime('%Y%m%d')
+
+
+class SeriesStore:
+    """Datapoints already downloaded, keyed by request (function, input and
+    parameters other than nult/date)
+
+    Each dataset remembers how many periods it holds, whether that is the
+    whole history (an nult request came back short) and the Fecha a refresh
+    should restart from: the last `revision` periods, so values INE revises
+    after publication are re-downloaded and overwritten.
+    """
+
+    def __init__(self, path: Optional[str] = None, revision: int = 3):
+        self.revision = max(revision, 1)
+        self._lock = threading.Lock()
+        self._db = self._open(path or ':memory:')
+
+    def _open(self, path: str) -> sqlite3.Connection:
+        try:
+            if path != ':memory:':
+                os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        except sqlite3.Error as e:
+            logger.warning(f"Series store kept in memory ({path}): {e}")
+            db = sqlite3.connect(':memory:', check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript("""
+            CREATE TABLE IF NOT EXISTS datasets (key TEXT PRIMARY KEY, full INTEGER NOT NULL, periods INTEGER NOT NULL,
+                                                 since INTEGER, synced REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS series (key TEXT NOT NULL, cod TEXT NOT NULL, position INTEGER NOT NULL,
+                                               header TEXT NOT NULL, data TEXT NOT NULL, PRIMARY KEY (key, cod));
+        """)
+        return db
+
+    @staticmethod
+    def key(function: str, input_param: str, params: Optional[Dict] = None) -> str:
+        rest = sorted((k, str(v)) for k, v in (params or {}).items() if k not in ('nult', 'date') and v is not None)
+        return f"{function}/{input_param}?{urlencode(rest)}"
+
+    def since(self, key: str, nult: Optional[int]) -> Optional[str]:
+        """`date` start (YYYYMMDD) for an incremental refresh, or None when a full fetch is needed"""
+        with self._lock:
+            row = self._db.execute("SELECT full, periods, since FROM datasets WHERE key = ?", (key,)).fetchone()
+        if row is None or row[2] is None:
+            return None
+        full, periods, since = row
+        if not full and periods < (nult or 0):
+            return None
+        return fecha_date(since)
+
+    def merge(self, key: str, series: List[Dict[str, Any]], full: bool = False) -> None:
+        """Merge downloaded series into the dataset; points with the same Fecha are replaced"""
+        with self._lock:
+            db = self._db
+            stored = {cod: (position, json.loads(data)) for cod, position, data in
+                      db.execute("SELECT cod, position, data FROM series WHERE key = ?", (key,))}
+            rows = []
+            for s in series:
+                if not isinstance(s, dict) or not s.get('COD'):
+                    continue
+                position, data = stored.get(s['COD'], (len(stored), []))
+                points = {p.get('Fecha'): p for p in data}
+                points.update((p.get('Fecha'), p) for p in s.get('Data') or [])
+                merged = sorted(points.values(), key=lambda p: p.get('Fecha') or 0)
+                header = {k: v for k, v in s.items() if k != 'Data'}
+                stored[s['COD']] = (position, merged)
+                rows.append((key, s['COD'], position, json.dumps(header, ensure_ascii=False),
+                             json.dumps(merged, ensure_ascii=False)))
+            fechas = sorted({p['Fecha'] for _, data in stored.values() for p in data
+                             if isinstance(p.get('Fecha'), int)})
+            periods = max((len(data) for _, data in stored.values()), default=0)
+            since = fechas[-min(self.revision, len(fechas))] if fechas else None
+            db.execute("BEGIN")
+            db.executemany("INSERT OR REPLACE INTO series VALUES (?, ?, ?, ?, ?)", rows)
+            db.execute("INSERT INTO datasets VALUES (?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                       "full = max(full, excluded.full), periods = excluded.periods, since = excluded.since, "
+                       "synced = excluded.synced", (key, int(full), periods, since, time.time()))
+            db.execute("COMMIT")
+
+    def read(self, key: str, nult: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Stored series in download order, each with its last `nult` points"""
+        with self._lock:
+            rows = self._db.execute("SELECT header, data FROM series WHERE key = ? ORDER BY position",
+                                    (key,)).fetchall()
+        result = []
+        for header, data in rows:
+            points = json.loads(data)
+            result.append({**json.loads(header), 'Data': points[-nult:] if nult else points})
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Stored datasets and series"""
+        with self._lock:
+            datasets, series = self._db.execute(
+                "SELECT (SELECT COUNT(*) FROM datasets), (SELECT COUNT(*) FROM series)").fetchone()
+        return {'datasets': datasets, 'series': series, 'revision_periods': self.revision}
@@ -0,0 +1,105 @@
+"""Streaming decode - Yield the elements of a JSON array body while it downloads"""
+import codecs, json
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, List, Optional
+
+_WHITESPACE = ' \t\n\r'
+
+
+class ItemParser:
+    """Incremental parser for a top-level JSON array (or a single JSON value)
+
+    feed() takes raw bytes and returns the elements completed so far; only
+    the text of the element being received is buffered, and an incomplete
+    element is re-decoded only after the buffer has doubled. A body that is not
+    an array is returned whole by close(), as a one-element list.
+    """
+
+    def __init__(self, object_pairs_hook: Optional[Callable] = None):
+        self._decoder = json.JSONDecoder(object_pairs_hook=object_pairs_hook)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._chunks: List[str] = []  # unconsumed text, joined only when decoding
+        self._size = 0
+        self._retry = 0  # buffered characters needed before another decode attempt
+        self._state = 'start'  # start -> items -> done, or start -> value
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        text = self._utf8.decode(chunk)
+        if text:
+            self._chunks.append(text)
+            self._size += len(text)
+        if self._state == 'value' or self._size < self._retry:
+            return []
+        return self._drain(final=False)
+
+    def close(self) -> List[Any]:
+        text = self._utf8.decode(b'', final=True)
+        if text:
+            self._chunks.append(text)
+        items = self._drain(final=True)
+        buf, self._chunks, self._size = ''.join(self._chunks), [], 0
+        if self._state == 'value':
+            items.append(self._decoder.decode(buf))
+        elif self._state == 'items':
+            raise json.JSONDecodeError("Unterminated array", buf, len(buf))
+        return items
+
+    def _drain(self, final: bool) -> List[Any]:
+        items, buf, pos = [], ''.join(self._chunks), 0
+        self._retry = 0
+        if self._state == 'start':
+            pos = self._skip(buf, pos)
+            if pos == len(buf):
+                return items
+            self._state = 'items' if buf[pos] == '[' else 'value'
+            pos += buf[pos] == '['
+        while self._state == 'items':
+            pos = self._skip(buf, pos)
+            if pos == len(buf):
+                break
+            if buf[pos] == ']':
+                self._state, pos = 'done', pos + 1
+                break
+            try:
+                item, end = self._decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                # Element still incomplete: retry once the buffer has doubled, so a huge
+                # element costs a few partial decodes rather than one per chunk
+                self._retry = 2 * (len(buf) - pos)
+                break
+            # A bare number could continue in the next chunk; accept it once a delimiter follows
+            after = self._skip(buf, end)
+            if after == len(buf) or buf[after] not in ',]':
+                if not final:
+                    break
+                raise json.JSONDecodeError("Expecting ',' delimiter", buf, after)
+            items.append(item)
+            pos = after + (buf[after] == ',')
+        rest = buf[pos:] if self._state != 'value' else buf
+        self._chunks, self._size = [rest] if rest else [], len(rest)
+        return items
+
+    @staticmethod
+    def _skip(buf: str, pos: int) -> int:
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        return pos
+
+
+def iter_json_items(chunks: Iterable[bytes], object_pairs_hook: Optional[Callable] = None) -> Iterator[Any]:
+    """Yield array elements from a byte stream as soon as each one is complete"""
+    parser = ItemParser(object_pairs_hook)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+async def aiter_json_items(chunks: AsyncIterator[bytes], object_pairs_hook: Optional[Callable] = None) -> AsyncIterator[Any]:
+    """Async version of iter_json_items"""
+    parser = ItemParser(object_pairs_hook)
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+    for item in parser.close():
+        yield item
@@ -1,15 +1,50 @@
 """INE MCP Tools - Wrappers for INE resources exposed as MCP tools"""
-from typing import Optional, List, Dict, Any
-from .common import mcp
+from typing import Optional, List, Dict, Any, AsyncIterator
+from mcp.server.fastmcp import Context
+from contextlib import aclosing
+from .common import (tool, response_cache, inflight, series_catalog, search_index, series_store, result_cursors,
+                     rate_limiter, circuit_breakers, upstream_metrics, tracer, recorder, loop_lag,
+                     INE_BATCH_CONCURRENCY)
 from . import resources as r
+from .concurrency import collect, gather_bounded
+from .projection import project
+
+async def _chunked(result: Any, fields: Optional[List[str]] = None) -> Any:
+    """Project a result, then return its first chunk (with a cursor when more remain)"""
+    if fields:
+        with tracer.span('project', fields=','.join(fields)):
+            result = project(result, fields)
+    return await result_cursors.chunk(result)
+
+async def _limited(items: AsyncIterator[Dict[str, Any]], limit: int, fields: Optional[List[str]],
+                   note: str) -> AsyncIterator[Dict[str, Any]]:
+    """First `limit` items of a stream, projected as they arrive, then `note` if more remain"""
+    async with aclosing(items) as stream:
+        count = 0
+        async for item in stream:
+            if count == limit:
+                yield {"_info": note}
+                return
+            yield project(item, fields)
+            count += 1
+
+async def _resume(cursor: str, series: bool = False) -> Any:
+    """Next chunk of an oversized result; `series` tools (series data, Censo) return a dict rather than a list"""
+    result = await result_cursors.resume(cursor)
+    if result is None or isinstance(result, dict) != series:
+        error = {"error": "Unknown or expired cursor; repeat the call without it to start over"}
+        return error if series else [error]
+    return result
 
 # =============================================================================
 # Operations
 # =============================================================================
 
-@mcp.tool()
-def List_Operations(filter_text: Optional[str] = None, detail_level: Optional[int] = None,
-                   geo_filter: Optional[int] = None, page: Optional[int] = None) -> List[Dict[str, Any]]:
+@tool()
+async def List_Operations(filter_text: Optional[str] = None, detail_level: Optional[int] = None,
+                         geo_filter: Optional[int] = None, page: Optional[int] = None,
+                         all_pages: bool = False, fields: Optional[List[str]] = None,
+                         cursor: Optional[str] = None) -> List[Dict[str, Any]]:
     """List available INE statistical operations
     
     Args:
@@ -17,14 +52,22 @@ def List_Operations(filter_text: Optional[str] = None, detail_level: Optional[in
         detail_level: Detail level 0, 1, or 2 for more information
         geo_filter: 1=with geographic breakdown, 0=national only
         page: Page number for pagination (500 results per page)
+        all_pages: If True, fetch every page concurrently and merge them (ignores page)
+        fields: Optional fields to keep (e.g., ['Id', 'Nombre', 'Codigo'])
+        cursor: Cursor returned with a previous chunk, to continue from it (other arguments are ignored)
     
     Returns:
         List of operations with Id, Codigo, Nombre, and Url
     """
-    return r.list_operations(filter_text, detail_level, geo_filter, page)
+    if cursor:
+        return await _resume(cursor)
+    if all_pages:
+        return await _chunked(await collect(r.iter_operations_async(filter_text, detail_level, geo_filter,
+                                                                    fields=fields)))
+    return await _chunked(await r.list_operations_async(filter_text, detail_level, geo_filter, page, fields))
 
-@mcp.tool()
-def Get_Operation_Info(operation_code: str, detail_level: Optional[int] = None) -> Dict[str, Any]:
+@tool()
+async def Get_Operation_Info(operation_code: str, detail_level: Optional[int] = None) -> Dict[str, Any]:
     """Get detailed information about a specific operation
     
     Args:
@@ -34,11 +77,13 @@ def Get_Operation_Info(operation_code: str, detail_level: Optional[int] = None)
     Returns:
         Operation details with Id, Codigo, Nombre, Url, FK_Periodicidad, etc.
     """
-    return r.get_operation(operation_code, detail_level)
+    return await r.get_operation_async(operation_code, detail_level)
 
-@mcp.tool()
-def Get_Operation_Tables(operation_code: str, detail_level: Optional[int] = None,
-                        geo_filter: Optional[int] = None, friendly_output: bool = False) -> List[Dict[str, Any]]:
+@tool()
+async def Get_Operation_Tables(operation_code: str, detail_level: Optional[int] = None,
+                              geo_filter: Optional[int] = None, friendly_output: bool = False,
+                              fields: Optional[List[str]] = None,
+                              cursor: Optional[str] = None) -> List[Dict[str, Any]]:
     """Get available tables for a statistical operation
     
     Args:
@@ -46,46 +91,66 @@ def Get_Operation_Tables(operation_code: str, detail_level: Optional[int] = None
         detail_level: Detail level 0, 1, or 2 for more information
         geo_filter: 1=with geographic breakdown, 0=national only
         friendly_output: If True, returns user-friendly output
+        fields: Optional fields to keep (e.g., ['Id', 'Nombre', 'FK_Periodicidad'])
+        cursor: Cursor returned with a previous chunk, to continue from it (other arguments are ignored)
     
     Returns:
         List of tables with Id, Nombre, Codigo, FK_Periodicidad, etc.
     """
-    return r.get_operation_tables(operation_code, detail_level, geo_filter, friendly_output)
+    if cursor:
+        return await _resume(cursor)
+    return await _chunked(await r.get_operation_tables_async(operation_code, detail_level, geo_filter, friendly_output,
+                                                             fields))
 
-@mcp.tool()
-def Get_Operation_Variables(operation_code: str, page: Optional[int] = None) -> List[Dict[str, Any]]:
+@tool()
+async def Get_Operation_Variables(operation_code: str, page: Optional[int] = None,
+                                  all_pages: bool = False, fields: Optional[List[str]] = None,
+                                  cursor: Optional[str] = None) -> List[Dict[str, Any]]:
     """Get all variables used in a given operation
     
     Args:
         operation_code: Operation code (e.g., 'IPC', 'EPA')
         page: Page number for pagination
+        all_pages: If True, fetch every page concurrently and merge them (ignores page)
+        fields: Optional fields to keep (e.g., ['Id', 'Nombre', 'Codigo'])
+        cursor: Cursor returned with a previous chunk, to continue from it (other arguments are ignored)
     
     Returns:
         List of variables with Id, Nombre, and Codigo
     """
-    return r.get_operation_variables(operation_code, page)
+    if cursor:
+        return await _resume(cursor)
+    if all_pages:
+        return await _chunked(await collect(r.iter_operation_variables_async(operation_code, fields=fields)))
+    return await _chunked(await r.get_operation_variables_async(operation_code, page, fields))
 
-@mcp.tool()
-def Get_Variable_Values_Operation(variable_id: int, operation_code: str,
-                                  detail_level: Optional[int] = None) -> List[Dict[str, Any]]:
+@tool()
+async def Get_Variable_Values_Operation(variable_id: int, operation_code: str,
+                                        detail_level: Optional[int] = None, fields: Optional[List[str]] = None,
+                                        cursor: Optional[str] = None) -> List[Dict[str, Any]]:
     """Get values for a variable within a specific operation
     
     Args:
         variable_id: Variable ID (e.g., 762 for ECOICOP groups)
         operation_code: Operation code (e.g., 'IPC')
         detail_level: Detail level 0, 1, or 2
+        fields: Optional fields to keep (e.g., ['Id', 'Nombre', 'Codigo'])
+        cursor: Cursor returned with a previous chunk, to continue from it (other arguments are ignored)
     
     Returns:
         List of values with Id, FK_Variable, Nombre, and Codigo
     """
-    return r.get_variable_values_operation(variable_id, operation_code, detail_level)
+    if cursor:
+        return await _resume(cursor)
+    return await _chunked(await r.get_variable_values_operation_async(variable_id, operation_code, detail_level,
+                                                                      fields))
 
 # =============================================================================
 # Tables
 # =============================================================================
 
-@mcp.tool()
-def Get_Table_Groups(table_id: int) -> List[Dict[str, Any]]:
+@tool()
+async def Get_Table_Groups(table_id: int) -> List[Dict[str, Any]]:
     """Get selection groups (combos) that define a table structure
     
     Args:
@@ -94,11 +159,11 @@ def Get_Table_Groups(table_id: int) -> List[Dict[str, Any]]:
     Returns:
         List of groups with Id and Nombre
     """
-    return r.get_table_groups(table_id)
+    return await r.get_table_groups_async(table_id)
 
-@mcp.tool()
-def Get_Group_Values(table_id: int, group_id: int, 
-                    detail_level: Optional[int] = None) -> List[Dict[str, Any]]:
+@tool()
+async def Get_Group_Values(table_id: int, group_id: int, 
+                          detail_level: Optional[int] = None) -> List[Dict[str, Any]]:
     """Get values belonging to a specific group in a table
     
     Args:
@@ -109,12 +174,14 @@ def Get_Group_Values(table_id: int, group_id: int,
     Returns:
         List of values with Id, FK_Variable, Nombre, and Codigo
     """
-    return r.get_group_values(table_id, group_id, detail_level)
+    return await r.get_group_values_async(table_id, group_id, detail_level)
 
-@mcp.tool()
-def Get_Table_Series(table_id: int, detail_level: Optional[int] = None,
-                    friendly_output: bool = False, include_metadata: bool = False,
-                    variable_filter: Optional[str] = None) -> List[Dict[str, Any]]:
+@tool()
+async def Get_Table_Series(table_id: int, detail_level: Optional[int] = None,
+                          friendly_output: bool = False, include_metadata: bool = False,
+                          variable_filter: Optional[str] = None,
+                          fields: Optional[List[str]] = None,
+                          cursor: Optional[str] = None) -> List[Dict[str, Any]]:
     """Get all series codes from a table (without data)
     
     Args:
@@ -123,17 +190,24 @@ def Get_Table_Series(table_id: int, detail_level: Optional[int] = None,
         friendly_output: If True, returns user-friendly output
         include_metadata: If True, includes metadata
         variable_filter: Filter by variable:value format (e.g., '115:29')
+        fields: Optional fields to keep (e.g., ['COD', 'Nombre', 'FK_Periodicidad'])
+        cursor: Cursor returned with a previous chunk, to continue from it (other arguments are ignored)
     
     Returns:
         List of series with COD, Nombre, FK_Operacion, etc.
     """
-    return r.get_table_series(table_id, detail_level, friendly_output, include_metadata, variable_filter)
+    if cursor:
+        return await _resume(cursor)
+    return await _chunked(await r.get_table_series_async(table_id, detail_level, friendly_output, include_metadata,
+                                                         variable_filter, fields))
 
-@mcp.tool()
-def Get_Table_Data(table_id: int, last_periods: Optional[int] = None,
-                  date_range: Optional[str] = None, detail_level: Optional[int] = None,
-                  friendly_output: bool = False, include_metadata: bool = False,
-                  variable_filter: Optional[str] = None) -> List[Dict[str, Any]]:
+@tool()
+async def Get_Table_Data(table_id: int, last_periods: Optional[int] = None,
+                        date_range: Optional[str] = None, detail_level: Optional[int] = None,
+                        friendly_output: bool = False, include_metadata: bool = False,
+                        variable_filter: Optional[str] = None, columnar: bool = False,
+                        fields: Optional[List[str]] = None,
+                        cursor: Optional[str] = None) -> List[Dict[str, Any]]:
     """Get data from a specific table
     
     Args:
@@ -144,20 +218,34 @@ def Get_Table_Data(table_id: int, last_periods: Optional[int] = None,
         friendly_output: If True, returns user-friendly output
         include_metadata: If True, includes metadata
         variable_filter: Filter by variable:value (e.g., '115:29')
+        columnar: If True, each series carries Fecha, Valor and Secreto columns instead of a Data array
+                  (ignored with friendly_output)
+        fields: Optional fields to keep, dotted for nested (e.g., ['COD', 'Nombre', 'Data.Fecha', 'Data.Valor'])
+        cursor: Cursor returned with a previous chunk, to continue from it (other arguments are ignored)
     
     Returns:
-        List of series with COD, Nombre, and Data array
+        List of series with COD, Nombre, and Data array (or columns)
     """
-    return r.get_table_data(table_id, last_periods, date_range, detail_level, 
-                           friendly_output, include_metadata, variable_filter)
+    if cursor:
+        return await _resume(cursor)
+    if columnar and not friendly_output:
+        result = await r.get_table_columns_async(table_id, last_periods, date_range, detail_level, variable_filter,
+                                                 include_metadata)
+        return await _chunked(result if isinstance(result, list) else result.to_json(), fields)
+    if fields:
+        return await _chunked(await r.get_table_data_fields_async(table_id, fields, last_periods, date_range,
+                                                                  detail_level, friendly_output, include_metadata,
+                                                                  variable_filter))
+    return await _chunked(await r.get_table_data_async(table_id, last_periods, date_range, detail_level,
+                                                       friendly_output, include_metadata, variable_filter))
 
 # =============================================================================
 # Series
 # =============================================================================
 
-@mcp.tool()
-def Get_Series_Info(series_code: str, detail_level: Optional[int] = None,
-                   friendly_output: bool = False, include_metadata: bool = False) -> Dict[str, Any]:
+@tool()
+async def Get_Series_Info(series_code: str, detail_level: Optional[int] = None,
+                         friendly_output: bool = False, include_metadata: bool = False) -> Dict[str, Any]:
     """Get series metadata without data
     
     Args:
@@ -169,10 +257,10 @@ def Get_Series_Info(series_code: str, detail_level: Optional[int] = None,
     Returns:
         Series info with COD, Nombre, FK_Periodicidad, etc.
     """
-    return r.get_series_info(series_code, detail_level, friendly_output, include_metadata)
+    return await r.get_series_info_async(series_code, detail_level, friendly_output, include_metadata)
 
-@mcp.tool()
-def Get_Series_Values(series_code: str, detail_level: Optional[int] = None) -> List[Dict[str, Any]]:
+@tool()
+async def Get_Series_Values(series_code: str, detail_level: Optional[int] = None) -> List[Dict[str, Any]]:
     """Get variables and values that define a series
     
     Args:
@@ -182,12 +270,14 @@ def Get_Series_Values(series_code: str, detail_level: Optional[int] = None) -> L
     Returns:
         List of values defining the series
     """
-    return r.get_series_values(series_code, detail_level)
+    return await r.get_series_values_async(series_code, detail_level)
 
-@mcp.tool()
-def Get_Series_Data(series_code: str, last_periods: Optional[int] = None,
-                   date_range: Optional[str] = None, detail_level: Optional[int] = None,
-                   friendly_output: bool = False, include_metadata: bool = False) -> Dict[str, Any]:
+@tool()
+async def Get_Series_Data(series_code: str, last_periods: Optional[int] = None,
+                         date_range: Optional[str] = None, detail_level: Optional[int] = None,
+                         friendly_output: bool = False, include_metadata: bool = False,
+                         columnar: bool = False, fields: Optional[List[str]] = None,
+                         cursor: Optional[str] = None) -> Dict[str, Any]:
     """Get data from a specific time series
     
     Args:
@@ -197,68 +287,194 @@ def Get_Series_Data(series_code: str, last_periods: Optional[int] = None,
         detail_level: Detail level 0, 1, or 2
         friendly_output: If True, returns user-friendly output
         include_metadata: If True, includes metadata
+        columnar: If True, returns Fecha, Valor and Secreto columns instead of a Data array
+                  (ignored with friendly_output)
+        fields: Optional fields to keep, dotted for nested (e.g., ['COD', 'Data.Fecha', 'Data.Valor'])
+        cursor: Cursor returned with a previous chunk, to continue from it (other arguments are ignored)
     
     Returns:
-        Series with COD, Nombre, and Data array
+        Series with COD, Nombre, and Data array (or columns)
     """
-    return r.get_series_data(series_code, last_periods, date_range, detail_level,
-                            friendly_output, include_metadata)
+    if cursor:
+        return await _resume(cursor, series=True)
+    if columnar and not friendly_output:
+        result = await r.get_series_columns_async(series_code, last_periods, date_range, detail_level,
+                                                  include_metadata)
+        return await _chunked(result if isinstance(result, dict) else result.to_json(), fields)
+    return await _chunked(await r.get_series_data_async(series_code, last_periods, date_range, detail_level,
+                                                       friendly_output, include_metadata), fields)
 
-@mcp.tool()
-def Get_Operation_Series(operation_code: str, detail_level: Optional[int] = None,
-                        friendly_output: bool = False, include_metadata: bool = False,
-                        page: Optional[int] = None, name_filter: Optional[str] = None,
-                        periodicity_filter: Optional[int] = None,
-                        max_results: int = 100) -> List[Dict[str, Any]]:
+@tool()
+async def Get_Multiple_Series_Data(series_codes: List[str], last_periods: Optional[int] = None,
+                                   date_range: Optional[str] = None, detail_level: Optional[int] = None,
+                                   max_concurrency: Optional[int] = None,
+                                   fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Get data from several time series in one call, fetched concurrently
+    
+    Args:
+        series_codes: Series codes (e.g., ['IPC251856', 'IPC251852'])
+        last_periods: Last N periods to retrieve for every series
+        date_range: Date range 'YYYYMMDD:YYYYMMDD' for every series
+        detail_level: Detail level 0, 1, or 2
+        max_concurrency: Series fetched at once (default INE_BATCH_CONCURRENCY)
+        fields: Optional fields to keep, dotted for nested (e.g., ['COD', 'Data.Fecha', 'Data.Valor'])
+    
+    Returns:
+        {"results": {code: series with Data}, "errors": {code: message}}
+    """
+    batch = await r.get_series_data_batch_async(series_codes, last_periods, date_range, detail_level,
+                                                max_concurrency)
+    if fields and "results" in batch:
+        batch["results"] = {code: project(series, fields) for code, series in batch["results"].items()}
+    return batch
+
+@tool()
+async def Get_Operation_Series(operation_code: str, detail_level: Optional[int] = None,
+                              friendly_output: bool = False, include_metadata: bool = False,
+                              page: Optional[int] = None, name_filter: Optional[str] = None,
+                              periodicity_filter: Optional[int] = None,
+                              max_results: int = 100, all_pages: bool = False,
+                              fields: Optional[List[str]] = None,
+                              cursor: Optional[str] = None) -> List[Dict[str, Any]]:
     """Get series of an operation with optional filtering
     
     WARNING: Operations like IPC have 220,000+ series across 23 pages.
     Always use filters or pagination to avoid timeouts.
     
+    Operations indexed with Index_Operation_Series are answered from the
+    local catalogue (unless page, detail_level or friendly_output is given).
+    Otherwise, without `page`, filters are applied to each page as it arrives
+    and no further pages are fetched once max_results matches have been collected.
+    Results larger than one chunk come with a cursor; continuing from it
+    resumes the same page scan rather than starting over.
+    
     Args:
         operation_code: Operation code (e.g., 'IPC')
         detail_level: Detail level 0, 1, or 2
         friendly_output: If True, returns user-friendly output
         include_metadata: If True, includes metadata
-        page: Page number (up to 10000 results per API page)
+        page: Page number (up to 10000 results per API page); restricts the search to that page
         name_filter: Filter series by name (case-insensitive, e.g., 'Madrid', 'anual')
         periodicity_filter: Filter by periodicity ID (1=monthly, 3=quarterly, 12=annual)
-        max_results: Maximum results to return (default 100, max 1000)
+        max_results: Maximum results to return (default 100); large results arrive in chunks with a cursor
+        all_pages: If True, keep reading pages until max_results series are collected (ignores page)
+        fields: Optional fields to keep (e.g., ['COD', 'Nombre', 'FK_Periodicidad'])
+        cursor: Cursor returned with a previous chunk, to continue from it (other arguments are ignored)
     
     Returns:
         List of series belonging to the operation (filtered and limited)
     """
-    result = r.get_operation_series(operation_code, detail_level, friendly_output, 
-                                    include_metadata, page)
+    if cursor:
+        return await _resume(cursor)
+    limit = max_results
+    more = (f"Showing the first {limit} matching series; more are available. "
+            "Raise max_results or narrow the filters for more.")
+    if page is None and detail_level is None and not friendly_output:
+        # Operations indexed with Index_Operation_Series are answered locally
+        result = await r.search_operation_series_async(operation_code, name_filter, periodicity_filter,
+                                                       limit=limit + 1, metadata=include_metadata)
+        if result is not None:
+            if len(result) > limit:
+                result = result[:limit] + [{"_info": more}]
+            return await _chunked(result, fields)
+    if all_pages or (page is None and (name_filter or periodicity_filter)):
+        # Read lazily: each chunk scans only the pages it needs and its cursor resumes the same scan
+        series = r.iter_operation_series_async(operation_code, detail_level, friendly_output, include_metadata,
+                                               name_filter=name_filter, periodicity=periodicity_filter,
+                                               fields=fields)
+        return await result_cursors.chunk(_limited(series, limit, None, more))
+    
+    nf = name_filter.lower() if name_filter else None
+    matches = lambda s: ((not nf or nf in s.get('Nombre', '').lower())
+                         and (not periodicity_filter or s.get('FK_Periodicidad') == periodicity_filter))
+    if fields:
+        # Filtered and projected while the page decodes
+        result = await r.get_operation_series_async(operation_code, detail_level, friendly_output, include_metadata,
+                                                    page, fields, matches)
+    else:
+        result = await r.get_operation_series_async(operation_code, detail_level, friendly_output, 
+                                                    include_metadata, page)
     
     # Apply filters if provided
-    if isinstance(result, list) and (name_filter or periodicity_filter):
-        filtered = result
-        if name_filter:
-            nf = name_filter.lower()
-            filtered = [s for s in filtered if nf in s.get('Nombre', '').lower()]
-        if periodicity_filter:
-            filtered = [s for s in filtered if s.get('FK_Periodicidad') == periodicity_filter]
-        result = filtered
+    if isinstance(result, list) and not fields and (name_filter or periodicity_filter):
+        with tracer.span('filter', name_filter=name_filter, periodicity_filter=periodicity_filter,
+                         items_in=len(result)):
+            result = [s for s in result if matches(s)]
+            tracer.annotate(items_out=len(result))
     
     # Apply limit
-    limit = min(max_results, 1000)
     if isinstance(result, list) and len(result) > limit:
         total = len(result)
-        return result[:limit] + [{"_info": f"Showing {limit} of {total} results. Use filters or pagination for more."}]
+        result = result[:limit] + [{"_info": f"Showing {limit} of {total} results. "
+                                             "Raise max_results or use filters for more."}]
     
-    return result
+    return await _chunked(result)
+
+@tool()
+async def Index_Operation_Series(operation_code: str) -> Dict[str, Any]:
+    """Build or refresh the local catalogue of every series in an operation
+    
+    Downloads all SERIES_OPERACION pages once (with variable/value metadata);
+    later refreshes only re-index pages that changed. Indexed operations are
+    searched locally by Search_Operation_Series and Get_Operation_Series.
+    
+    Args:
+        operation_code: Operation code (e.g., 'IPC')
+    
+    Returns:
+        Number of series and pages indexed, pages that changed, and elapsed seconds
+    """
+    return await r.index_operation_series_async(operation_code)
+
+@tool()
+async def Search_Operation_Series(operation_code: str, name_filter: Optional[str] = None,
+                                  periodicity_filter: Optional[int] = None, values: Optional[List[str]] = None,
+                                  include_metadata: bool = False, max_results: int = 100,
+                                  fields: Optional[List[str]] = None,
+                                  cursor: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Find series of an operation in the local catalogue (no upstream calls once indexed)
+    
+    The operation is indexed on first use, which for large operations (IPC has
+    220,000+ series) takes a while; after that queries take milliseconds.
+    
+    Args:
+        operation_code: Operation code (e.g., 'IPC')
+        name_filter: Accent-insensitive substring of the series name (e.g., 'Madrid')
+        periodicity_filter: Periodicity ID (1=monthly, 3=quarterly, 12=annual)
+        values: Variable values every series must have, by name or code (e.g., ['Madrid', 'Tipo de dato=Índice'])
+        include_metadata: If True, includes each series' variable/value pairs
+        max_results: Maximum results to return (default 100); large results arrive in chunks with a cursor
+        fields: Optional fields to keep, dotted for nested (e.g., ['COD', 'Nombre', 'MetaData.Nombre'])
+        cursor: Cursor returned with a previous chunk, to continue from it (other arguments are ignored)
+    
+    Returns:
+        List of matching series
+    """
+    if cursor:
+        return await _resume(cursor)
+    limit = max_results
+    result = await r.search_operation_series_async(operation_code, name_filter, periodicity_filter, values,
+                                                   limit, include_metadata)
+    if result is None:
+        indexed = await r.index_operation_series_async(operation_code)
+        if "error" in indexed:
+            return [indexed]
+        result = await r.search_operation_series_async(operation_code, name_filter, periodicity_filter, values,
+                                                       limit, include_metadata)
+    return await _chunked(result, fields)
 
 # =============================================================================
 # Filtered queries
 # =============================================================================
 
-@mcp.tool()
-def Get_Operation_Data_Filtered(operation_code: str, periodicity: Optional[int] = None,
-                               last_periods: Optional[int] = None, detail_level: Optional[int] = None,
-                               friendly_output: bool = False, include_metadata: bool = False,
-                               filter_g1: Optional[str] = None, filter_g2: Optional[str] = None,
-                               filter_g3: Optional[str] = None, filter_g4: Optional[str] = None) -> List[Dict[str, Any]]:
+@tool()
+async def Get_Operation_Data_Filtered(operation_code: str, periodicity: Optional[int] = None,
+                                     last_periods: Optional[int] = None, detail_level: Optional[int] = None,
+                                     friendly_output: bool = False, include_metadata: bool = False,
+                                     filter_g1: Optional[str] = None, filter_g2: Optional[str] = None,
+                                     filter_g3: Optional[str] = None, filter_g4: Optional[str] = None,
+                                     fields: Optional[List[str]] = None,
+                                     cursor: Optional[str] = None) -> List[Dict[str, Any]]:
     """Get operation data with advanced metadata filters
     
     Args:
@@ -272,6 +488,8 @@ def Get_Operation_Data_Filtered(operation_code: str, periodicity: Optional[int]
         filter_g2: Second filter 'variable_id:value_id'
         filter_g3: Third filter 'variable_id:value_id' (e.g., '762:' for all ECOICOP)
         filter_g4: Fourth filter 'variable_id:value_id'
+        fields: Optional fields to keep, dotted for nested (e.g., ['COD', 'Nombre', 'Data.Fecha', 'Data.Valor'])
+        cursor: Cursor returned with a previous chunk, to continue from it (other arguments are ignored)
     
     Returns:
         Filtered series data from the operation
@@ -280,16 +498,20 @@ def Get_Operation_Data_Filtered(operation_code: str, periodicity: Optional[int]
         Get_Operation_Data_Filtered('IPC', periodicity=1, filter_g1='115:29', 
                                     filter_g2='3:84', filter_g3='762:')
     """
-    return r.get_operation_data_filtered(operation_code, periodicity, last_periods, detail_level,
-                                         friendly_output, include_metadata, filter_g1, filter_g2,
-                                         filter_g3, filter_g4)
+    if cursor:
+        return await _resume(cursor)
+    return await _chunked(await r.get_operation_data_filtered_async(operation_code, periodicity, last_periods,
+                                                                    detail_level, friendly_output, include_metadata,
+                                                                    filter_g1, filter_g2, filter_g3, filter_g4), fields)
 
-@mcp.tool()
-def Get_Series_Metadata_Operation(operation_code: str, periodicity: Optional[int] = None,
-                                  detail_level: Optional[int] = None, friendly_output: bool = False,
-                                  include_metadata: bool = False, filter_g1: Optional[str] = None,
-                                  filter_g2: Optional[str] = None, filter_g3: Optional[str] = None,
-                                  filter_g4: Optional[str] = None) -> List[Dict[str, Any]]:
+@tool()
+async def Get_Series_Metadata_Operation(operation_code: str, periodicity: Optional[int] = None,
+                                        detail_level: Optional[int] = None, friendly_output: bool = False,
+                                        include_metadata: bool = False, filter_g1: Optional[str] = None,
+                                        filter_g2: Optional[str] = None, filter_g3: Optional[str] = None,
+                                        filter_g4: Optional[str] = None,
+                                        fields: Optional[List[str]] = None,
+                                        cursor: Optional[str] = None) -> List[Dict[str, Any]]:
     """Get series definitions filtered by metadata (without data)
     
     Args:
@@ -302,76 +524,100 @@ def Get_Series_Metadata_Operation(operation_code: str, periodicity: Optional[int
         filter_g2: Second filter
         filter_g3: Third filter
         filter_g4: Fourth filter
+        fields: Optional fields to keep, dotted for nested (e.g., ['COD', 'Nombre', 'MetaData.Nombre'])
+        cursor: Cursor returned with a previous chunk, to continue from it (other arguments are ignored)
     
     Returns:
         Series definitions matching the criteria
     """
-    return r.get_series_metadata_operation(operation_code, periodicity, detail_level, 
-                                           friendly_output, include_metadata, filter_g1,
-                                           filter_g2, filter_g3, filter_g4)
+    if cursor:
+        return await _resume(cursor)
+    return await _chunked(await r.get_series_metadata_operation_async(operation_code, periodicity, detail_level,
+                                                                      friendly_output, include_metadata, filter_g1,
+                                                                      filter_g2, filter_g3, filter_g4), fields)
 
 # =============================================================================
 # Variables
 # =============================================================================
 
-@mcp.tool()
-def Get_All_Variables(page: Optional[int] = None) -> List[Dict[str, Any]]:
+@tool()
+async def Get_All_Variables(page: Optional[int] = None, all_pages: bool = False,
+                            fields: Optional[List[str]] = None,
+                            cursor: Optional[str] = None) -> List[Dict[str, Any]]:
     """Get all available variables in the system
     
     Args:
         page: Page number for pagination (500 per page)
+        all_pages: If True, fetch every page concurrently and merge them (ignores page)
+        fields: Optional fields to keep (e.g., ['Id', 'Nombre', 'Codigo'])
+        cursor: Cursor returned with a previous chunk, to continue from it (other arguments are ignored)
     
     Returns:
         List of variables with Id, Nombre, and Codigo
     """
-    return r.get_all_variables(page)
+    if cursor:
+        return await _resume(cursor)
+    if all_pages:
+        return await _chunked(await collect(r.iter_all_variables_async(fields=fields)))
+    return await _chunked(await r.get_all_variables_async(page, fields))
 
-@mcp.tool()
-def Get_Variable_Values(variable_id: int, detail_level: Optional[int] = None,
-                       classification: Optional[str] = None) -> List[Dict[str, Any]]:
+@tool()
+async def Get_Variable_Values(variable_id: int, detail_level: Optional[int] = None,
+                             classification: Optional[str] = None,
+                             fields: Optional[List[str]] = None,
+                             cursor: Optional[str] = None) -> List[Dict[str, Any]]:
     """Get all possible values for a variable
     
     Args:
         variable_id: Variable ID (e.g., 115 for Provinces)
         detail_level: Detail level 0, 1, or 2
         classification: Classification code for filtering
+        fields: Optional fields to keep (e.g., ['Id', 'Nombre', 'Codigo'])
+        cursor: Cursor returned with a previous chunk, to continue from it (other arguments are ignored)
     
     Returns:
         List of values with Id, FK_Variable, Nombre, and Codigo
     """
-    return r.get_variable_values(variable_id, detail_level, classification)
+    if cursor:
+        return await _resume(cursor)
+    return await _chunked(await r.get_variable_values_async(variable_id, detail_level, classification, fields))
 
-@mcp.tool()
-def Get_Child_Values(variable_id: int, value_id: int, 
-                    detail_level: Optional[int] = None) -> List[Dict[str, Any]]:
+@tool()
+async def Get_Child_Values(variable_id: int, value_id: int, 
+                          detail_level: Optional[int] = None, fields: Optional[List[str]] = None,
+                          cursor: Optional[str] = None) -> List[Dict[str, Any]]:
     """Get child values within a hierarchical structure
     
     Args:
         variable_id: Variable ID (e.g., 70 for autonomous communities)
         value_id: Parent value ID (e.g., 8997 for Andalusia)
         detail_level: Detail level 0, 1, or 2
+        fields: Optional fields to keep (e.g., ['Id', 'Nombre', 'Codigo'])
+        cursor: Cursor returned with a previous chunk, to continue from it (other arguments are ignored)
     
     Returns:
         List of child values
     """
-    return r.get_child_values(variable_id, value_id, detail_level)
+    if cursor:
+        return await _resume(cursor)
+    return await _chunked(await r.get_child_values_async(variable_id, value_id, detail_level, fields))
 
 # =============================================================================
 # Reference data
 # =============================================================================
 
-@mcp.tool()
-def Get_Periodicities() -> List[Dict[str, Any]]:
+@tool()
+async def Get_Periodicities() -> List[Dict[str, Any]]:
     """Get all available periodicities (monthly, quarterly, annual, etc.)
     
     Returns:
         List of periodicities with Id, Nombre, and Codigo
     """
-    return r.get_periodicities()
+    return await r.get_periodicities_async()
 
-@mcp.tool()
-def Get_Publications(detail_level: Optional[int] = None, 
-                    friendly_output: bool = False) -> List[Dict[str, Any]]:
+@tool()
+async def Get_Publications(detail_level: Optional[int] = None, 
+                          friendly_output: bool = False) -> List[Dict[str, Any]]:
     """Get all available publications
     
     Args:
@@ -381,96 +627,176 @@ def Get_Publications(detail_level: Optional[int] = None,
     Returns:
         List of publications
     """
-    return r.get_publications(detail_level, friendly_output)
+    return await r.get_publications_async(detail_level, friendly_output)
 
-@mcp.tool()
-def Get_Classifications() -> List[Dict[str, Any]]:
+@tool()
+async def Get_Classifications() -> List[Dict[str, Any]]:
     """Get all available classifications in the system
     
     Returns:
         List of classifications with Id, Nombre, and date
     """
-    return r.get_classifications()
+    return await r.get_classifications_async()
 
 # =============================================================================
 # Search and convenience functions
 # =============================================================================
 
-@mcp.tool()
-def Search_Data(query: str, operation_filter: Optional[str] = None, 
-               max_results: int = 10) -> List[Dict[str, Any]]:
-    """Search for data across operations and tables
+@tool()
+async def Search_Data(query: str, operation_filter: Optional[str] = None, 
+                     max_results: int = 10) -> List[Dict[str, Any]]:
+    """Search for data across operations, tables and series, ranked by relevance
+    
+    Uses a local accent-insensitive full-text index of every operation and
+    table (plus the series of operations indexed with Index_Operation_Series),
+    built on first use and refreshed in the background.
     
     Args:
-        query: Search term (e.g., 'inflación', 'paro', 'población')
-        operation_filter: Optional operation code to filter (e.g., 'IPC')
+        query: Search terms (e.g., 'inflación', 'paro', 'población')
+        operation_filter: Optional operation code or id to restrict results to (e.g., 'IPC')
         max_results: Maximum number of results to return
     
     Returns:
-        List of matching operations and tables
+        List of matching operations, tables and series, best match first
     """
     results = []
-    query_lower = query.lower()
-    
-    # Search in operations
-    operations = r.list_operations()
-    for op in operations[:max_results]:
-        if query_lower in op.get('Nombre', '').lower() or query_lower in op.get('Codigo', '').lower():
-            results.append({"type": "operation", "code": op.get('Codigo'), 
-                           "name": op.get('Nombre'), "id": op.get('Id')})
-    
-    # Search in tables if operation specified
-    if operation_filter and len(results) < max_results:
-        tables = r.get_operation_tables(operation_filter)
-        for table in tables:
-            if len(results) >= max_results:
-                break
-            if query_lower in table.get('Nombre', '').lower():
-                results.append({"type": "table", "id": table.get('Id'),
-                               "name": table.get('Nombre'), "operation": operation_filter})
-    
-    return results[:max_results]
-
-@mcp.tool()
-def Get_Latest_Data(operation_code: str, table_filter: Optional[str] = None) -> List[Dict[str, Any]]:
+    for hit in await r.search_async(query, max_results, operation_filter):
+        if hit["type"] == "operation":
+            results.append({"type": "operation", "code": hit["code"], "name": hit["name"],
+                            "id": int(hit["ref"]) if hit["ref"].isdigit() else hit["ref"], "score": hit["score"]})
+        elif hit["type"] == "table":
+            results.append({"type": "table", "id": int(hit["ref"]) if hit["ref"].isdigit() else hit["ref"],
+                            "name": hit["name"], "operation": hit["operation"], "score": hit["score"]})
+        else:
+            results.append({"type": "series", "code": hit["code"], "name": hit["name"],
+                            "operation": hit["operation"], "score": hit["score"]})
+    return results
+
+async def _report_progress(ctx: Optional[Context], done: int, total: int) -> None:
+    """Best-effort progress notification; there is no request context when called directly"""
+    if ctx is None:
+        return
+    try:
+        await ctx.report_progress(done, total)
+    except ValueError:
+        pass
+
+def _latest_points(table: Dict[str, Any], data: List[Dict[str, Any]], operation_code: str) -> List[Dict[str, Any]]:
+    """Most recent point of every series in a table's nult=1 data"""
+    results = []
+    for series in data:
+        if series.get('Data'):
+            point = series['Data'][-1] if isinstance(series['Data'], list) else series['Data']
+            results.append({
+                "operation": operation_code, "table_id": table.get('Id'),
+                "table_name": table.get('Nombre'), "series_code": series.get('COD'),
+                "series_name": series.get('Nombre'),
+                "value": point.get('Valor') if isinstance(point, dict) else point,
+                "date": point.get('Fecha') if isinstance(point, dict) else None
+            })
+    return results
+
+@tool()
+async def Get_Latest_Data(operation_code: str, table_filter: Optional[str] = None, all_tables: bool = False,
+                          max_series: int = 500, ctx: Context = None) -> List[Dict[str, Any]]:
     """Get the most recent data from an operation
     
     Args:
         operation_code: Operation code (e.g., 'IPC', 'EPA')
         table_filter: Optional table name filter
+        all_tables: If True, fetch the latest period of every matching table concurrently
+                    (otherwise the first matching table, first 10 series)
+        max_series: With all_tables, maximum series returned in total (default 500)
     
     Returns:
         Latest data with table info and most recent values
     """
-    tables = r.get_operation_tables(operation_code)
+    tables = await r.get_operation_tables_async(operation_code)
     if not tables or (isinstance(tables[0], dict) and "error" in tables[0]):
         return tables
     
     # Filter tables
     if table_filter:
-        fl = table_filter.lower()
-        tables = [t for t in tables if fl in t.get('Nombre', '').lower() or str(t.get('Id')) == table_filter]
+        with tracer.span('filter', table_filter=table_filter, items_in=len(tables)):
+            fl = table_filter.lower()
+            tables = [t for t in tables if fl in t.get('Nombre', '').lower() or str(t.get('Id')) == table_filter]
+            tracer.annotate(items_out=len(tables))
     
     if not tables:
         return [{"error": f"No tables match filter '{table_filter}'"}]
     
-    # Get latest data
-    table = tables[0]
-    data = r.get_table_data(table.get('Id'), nult=1)
+    if not all_tables:
+        # Get latest data
+        table = tables[0]
+        data = await r.get_table_data_async(table.get('Id'), nult=1)
+        return _latest_points(table, data[:10], operation_code)
+    
+    # Fan out nult=1 over every table, reporting progress as each one completes
+    done = 0
+    
+    async def fetch(table):
+        nonlocal done
+        data = await r.get_table_data_async(table.get('Id'), nult=1)
+        done += 1
+        await _report_progress(ctx, done, len(tables))
+        return data
+    
+    results, shown, total = [], 0, 0
+    for table, data in zip(tables, await gather_bounded(fetch, tables, INE_BATCH_CONCURRENCY)):
+        if data and isinstance(data[0], dict) and "error" in data[0]:
+            results.append({"table_id": table.get('Id'), "table_name": table.get('Nombre'),
+                            "error": data[0]["error"]})
+            continue
+        points = _latest_points(table, data, operation_code)
+        total += len(points)
+        kept = points[:max(max_series - shown, 0)]
+        shown += len(kept)
+        results.extend(kept)
+    if total > max_series:
+        results.append({"_info": f"Showing {max_series} of {total} series from {len(tables)} tables. "
+                                 "Use table_filter or raise max_series for more."})
+    return results
+
+# =============================================================================
+# Diagnostics
+# =============================================================================
+
+@tool()
+def Get_Cache_Stats() -> Dict[str, Any]:
+    """Get response cache statistics
     
-    results = []
-    for series in data[:10]:
-        if series.get('Data'):
-            point = series['Data'][-1] if isinstance(series['Data'], list) else series['Data']
-            results.append({
-                "operation": operation_code, "table_id": table.get('Id'),
-                "table_name": table.get('Nombre'), "series_code": series.get('COD'),
-                "series_name": series.get('Nombre'),
-                "value": point.get('Valor') if isinstance(point, dict) else point,
-                "date": point.get('Fecha') if isinstance(point, dict) else None
-            })
+    Returns:
+        Memory/disk hit counts, misses, stores, hit ratio, entries per tier,
+        upstream requests executed vs coalesced into an identical in-flight one,
+        the contents of the local series catalogue, search index and series store,
+        open result cursors, upstream rate limiting (retries, 429s, current rate per host),
+        circuit breaker state per host, exported trace/span counts and the record/replay archive
+    """
+    return {**response_cache.stats(), "inflight": dict(inflight.counters), "catalog": series_catalog.stats(),
+            "search_index": search_index.stats(), "series_store": series_store.stats(),
+            "cursors": result_cursors.stats(), "rate_limiter": rate_limiter.stats(),
+            "circuit_breakers": circuit_breakers.stats(), "tracing": tracer.stats(), "recording": recorder.stats()}
+
+@tool()
+def Get_Upstream_Metrics(format: str = "json") -> Dict[str, Any]:
+    """Get per-endpoint metrics of the upstream INE APIs
     
-    return results
+    Endpoints are Tempus functions (DATOS_TABLA, OPERACIONES_DISPONIBLES, ...)
+    and Censo 2021 tables (per.ppal, hog, ...).
+    
+    Args:
+        format: "json" (default) or "prometheus" for the Prometheus text exposition format
+    
+    Returns:
+        Per endpoint: requests, errors, response bytes, cache hits/misses and hit ratio,
+        stale entries served, and latency and JSON decode time (count, mean, p50/p95/p99 bucket bounds).
+        Under "event_loop", the server's event-loop lag (summary, max and bucket counts).
+        With format="prometheus", {"content_type": ..., "text": ...}
+    """
+    if format == "prometheus":
+        return {"content_type": "text/plain; version=0.0.4",
+                "text": upstream_metrics.prometheus() + loop_lag.prometheus()}
+    return {**upstream_metrics.snapshot(), "event_loop": loop_lag.snapshot()}
 
 # =============================================================================
 # Censo 2021 (SDC21) Tools
@@ -478,7 +804,7 @@ def Get_Latest_Data(operation_code: str, table_filter: Optional[str] = None) ->
 
 from . import censo2021 as c21
 
-@mcp.tool()
+@tool()
 def Censo_List_Tables() -> Dict[str, Any]:
     """List available tables in Spain's 2021 Census (Censo 2021)
     
@@ -496,7 +822,7 @@ def Censo_List_Tables() -> Dict[str, Any]:
     """
     return c21.get_censo_tables()
 
-@mcp.tool()
+@tool()
 def Censo_List_Variables(tabla: Optional[str] = None) -> Dict[str, Any]:
     """List available variables for Censo 2021 queries
     
@@ -514,12 +840,13 @@ def Censo_List_Variables(tabla: Optional[str] = None) -> Dict[str, Any]:
     """
     return c21.get_censo_variables(tabla)
 
-@mcp.tool()
-def Censo_Get_Data(
+@tool()
+async def Censo_Get_Data(
     tabla: str,
     variables: str,
     metrica: Optional[str] = None,
-    idioma: str = "ES"
+    idioma: str = "ES",
+    cursor: Optional[str] = None
 ) -> Dict[str, Any]:
     """Get census data from Censo 2021 with flexible grouping
     
@@ -535,6 +862,7 @@ def Censo_Get_Data(
                  - SVIVIENDAS: Count of dwellings
                  - SNUCLEOS: Count of family nuclei
         idioma: Language ES or EN (default: ES)
+        cursor: Cursor returned with a previous chunk, to continue from it (other arguments are ignored)
     
     Returns:
         Census data with metadata and data arrays
@@ -543,14 +871,17 @@ def Censo_Get_Data(
         Censo_Get_Data("per.ppal", "ID_RESIDENCIA_N1,ID_SEXO")
         → Population by Autonomous Community and Sex
     """
+    if cursor:
+        return await _resume(cursor, series=True)
     # Parse comma-separated variables into list
     var_list = [v.strip() for v in variables.split(",") if v.strip()]
-    return c21.get_censo_data(tabla, var_list, metrica, idioma)
+    return await _chunked(await c21.get_censo_data_async(tabla, var_list, metrica, idioma))
 
-@mcp.tool()
-def Censo_Population_By_Location(
+@tool()
+async def Censo_Population_By_Location(
     level: str = "N1",
-    idioma: str = "ES"
+    idioma: str = "ES",
+    cursor: Optional[str] = None
 ) -> Dict[str, Any]:
     """Get population by geographic level from Censo 2021
     
@@ -562,16 +893,20 @@ def Censo_Population_By_Location(
                - N2: Provincia (Province)
                - N3: Municipio (Municipality)
         idioma: Language ES or EN (default: ES)
+        cursor: Cursor returned with a previous chunk, to continue from it (other arguments are ignored)
     
     Returns:
         Population counts by location
     """
-    return c21.get_population_by_location(level, idioma)
+    if cursor:
+        return await _resume(cursor, series=True)
+    return await _chunked(await c21.get_population_by_location_async(level, idioma))
 
-@mcp.tool()
-def Censo_Population_Pyramid(
+@tool()
+async def Censo_Population_Pyramid(
     location_level: str = "N1",
-    idioma: str = "ES"
+    idioma: str = "ES",
+    cursor: Optional[str] = None
 ) -> Dict[str, Any]:
     """Get population pyramid data (by age groups and sex)
     
@@ -581,16 +916,20 @@ def Censo_Population_Pyramid(
     Args:
         location_level: Geographic level for aggregation (N1=CCAA, N2=Province, N3=Municipality)
         idioma: Language ES or EN (default: ES)
+        cursor: Cursor returned with a previous chunk, to continue from it (other arguments are ignored)
     
     Returns:
         Population by age group and sex
     """
-    return c21.get_population_pyramid(location_level, None, idioma)
+    if cursor:
+        return await _resume(cursor, series=True)
+    return await _chunked(await c21.get_population_pyramid_async(location_level, None, idioma))
 
-@mcp.tool()
-def Censo_Housing_By_Tenure(
+@tool()
+async def Censo_Housing_By_Tenure(
     location_level: str = "N1",
-    idioma: str = "ES"
+    idioma: str = "ES",
+    cursor: Optional[str] = None
 ) -> Dict[str, Any]:
     """Get housing data by tenure status (owned, rented, etc.)
     
@@ -602,16 +941,20 @@ def Censo_Housing_By_Tenure(
     Args:
         location_level: Geographic level (N1=CCAA, N2=Province, N3=Municipality)
         idioma: Language ES or EN (default: ES)
+        cursor: Cursor returned with a previous chunk, to continue from it (other arguments are ignored)
     
     Returns:
         Housing counts by tenure status and location
     """
-    return c21.get_housing_by_tenure(location_level, idioma)
+    if cursor:
+        return await _resume(cursor, series=True)
+    return await _chunked(await c21.get_housing_by_tenure_async(location_level, idioma))
 
-@mcp.tool()
-def Censo_Households_By_Size(
+@tool()
+async def Censo_Households_By_Size(
     location_level: str = "N1",
-    idioma: str = "ES"
+    idioma: str = "ES",
+    cursor: Optional[str] = None
 ) -> Dict[str, Any]:
     """Get households by size (number of members)
     
@@ -620,16 +963,20 @@ def Censo_Households_By_Size(
     Args:
         location_level: Geographic level (N1=CCAA, N2=Province, N3=Municipality)
         idioma: Language ES or EN (default: ES)
+        cursor: Cursor returned with a previous chunk, to continue from it (other arguments are ignored)
     
     Returns:
         Household counts by size and location
     """
-    return c21.get_households_by_size(location_level, idioma)
+    if cursor:
+        return await _resume(cursor, series=True)
+    return await _chunked(await c21.get_households_by_size_async(location_level, idioma))
 
-@mcp.tool()
-def Censo_Education_Level(
+@tool()
+async def Censo_Education_Level(
     location_level: str = "N1",
-    idioma: str = "ES"
+    idioma: str = "ES",
+    cursor: Optional[str] = None
 ) -> Dict[str, Any]:
     """Get population by education level
     
@@ -638,17 +985,21 @@ def Censo_Education_Level(
     Args:
         location_level: Geographic level (N1=CCAA, N2=Province, N3=Municipality)
         idioma: Language ES or EN (default: ES)
+        cursor: Cursor returned with a previous chunk, to continue from it (other arguments are ignored)
     
     Returns:
         Population by education level and location
     """
-    return c21.get_education_level(location_level, idioma)
+    if cursor:
+        return await _resume(cursor, series=True)
+    return await _chunked(await c21.get_education_level_async(location_level, idioma))
 
-@mcp.tool()
-def Censo_Nationality(
+@tool()
+async def Censo_Nationality(
     level: int = 1,
     location_level: str = "N1",
-    idioma: str = "ES"
+    idioma: str = "ES",
+    cursor: Optional[str] = None
 ) -> Dict[str, Any]:
     """Get population by nationality
     
@@ -661,17 +1012,21 @@ def Censo_Nationality(
                - 3: Country (País)
         location_level: Geographic level (N1=CCAA, N2=Province, N3=Municipality)
         idioma: Language ES or EN (default: ES)
+        cursor: Cursor returned with a previous chunk, to continue from it (other arguments are ignored)
     
     Returns:
         Population by nationality and location
     """
-    return c21.get_nationality_data(level, location_level, idioma)
+    if cursor:
+        return await _resume(cursor, series=True)
+    return await _chunked(await c21.get_nationality_data_async(level, location_level, idioma))
 
-@mcp.tool()
-def Censo_Family_Nuclei(
+@tool()
+async def Censo_Family_Nuclei(
     include_type: bool = True,
     location_level: str = "N1",
-    idioma: str = "ES"
+    idioma: str = "ES",
+    cursor: Optional[str] = None
 ) -> Dict[str, Any]:
     """Get family nuclei data
     
@@ -688,8 +1043,11 @@ def Censo_Family_Nuclei(
         include_type: Include nucleus type grouping (default: True)
         location_level: Geographic level (N1=CCAA, N2=Province, N3=Municipality)
         idioma: Language ES or EN (default: ES)
+        cursor: Cursor returned with a previous chunk, to continue from it (other arguments are ignored)
     
     Returns:
         Family nuclei counts by type and location
     """
-    return c21.get_family_nuclei(include_type, location_level, idioma)
+    if cursor:
+        return await _resume(cursor, series=True)
+    return await _chunked(await c21.get_family_nuclei_async(include_type, location_level, idioma))
@@ -0,0 +1,213 @@
+"""Tracing - Spans from each tool call down to every upstream request, exported as OTLP JSON"""
+import atexit, json, logging, os, queue, secrets, threading, time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Dict, Iterator, List, Optional
+
+import requests
+
+logger = logging.getLogger('mcp_ine')
+
+# OTLP span kinds and status codes
+KIND_INTERNAL, KIND_SERVER, KIND_CLIENT = 1, 2, 3
+STATUS_OK, STATUS_ERROR = 1, 2
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    kind: int = KIND_INTERNAL
+    start: int = field(default_factory=time.time_ns)
+    end: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: int = STATUS_OK
+    message: str = ''
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update((k, v) for k, v in attributes.items() if v is not None)
+
+    def fail(self, message: str) -> None:
+        self.status, self.message = STATUS_ERROR, message
+
+    def otlp(self) -> Dict[str, Any]:
+        span = {'traceId': self.trace_id, 'spanId': self.span_id, 'name': self.name, 'kind': self.kind,
+                'startTimeUnixNano': str(self.start), 'endTimeUnixNano': str(self.end),
+                'attributes': [{'key': k, 'value': _value(v)} for k, v in self.attributes.items()],
+                'status': {'code': self.status, **({'message': self.message} if self.message else {})}}
+        if self.parent_id:
+            span['parentSpanId'] = self.parent_id
+        return span
+
+
+def _value(value: Any) -> Dict[str, Any]:
+    """OTLP AnyValue"""
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def _request(spans: List[Span], service: str) -> Dict[str, Any]:
+    """OTLP ExportTraceServiceRequest holding spans"""
+    return {'resourceSpans': [{
+        'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': service}}]},
+        'scopeSpans': [{'scope': {'name': 'mcp_ine'}, 'spans': [span.otlp() for span in spans]}]}]}
+
+
+class FileExporter:
+    """Append finished traces to a file, one OTLP JSON request per line (the collector file exporter format)"""
+
+    def __init__(self, path: str, service: str = 'mcp-ine'):
+        self.path, self.service = os.path.expanduser(path), service
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        line = json.dumps(_request(spans, self.service), ensure_ascii=False)
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+    def close(self) -> None:
+        pass
+
+
+class OtlpExporter:
+    """POST finished traces to an OTLP/HTTP collector (JSON encoding) from a background thread"""
+
+    def __init__(self, endpoint: str, service: str = 'mcp-ine', batch: int = 512, timeout: float = 5):
+        endpoint = endpoint.rstrip('/')
+        self.url = endpoint if endpoint.endswith('/v1/traces') else endpoint + '/v1/traces'
+        self.service, self.batch, self.timeout = service, batch, timeout
+        self._queue: 'queue.Queue[Optional[List[Span]]]' = queue.Queue(maxsize=1024)
+        self._thread = threading.Thread(target=self._run, name='mcp-ine-otlp', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)  # flush what is queued
+
+    def export(self, spans: List[Span]) -> None:
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            logger.warning(f"Dropping {len(spans)} spans: OTLP export queue is full")
+
+    def _run(self) -> None:
+        session = requests.Session()
+        while True:
+            spans = self._queue.get()
+            if spans is None:
+                return
+            while len(spans) < self.batch:
+                try:
+                    more = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if more is None:
+                    self._queue.put(None)
+                    break
+                spans = spans + more
+            try:
+                session.post(self.url, json=_request(spans, self.service), timeout=self.timeout).raise_for_status()
+            except Exception as e:
+                logger.warning(f"OTLP export to {self.url} failed: {e}")
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join(self.timeout)
+
+
+class Tracer:
+    """Spans nested through a context variable, so they follow asyncio tasks
+
+    A span opened with no current span starts a trace; its children are
+    buffered and the whole trace is exported when it ends. Without an
+    exporter, span() is a no-op.
+    """
+
+    def __init__(self, exporter: Any = None):
+        self.exporter = exporter
+        self._current: ContextVar[Optional[Span]] = ContextVar('mcp_ine_span', default=None)
+        self._traces: Dict[str, List[Span]] = {}
+        self._lock = threading.Lock()
+        self.counters = {'traces': 0, 'spans': 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def current(self) -> Optional[Span]:
+        return self._current.get()
+
+    def annotate(self, **attributes: Any) -> None:
+        """Set attributes on the current span, if tracing"""
+        span = self._current.get()
+        if span is not None:
+            span.set(**attributes)
+
+    def start(self, name: str, kind: int = KIND_INTERNAL, **attributes: Any) -> Optional[Span]:
+        """Open a child of the current span (or a root) without making it current"""
+        if self.exporter is None:
+            return None
+        parent = self._current.get()
+        span = Span(name, parent.trace_id if parent else secrets.token_hex(16), secrets.token_hex(8),
+                    parent.span_id if parent else None, kind)
+        span.set(**attributes)
+        if parent is None:
+            with self._lock:
+                self._traces[span.trace_id] = []
+        return span
+
+    def finish(self, span: Optional[Span], error: Optional[BaseException] = None) -> None:
+        if span is None:
+            return
+        span.end = time.time_ns()
+        if error is not None:
+            span.fail(f"{type(error).__name__}: {error}")
+        with self._lock:
+            self.counters['spans'] += 1
+            trace = self._traces.get(span.trace_id)
+            if trace is None:  # trace already exported (a child outliving its root)
+                trace = []
+            trace.append(span)
+            if span.parent_id is not None and span.trace_id in self._traces:
+                return
+            self._traces.pop(span.trace_id, None)
+            self.counters['traces'] += span.parent_id is None
+        try:
+            self.exporter.export(trace)
+        except Exception as e:
+            logger.warning(f"Span export failed: {e}")
+
+    def span(self, name: str, kind: int = KIND_INTERNAL, **attributes: Any):
+        """Context manager running its body inside a new current span (yields the Span, or None when disabled)"""
+        if self.exporter is None:
+            return nullcontext()
+        return self._span(name, kind, attributes)
+
+    @contextmanager
+    def _span(self, name: str, kind: int, attributes: Dict[str, Any]) -> Iterator[Span]:
+        span = self.start(name, kind, **attributes)
+        token = self._current.set(span)
+        error = None
+        try:
+            yield span
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._current.reset(token)
+            self.finish(span, error)
+
+    async def detached(self, coro: Awaitable[Any], name: str) -> Any:
+        """Run background work as its own trace instead of under the span that scheduled it"""
+        self._current.set(None)  # a task runs in its own copy of the context
+        with self.span(name):
+            return await coro
+
+    def stats(self) -> Dict[str, Any]:
+        return {'enabled': self.enabled, 'exporter': type(self.exporter).__name__ if self.exporter else None,
+                'open_traces': len(self._traces), **self.counters}
@@ -0,0 +1,72 @@
+"""HTTP transport - Shared keep-alive connection pools per upstream host"""
+import asyncio, threading, weakref
+from typing import Dict
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HostSessions:
+    """One pooled requests.Session per upstream host, shared by the whole server"""
+
+    def __init__(self, pool_connections: int = 4, pool_maxsize: int = 16):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def _create(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_connections,
+                              pool_maxsize=self.pool_maxsize)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def get(self, url: str) -> requests.Session:
+        """Get (or lazily create) the session for the host of url"""
+        host = urlsplit(url).netloc
+        session = self._sessions.get(host)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(host)
+                if session is None:
+                    session = self._sessions[host] = self._create()
+        return session
+
+    def close(self) -> None:
+        """Close all pooled connections"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+class AsyncHostClients:
+    """One pooled httpx.AsyncClient per upstream host and event loop
+
+    httpx connection pools are bound to the loop that opened them, so clients
+    are kept per running loop and dropped together with it.
+    """
+
+    def __init__(self, max_connections: int = 16, max_keepalive_connections: int = 16):
+        self.limits = httpx.Limits(max_connections=max_connections,
+                                   max_keepalive_connections=max_keepalive_connections)
+        self._clients = weakref.WeakKeyDictionary()  # loop -> {host: client}
+
+    def get(self, url: str) -> httpx.AsyncClient:
+        """Get (or lazily create) the client for the host of url on the running loop"""
+        clients = self._clients.setdefault(asyncio.get_running_loop(), {})
+        host = urlsplit(url).netloc
+        client = clients.get(host)
+        if client is None:
+            client = clients[host] = httpx.AsyncClient(limits=self.limits)
+        return client
+
+    async def aclose(self) -> None:
+        """Close the clients opened on the running loop"""
+        clients = self._clients.pop(asyncio.get_running_loop(), {})
+        for client in clients.values():
+            await client.aclose()
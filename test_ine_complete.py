@@ -4,25 +4,33 @@ Script de pruebas exhaustivas para MCP INE
 Valida 100% de la funcionalidad con 100 pruebas
 """
 
+import os
 import sys
 import json
+import asyncio
 import time
 from datetime import datetime
 from typing import Dict, List, Any, Tuple
 import traceback
 
 # Importar las funciones del módulo
-sys.path.insert(0, '/workspaces/codespaces-blank/mcp-ine/src')
-from mcp_ine.tools import (
-    List_Operations,
-    Get_Operation_Tables,
-    Get_Table_Data,
-    Get_Series_Data,
-    Get_Table_Variables,
-    Get_Variable_Values,
-    Search_Data,
-    Get_Latest_Data
-)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from mcp_ine import tools
+
+# Las herramientas son corrutinas: se ejecutan en un único bucle de eventos
+_loop = asyncio.new_event_loop()
+
+def _sync(tool):
+    return lambda *args, **kwargs: _loop.run_until_complete(tool(*args, **kwargs))
+
+List_Operations = _sync(tools.List_Operations)
+Get_Operation_Tables = _sync(tools.Get_Operation_Tables)
+Get_Table_Data = _sync(tools.Get_Table_Data)
+Get_Series_Data = _sync(tools.Get_Series_Data)
+Get_Table_Groups = _sync(tools.Get_Table_Groups)
+Get_Variable_Values = _sync(tools.Get_Variable_Values)
+Search_Data = _sync(tools.Search_Data)
+Get_Latest_Data = _sync(tools.Get_Latest_Data)
 
 # Colores para la salida
 class Colors:
@@ -134,7 +142,7 @@ class TestSuite:
             "failed_tests": [{"test": t, "name": n, "error": e} for t, n, e in self.failed_tests]
         }
         
-        with open('/workspaces/codespaces-blank/mcp-ine/test_results.json', 'w') as f:
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_results.json'), 'w') as f:
             json.dump(report, f, indent=2, ensure_ascii=False)
         
         print(f"\n{Colors.CYAN}Reporte guardado en: test_results.json{Colors.END}")
@@ -472,14 +480,14 @@ def run_all_tests():
     )
     
     suite.test(
-        "Filtro por tipo de periodo 'M' (mensual)",
-        lambda: Get_Table_Data(50902, period_type='M'),
+        "Salida amigable (friendly_output)",
+        lambda: Get_Table_Data(50902, friendly_output=True),
         expected_type=list
     )
     
     suite.test(
-        "Filtro por tipo de periodo 'A' (anual)",
-        lambda: Get_Table_Data(50902, period_type='A'),
+        "Incluir metadatos (include_metadata)",
+        lambda: Get_Table_Data(50902, include_metadata=True),
         expected_type=list
     )
     
@@ -549,8 +557,8 @@ def run_all_tests():
     )
     
     suite.test(
-        "Combinación: últimos periodos + tipo",
-        lambda: Get_Table_Data(50902, last_periods=6, period_type='M'),
+        "Combinación: últimos periodos + salida amigable",
+        lambda: Get_Table_Data(50902, last_periods=6, friendly_output=True),
         expected_type=list
     )
     
@@ -646,14 +654,14 @@ def run_all_tests():
     )
     
     suite.test(
-        "Serie tipo periodo mensual",
-        lambda: Get_Series_Data("IPC251856", period_type='M'),
+        "Serie con salida amigable",
+        lambda: Get_Series_Data("IPC251856", friendly_output=True),
         expected_type=dict
     )
     
     suite.test(
-        "Serie tipo periodo anual",
-        lambda: Get_Series_Data("IPC251856", period_type='A'),
+        "Serie con metadatos",
+        lambda: Get_Series_Data("IPC251856", include_metadata=True),
         expected_type=dict
     )
     
@@ -695,70 +703,70 @@ def run_all_tests():
     )
     
     # ============================================================================
-    # SECCIÓN 5: Get_Table_Variables y Get_Variable_Values (10 pruebas)
+    # SECCIÓN 5: Get_Table_Groups y Get_Variable_Values (10 pruebas)
     # ============================================================================
     suite.print_section("SECCIÓN 5: Variables y Valores (10 pruebas)")
     
     # Test 81-85: Variables
     variables = suite.test(
         "Obtener variables de tabla 50902",
-        lambda: Get_Table_Variables(50902),
+        lambda: Get_Table_Groups(50902),
         expected_type=list,
         validate_func=lambda x: len(x) > 0
     )
     
     suite.test(
         "Variables tienen Id y Nombre",
-        lambda: Get_Table_Variables(50902),
+        lambda: Get_Table_Groups(50902),
         validate_func=lambda x: all('Id' in v and 'Nombre' in v for v in x)
     )
     
     suite.test(
         "Obtener variables de tabla IPV",
-        lambda: Get_Table_Variables(25171),
+        lambda: Get_Table_Groups(25171),
         expected_type=list
     )
     
     suite.test(
         "IDs de variables son únicos",
-        lambda: Get_Table_Variables(50902),
+        lambda: Get_Table_Groups(50902),
         validate_func=lambda x: len(set(v['Id'] for v in x)) == len(x)
     )
     
     suite.test(
         "Tabla inexistente maneja error en variables",
-        lambda: Get_Table_Variables(99999999),
+        lambda: Get_Table_Groups(99999999),
         expected_type=list
     )
     
     # Test 86-90: Valores de variables
     variable_values = suite.test(
         "Obtener valores de variable (si existe)",
-        lambda: Get_Variable_Values(1, 50902) if variables and len(variables) > 0 else [],
+        lambda: Get_Variable_Values(115) if variables and len(variables) > 0 else [],
         expected_type=list
     )
     
     suite.test(
         "Valores tienen estructura correcta",
-        lambda: Get_Variable_Values(1, 50902),
+        lambda: Get_Variable_Values(115),
         expected_type=list
     )
     
     suite.test(
         "Variable inexistente maneja error",
-        lambda: Get_Variable_Values(99999, 50902),
+        lambda: Get_Variable_Values(99999),
         expected_type=list
     )
     
     suite.test(
         "Resultado variables es JSON serializable",
-        lambda: json.dumps(Get_Table_Variables(50902)[:3]),
+        lambda: json.dumps(Get_Table_Groups(50902)[:3]),
         expected_type=str
     )
     
     suite.test(
         "Múltiples variables funcionan",
-        lambda: [Get_Table_Variables(50902), Get_Table_Variables(25171)],
+        lambda: [Get_Table_Groups(50902), Get_Table_Groups(25171)],
         validate_func=lambda x: len(x) == 2
     )
     
@@ -0,0 +1,33 @@
+"""Offline test setup: a throwaway cache directory, no upstream throttling and a fake clock"""
+import os
+import tempfile
+
+import pytest
+
+# Read by mcp_ine.common at import time, so set before any test imports the package
+os.environ['INE_CACHE_DIR'] = tempfile.mkdtemp(prefix='mcp-ine-tests-')
+os.environ['INE_RATE_LIMIT'] = '0'
+os.environ['INE_RECORD_MODE'] = ''
+os.environ.setdefault('INE_BASE_URL', 'http://127.0.0.1:9/wstempus/js')
+
+
+class FakeClock:
+    """Stands in for a module's `time`: time() and monotonic() read `now`, sleep() advances it"""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+        self.sleeps = []
+
+    def time(self) -> float:
+        return self.now
+
+    monotonic = perf_counter = time
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_clock():
+    return FakeClock()
@@ -0,0 +1,157 @@
+"""Tests for the per-host circuit breaker and stale-while-error serving"""
+import asyncio
+import time
+
+import pytest
+import requests
+
+from mcp_ine import breaker, common
+from mcp_ine.breaker import CircuitBreaker, CircuitOpenError, HostBreakers
+
+URL = 'https://servicios.ine.es/wstempus/js/ES/DATOS_TABLA/50902'
+
+
+@pytest.fixture
+def clock(fake_clock, monkeypatch):
+    monkeypatch.setattr(breaker, 'time', fake_clock)
+    return fake_clock
+
+
+def tripped(clock, **kwargs):
+    circuit = CircuitBreaker(**{'threshold': 0.5, 'min_calls': 4, 'window': 60, 'cooldown': 30, **kwargs})
+    for ok in (True, False, True, False):
+        assert circuit.allow() == 0
+        circuit.record(ok)
+    return circuit
+
+
+def test_stays_closed_below_min_calls(clock):
+    circuit = CircuitBreaker(threshold=0.5, min_calls=4)
+    for _ in range(3):
+        circuit.record(False)
+    assert circuit.state == 'closed' and circuit.allow() == 0
+
+
+def test_opens_at_the_failure_threshold_and_rejects(clock):
+    circuit = tripped(clock)
+    assert circuit.state == 'open'
+    clock.now += 10
+    assert circuit.allow() == pytest.approx(20)
+    assert circuit.stats()['rejected'] == 1 and circuit.stats()['opened'] == 1
+
+
+def test_old_failures_leave_the_window(clock):
+    circuit = CircuitBreaker(threshold=0.5, min_calls=4, window=60)
+    circuit.record(False)
+    circuit.record(False)
+    clock.now += 61
+    circuit.record(False)
+    circuit.record(True)
+    circuit.record(True)
+    assert circuit.state == 'closed'
+
+
+def test_half_open_lets_one_probe_through(clock):
+    circuit = tripped(clock)
+    clock.now += 30
+    assert circuit.allow() == 0
+    assert circuit.state == 'half_open'
+    assert circuit.allow() > 0  # only one probe at a time
+
+
+def test_successful_probe_closes(clock):
+    circuit = tripped(clock)
+    clock.now += 30
+    circuit.allow()
+    circuit.record(True)
+    assert circuit.state == 'closed'
+    assert circuit.stats()['recent_calls'] == 0
+    assert circuit.allow() == 0
+
+
+def test_failed_probe_reopens(clock):
+    circuit = tripped(clock)
+    clock.now += 30
+    circuit.allow()
+    circuit.record(False)
+    assert circuit.state == 'open'
+    assert circuit.allow() == pytest.approx(30)
+    assert circuit.stats()['opened'] == 2
+
+
+def test_lost_probe_is_replaced_after_a_cooldown(clock):
+    circuit = tripped(clock)
+    clock.now += 30
+    assert circuit.allow() == 0
+    clock.now += 10
+    assert circuit.allow() > 0
+    clock.now += 20
+    assert circuit.allow() == 0
+
+
+def test_host_breakers_are_per_host(clock):
+    breakers = HostBreakers(threshold=0.5, min_calls=2, cooldown=30)
+    breakers.record(URL, False)
+    breakers.record(URL, False)
+    with pytest.raises(CircuitOpenError):
+        breakers.check(URL)
+    breakers.check('https://www.ine.es/Censo2021/api')
+    assert HostBreakers(threshold=0).get(URL) is None
+
+
+@pytest.fixture
+def outage(monkeypatch):
+    """Expired cache entry for DATOS_TABLA/50902 while the circuit is open"""
+    key = common.cache_key(common._ine_url('DATOS_TABLA', '50902'), None)
+    common.response_cache.put(key, [{"COD": "T1", "Data": []}], 60, '[{"COD": "T1", "Data": []}]')
+    common.response_cache.set_expiry(key, time.time() - 5)
+    errors = [CircuitOpenError('servicios.ine.es', 30)]
+
+    def fail(*args, **kwargs):
+        raise errors[0]
+
+    async def fail_async(*args, **kwargs):
+        raise errors[0]
+    monkeypatch.setattr(common, 'send', fail)
+    monkeypatch.setattr(common, 'send_async', fail_async)
+    yield errors
+    common.response_cache.clear()
+
+
+def served_during(call):
+    served = []
+    token = common._stale_served.set(served)
+    try:
+        return call(), served
+    finally:
+        common._stale_served.reset(token)
+
+
+def test_outage_serves_the_stale_entry_and_marks_the_result(outage):
+    result, served = served_during(lambda: common.ine_request('DATOS_TABLA', '50902'))
+    assert result == [{"COD": "T1", "Data": []}]
+    assert len(served) == 1
+    marked = common._mark_stale(result, served)
+    assert marked[-1]['_stale'] is True and 'INE API unavailable' in marked[-1]['_info']
+    assert common._mark_stale({"COD": "T1"}, served)['_stale'] is True
+
+
+def test_outage_serves_the_stale_entry_on_the_async_path(outage):
+    async def run():
+        served = []
+        token = common._stale_served.set(served)
+        try:
+            return await common.ine_request_async('DATOS_TABLA', '50902'), served
+        finally:
+            common._stale_served.reset(token)
+    result, served = asyncio.run(run())
+    assert result == [{"COD": "T1", "Data": []}]
+    assert len(served) == 1
+
+
+def test_client_errors_are_not_served_stale(outage):
+    response = requests.Response()
+    response.status_code = 404
+    outage[0] = requests.HTTPError('not found', response=response)
+    result, served = served_during(lambda: common.ine_request('DATOS_TABLA', '50902'))
+    assert "error" in result and served == []
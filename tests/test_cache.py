@@ -0,0 +1,18 @@
+"""Tests for the response cache on the async request path"""
+import asyncio
+
+import httpx
+
+from mcp_ine import common
+
+
+def test_async_outage_without_a_stale_entry_stays_off_the_sync_cache(monkeypatch):
+    def sync_lookup(key):
+        raise AssertionError("sync disk-tier lookup on the event loop")
+
+    async def fail(*args, **kwargs):
+        raise httpx.ConnectError('down')
+    monkeypatch.setattr(common.response_cache, 'lookup', sync_lookup)
+    monkeypatch.setattr(common, 'send_async', fail)
+    result = asyncio.run(common.ine_request_async('DATOS_TABLA', 'never-cached'))
+    assert result == {"error": "down"}
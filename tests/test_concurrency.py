@@ -0,0 +1,61 @@
+"""Tests for concurrent auto-pagination"""
+import asyncio
+
+from mcp_ine.concurrency import Page, iter_pages, collect
+
+
+def fetcher(pages):
+    """fetch_page over `pages(n)`, recording every page number requested"""
+    calls = []
+
+    async def fetch(page):
+        calls.append(page)
+        await asyncio.sleep(0)
+        return pages(page)
+    return fetch, calls
+
+
+def run(fetch, **kwargs):
+    return asyncio.run(collect(iter_pages(fetch, **kwargs)))
+
+
+def test_pages_in_order_until_short_page():
+    fetch, calls = fetcher(lambda n: [n * 10 + i for i in range(3 if n < 4 else 1)])
+    pages = run(fetch, concurrency=4, page_size=3)
+    assert [p[0] for p in pages] == [10, 20, 30, 40]
+    assert pages[-1] == [40]
+    assert max(calls) <= 4 + 4
+
+
+def test_short_first_page_is_the_only_request():
+    fetch, calls = fetcher(lambda n: [1, 2] if n == 1 else [])
+    assert run(fetch, concurrency=4, page_size=500) == [[1, 2]]
+    assert calls == [1]
+
+
+def test_full_first_page_learns_the_page_size():
+    fetch, calls = fetcher(lambda n: [n, n] if n <= 2 else [n])
+    assert run(fetch, concurrency=4) == [[1, 1], [2, 2], [3]]
+
+
+def test_endpoint_ignoring_page_stops_at_the_repeat():
+    fetch, calls = fetcher(lambda n: list(range(500)))
+    assert run(fetch, concurrency=4, page_size=500) == [list(range(500))]
+    assert len(calls) <= 2
+
+
+def test_max_pages_bounds_an_endless_listing():
+    fetch, calls = fetcher(lambda n: [n] * 5)
+    pages = run(fetch, concurrency=4, page_size=5, max_pages=7)
+    assert len(pages) == 7
+    assert max(calls) == 7
+
+
+def test_error_page_is_yielded_and_ends_the_stream():
+    fetch, calls = fetcher(lambda n: [n] * 2 if n == 1 else [{"error": "boom"}])
+    assert run(fetch, concurrency=1, page_size=2) == [[1, 1], [{"error": "boom"}]]
+
+
+def test_filtered_page_keeps_paging_on_upstream_size():
+    fetch, calls = fetcher(lambda n: Page([n], size=3) if n < 3 else Page([], size=1))
+    assert run(fetch, concurrency=2, page_size=3) == [[1], [2]]
@@ -0,0 +1,170 @@
+"""Tests for chunked results and their cursors"""
+import asyncio
+from contextlib import aclosing
+
+import pytest
+
+from mcp_ine import cursors, tools
+from mcp_ine.concurrency import iter_pages
+from mcp_ine.cursors import CursorStore
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cursors.time, 'time', clock)
+    return clock
+
+
+def test_small_result_is_returned_as_is():
+    store = CursorStore(max_items=5)
+    assert asyncio.run(store.chunk([1, 2, 3])) == [1, 2, 3]
+    assert store.stats()['open'] == 0
+
+
+def test_list_chunks_resume_in_order():
+    async def run():
+        store = CursorStore(max_items=4)
+        chunk, seen = await store.chunk(list(range(10))), []
+        while True:
+            if isinstance(chunk[-1], dict) and '_cursor' in chunk[-1]:
+                seen += chunk[:-1]
+                chunk = await store.resume(chunk[-1]['_cursor'])
+            else:
+                return seen + chunk
+    assert asyncio.run(run()) == list(range(10))
+
+
+def test_same_cursor_returns_the_same_chunk():
+    async def run():
+        store = CursorStore(max_items=3)
+        token = (await store.chunk(list(range(10))))[-1]['_cursor']
+        return await store.resume(token), await store.resume(token)
+    first, again = asyncio.run(run())
+    assert first == again
+    assert first[:-1] == [3, 4, 5]
+
+
+def test_byte_budget_splits_chunks_but_keeps_one_item():
+    async def run():
+        store = CursorStore(max_items=100, max_bytes=10)
+        return await store.chunk(['x' * 50, 'y' * 50])
+    chunk = asyncio.run(run())
+    assert chunk[0] == 'x' * 50 and '_cursor' in chunk[1]
+
+
+def test_series_dict_chunks_its_data():
+    async def run():
+        store = CursorStore(max_items=2)
+        first = await store.chunk({"COD": "IPC1", "Data": [1, 2, 3]})
+        return first, await store.resume(first['_cursor'])
+    first, rest = asyncio.run(run())
+    assert first['COD'] == rest['COD'] == 'IPC1'
+    assert first['Data'] == [1, 2] and rest == {"COD": "IPC1", "Data": [3]}
+
+
+def test_iterator_is_read_lazily():
+    pulled = []
+
+    async def source():
+        for i in range(100):
+            pulled.append(i)
+            yield i
+
+    async def run():
+        store = CursorStore(max_items=5)
+        return await store.chunk(source())
+    chunk = asyncio.run(run())
+    assert chunk[:-1] == [0, 1, 2, 3, 4]
+    assert len(pulled) == 6  # one read ahead to know more remain
+
+
+def test_unknown_and_malformed_cursors():
+    store = CursorStore()
+    assert asyncio.run(store.resume('nope.3')) is None
+    assert asyncio.run(store.resume('')) is None
+
+
+def test_expired_cursor_is_rejected(clock):
+    async def run():
+        store = CursorStore(max_items=2, ttl=60)
+        token = (await store.chunk(list(range(5))))[-1]['_cursor']
+        clock.now += 61
+        return await store.resume(token), store.stats()
+    chunk, stats = asyncio.run(run())
+    assert chunk is None
+    assert stats['open'] == 0 and stats['expired'] == 1
+
+
+def test_resume_extends_the_ttl(clock):
+    async def run():
+        store = CursorStore(max_items=2, ttl=60)
+        token = (await store.chunk(list(range(9))))[-1]['_cursor']
+        clock.now += 50
+        token = (await store.resume(token))[-1]['_cursor']
+        clock.now += 50
+        return await store.resume(token)
+    assert asyncio.run(run())[:-1] == [4, 5]
+
+
+def test_expiry_closes_the_scan_and_cancels_its_reads(clock):
+    fetches, closed = [], []
+
+    async def fetch(page):
+        fetches.append(asyncio.current_task())
+        if page > 3:
+            await asyncio.Event().wait()  # later read-ahead pages never arrive
+        return [page] * 3
+
+    async def scan():
+        try:
+            async with aclosing(iter_pages(fetch, concurrency=4, page_size=3)) as pages:
+                async for page in pages:
+                    for item in page:
+                        yield item
+        finally:
+            closed.append(True)
+
+    async def run():
+        store = CursorStore(max_items=7, ttl=60)
+        token = (await store.chunk(scan()))[-1]['_cursor']
+        in_flight = [task for task in fetches[1:] if not task.done()]
+        clock.now += 61
+        result = await store.resume(token)
+        await asyncio.sleep(0)
+        # Checked inside the loop: asyncio.run would close and cancel them anyway on exit
+        return result, list(closed), in_flight, [task.cancelled() for task in in_flight]
+    result, closed_on_expiry, in_flight, cancelled = asyncio.run(run())
+    assert result is None
+    assert closed_on_expiry == [True]
+    assert in_flight and all(cancelled)
+
+
+def test_capacity_evicts_the_least_recently_used():
+    async def run():
+        store = CursorStore(max_items=1, capacity=2)
+        tokens = [(await store.chunk([i, i]))[-1]['_cursor'] for i in range(3)]
+        return [await store.resume(token) for token in tokens]
+    assert [chunk if chunk is None else chunk[0] for chunk in asyncio.run(run())] == [None, 1, 2]
+
+
+def test_tools_reject_a_cursor_of_the_other_kind():
+    async def run():
+        listing = (await tools.result_cursors.chunk(list(range(tools.result_cursors.max_items + 1))))[-1]['_cursor']
+        series = (await tools.result_cursors.chunk(
+            {"COD": "IPC1", "Data": list(range(tools.result_cursors.max_items + 1))}))['_cursor']
+        return (await tools._resume(listing, series=True), await tools._resume(series),
+                await tools._resume(listing), await tools._resume(series, series=True))
+    as_series, as_listing, listing, series = asyncio.run(run())
+    assert "error" in as_series
+    assert "error" in as_listing[0]
+    assert listing == [tools.result_cursors.max_items]
+    assert series['Data'] == [tools.result_cursors.max_items]
@@ -0,0 +1,93 @@
+"""Tests for coalescing identical in-flight upstream requests"""
+import asyncio
+import threading
+import time
+
+from mcp_ine import common
+from mcp_ine.breaker import CircuitOpenError
+from mcp_ine.flight import SingleFlight
+
+
+def test_concurrent_threads_share_one_call():
+    flight, calls, release = SingleFlight(), [], threading.Event()
+
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        return {"value": 1}
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do('k', fn))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while flight.counters['coalesced'] < 3:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert calls == [1] and results == [{"value": 1}] * 4
+
+
+def test_cancelled_waiter_does_not_cancel_the_others():
+    async def run():
+        flight, release = SingleFlight(), asyncio.Event()
+
+        async def fn():
+            await release.wait()
+            return 42
+        first = asyncio.ensure_future(flight.do_async('k', fn))
+        second = asyncio.ensure_future(flight.do_async('k', fn))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+        return await second, flight.counters
+    assert asyncio.run(run()) == (42, {'executed': 1, 'coalesced': 1})
+
+
+def stale_entry(function, input_param):
+    key = common.cache_key(common._ine_url(function, input_param), None)
+    common.response_cache.put(key, [{"COD": "T1", "Data": []}], 60, '[{"COD": "T1", "Data": []}]')
+    common.response_cache.set_expiry(key, time.time() - 5)
+
+
+def test_every_coalesced_caller_is_flagged_stale(monkeypatch):
+    stale_entry('DATOS_TABLA', 'coalesced')
+
+    async def outage(*args, **kwargs):
+        await asyncio.sleep(0.05)
+        raise CircuitOpenError('servicios.ine.es', 30)
+    monkeypatch.setattr(common, 'send_async', outage)
+
+    async def call():
+        served = []
+        common._stale_served.set(served)  # each task has its own context, as each tool call does
+        return await common.ine_request_async('DATOS_TABLA', 'coalesced'), served
+
+    async def run():
+        return await asyncio.gather(*(call() for _ in range(3)))
+    before = common.inflight.counters['coalesced']
+    results = asyncio.run(run())
+    assert common.inflight.counters['coalesced'] - before == 2
+    assert all(result == [{"COD": "T1", "Data": []}] for result, _ in results)
+    assert all(len(served) == 1 for _, served in results)
+
+
+def test_coalesced_threads_are_flagged_stale(monkeypatch):
+    stale_entry('DATOS_TABLA', 'coalesced-sync')
+
+    def outage(*args, **kwargs):
+        time.sleep(0.1)
+        raise CircuitOpenError('servicios.ine.es', 30)
+    monkeypatch.setattr(common, 'send', outage)
+    flagged = []
+
+    def call():
+        served = []
+        common._stale_served.set(served)
+        common.ine_request('DATOS_TABLA', 'coalesced-sync')
+        flagged.append(len(served))
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert flagged == [1, 1, 1]
@@ -0,0 +1,127 @@
+"""Tests for per-host token buckets and retries with backoff"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from mcp_ine import ratelimit
+from mcp_ine.ratelimit import RateLimiter, TokenBucket, retry_after
+
+URL = 'https://servicios.ine.es/wstempus/js/ES/DATOS_TABLA/50902'
+
+
+@pytest.fixture
+def clock(fake_clock, monkeypatch):
+    monkeypatch.setattr(ratelimit, 'time', fake_clock)
+    monkeypatch.setattr(ratelimit.random, 'uniform', lambda low, high: high)  # no jitter
+    return fake_clock
+
+
+class Response:
+    def __init__(self, status_code, headers=None):
+        self.status_code, self.headers, self.closed = status_code, headers or {}, False
+
+    def close(self):
+        self.closed = True
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_burst_then_refill_at_the_rate(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+    clock.now += 10
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]  # refilled up to the burst, no more
+    assert bucket.reserve() == pytest.approx(0.5)
+
+
+def test_throttling_halves_the_rate_and_pauses(clock):
+    bucket = TokenBucket(rate=16, burst=10)
+    bucket.throttled(5)
+    assert bucket.rate == 8
+    assert bucket.reserve() == pytest.approx(5)
+    for _ in range(10):
+        bucket.throttled(0)
+    assert bucket.rate == 1  # floor: 1/16 of the configured rate
+    for _ in range(3):
+        bucket.succeeded()
+    assert bucket.rate == pytest.approx(1 + 3 * 16 / 32)
+    for _ in range(100):
+        bucket.succeeded()
+    assert bucket.rate == 16
+
+
+def test_backoff_doubles_up_to_the_cap(clock):
+    limiter = RateLimiter(retries=5, base_delay=0.5, max_delay=3)
+    assert [limiter.backoff(n) for n in range(6)] == [0.5, 1, 2, 3, 3, None]
+
+
+def test_retry_after_sets_the_minimum_wait(clock):
+    limiter = RateLimiter(retries=3, base_delay=0.5, max_delay=30)
+    assert limiter.backoff(0, after=4) == pytest.approx(4.05)
+    assert limiter.backoff(0, after=60) is None  # longer than max_delay: not waited out
+
+
+def test_retry_after_header():
+    assert retry_after({'Retry-After': '7'}) == 7
+    assert retry_after({'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}) == 0
+    assert retry_after({'Retry-After': 'soon'}) is None
+    assert retry_after({}) is None
+
+
+def test_send_retries_5xx_and_429_then_succeeds(clock):
+    limiter = RateLimiter(rate=100, burst=10, retries=3, base_delay=0.5)
+    responses = [Response(503), Response(429, {'Retry-After': '2'}), Response(200)]
+    result = limiter.send(URL, lambda: responses.pop(0))
+    assert result.status_code == 200
+    assert clock.sleeps[0] == 0.5
+    assert clock.sleeps[1] == pytest.approx(2 + 0.1)
+    assert limiter.counters['retries'] == 2 and limiter.counters['throttled'] == 1
+    assert limiter.stats()['hosts']['servicios.ine.es']['rate'] == pytest.approx(50 + 100 / 32, abs=0.01)  # halved, then one success
+
+
+def test_send_gives_up_after_the_retries(clock):
+    limiter = RateLimiter(rate=0, retries=2, base_delay=1)
+    calls = []
+
+    def call():
+        calls.append(1)
+        raise requests.Timeout('slow')
+    with pytest.raises(requests.Timeout):
+        limiter.send(URL, call)
+    assert len(calls) == 3
+    assert clock.sleeps == [1, 2]
+
+
+def test_send_returns_the_last_retryable_response(clock):
+    limiter = RateLimiter(rate=0, retries=1, base_delay=1)
+    first, last = Response(502), Response(502)
+    responses = [first, last]
+    assert limiter.send(URL, lambda: responses.pop(0)) is last
+    assert first.closed and not last.closed
+
+
+def test_send_waits_for_a_token(clock):
+    limiter = RateLimiter(rate=1, burst=1, retries=0)
+    limiter.send(URL, lambda: Response(200))
+    limiter.send(URL, lambda: Response(200))
+    assert clock.sleeps == [pytest.approx(1)]
+
+
+def test_send_async_retries_with_backoff(clock, monkeypatch):
+    slept = []
+
+    async def sleep(seconds):
+        slept.append(seconds)
+    monkeypatch.setattr(ratelimit, 'asyncio', SimpleNamespace(sleep=sleep))
+    limiter = RateLimiter(rate=0, retries=3, base_delay=0.5)
+    responses = [Response(500), Response(504), Response(200)]
+
+    async def call():
+        return responses.pop(0)
+    assert asyncio.run(limiter.send_async(URL, call)).status_code == 200
+    assert slept == [0.5, 1]
@@ -0,0 +1,97 @@
+"""Tests for expiring cached DATOS_* responses at the next INE release"""
+import asyncio
+
+import pytest
+
+from mcp_ine import common, releases
+from mcp_ine.releases import ReleaseCalendar
+
+NOW = 1_750_000_000.0
+DAY = 86400
+TABLE = [{"COD": "T1", "FK_Operacion": 25, "Data": []}]
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    monkeypatch.setattr(releases.time, 'time', lambda: NOW)
+
+
+def dates(*days):
+    return [{"Id": i, "Fecha": int((NOW + d * DAY) * 1000)} for i, d in enumerate(days)]
+
+
+def calendar(*days, **kwargs):
+    calendar = ReleaseCalendar(**kwargs)
+    calendar.observe('TABLAS_OPERACION', '25', [{"Id": 50902, "FK_Publicacion": 8}])
+    calendar.observe('PUBLICACIONFECHA_PUBLICACION', '8', dates(*days))
+    return calendar
+
+
+def test_table_data_expires_at_the_next_release():
+    assert calendar(-20, 10, 40).expiry('DATOS_TABLA', '50902', TABLE) == NOW + 10 * DAY
+
+
+def test_expiry_is_capped_at_max_ttl():
+    assert calendar(90).expiry('DATOS_TABLA', '50902', TABLE) == NOW + 45 * DAY
+    assert calendar(90, max_ttl=DAY).expiry('DATOS_TABLA', '50902', TABLE) == NOW + DAY
+
+
+def test_grace_period_after_a_release_falls_back_to_the_fixed_ttl():
+    assert calendar(-0.5, 10).expiry('DATOS_TABLA', '50902', TABLE) is None
+    assert calendar(-2, 10).expiry('DATOS_TABLA', '50902', TABLE) == NOW + 10 * DAY
+
+
+def test_no_calendar_falls_back_to_the_fixed_ttl():
+    empty = ReleaseCalendar()
+    assert empty.expiry('DATOS_TABLA', '50902', TABLE) is None
+    assert calendar(-30, -5).expiry('DATOS_TABLA', '50902', TABLE) is None  # no upcoming release
+    assert calendar(10).expiry('SERIES_TABLA', '50902', TABLE) is None  # not release data
+
+
+def test_missing_walks_series_operation_publications_dates():
+    cal = ReleaseCalendar()
+    data = {"COD": "IPC251856", "Data": []}
+    assert cal.missing('DATOS_SERIE', 'IPC251856', data) == ('SERIE', 'IPC251856')
+    cal.observe('SERIE', 'IPC251856', {"COD": "IPC251856", "FK_Operacion": 25})
+    assert cal.missing('DATOS_SERIE', 'IPC251856', data) == ('PUBLICACIONES_OPERACION', '25')
+    cal.observe('PUBLICACIONES_OPERACION', '25', [{"Id": 8}])
+    assert cal.missing('DATOS_SERIE', 'IPC251856', data) == ('PUBLICACIONFECHA_PUBLICACION', '8')
+    cal.observe('PUBLICACIONFECHA_PUBLICACION', '8', dates(3))
+    assert cal.missing('DATOS_SERIE', 'IPC251856', data) is None
+    assert cal.expiry('DATOS_SERIE', 'IPC251856', data) == NOW + 3 * DAY
+
+
+def test_publication_dates_are_refreshed_daily(monkeypatch):
+    cal = calendar(10, dates_ttl=DAY)
+    assert cal.missing('DATOS_TABLA', '50902', TABLE) is None
+    monkeypatch.setattr(releases.time, 'time', lambda: NOW + DAY + 1)
+    assert cal.missing('DATOS_TABLA', '50902', TABLE) == ('PUBLICACIONFECHA_PUBLICACION', '8')
+
+
+def fake_upstream(monkeypatch, responses):
+    """common.ine_request_async over canned catalogue responses; records set_expiry calls"""
+    expiries = []
+
+    async def fake(function, input_param=None, params=None):
+        return responses.get(function, {"error": "unavailable"})
+    monkeypatch.setattr(common, 'ine_request_async', fake)
+    monkeypatch.setattr(common, 'release_calendar', ReleaseCalendar())
+    monkeypatch.setattr(common.response_cache, 'set_expiry', lambda key, expires: expiries.append((key, expires)))
+    return expiries
+
+
+def test_cached_table_data_expires_at_the_next_release(monkeypatch):
+    expiries = fake_upstream(monkeypatch, {
+        'SERIE': {"COD": "T1", "FK_Operacion": 25},
+        'PUBLICACIONES_OPERACION': [{"Id": 8}],
+        'PUBLICACIONFECHA_PUBLICACION': dates(-20, 10, 40),
+    })
+    asyncio.run(common._apply_release_expiry_async('DATOS_TABLA', '50902', 'k', TABLE))
+    assert expiries == [('k', NOW + 10 * DAY)]
+
+
+def test_unreachable_calendar_keeps_the_fixed_ttl(monkeypatch):
+    expiries = fake_upstream(monkeypatch, {'SERIE': {"COD": "T1", "FK_Operacion": 25}})
+    asyncio.run(common._apply_release_expiry_async('DATOS_TABLA', '50902', 'k', TABLE))
+    assert expiries == []
+    assert common._cache_ttl('DATOS_TABLA') == common.CACHE_TTLS['DATOS_TABLA']
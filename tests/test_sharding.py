@@ -0,0 +1,89 @@
+"""Tests for splitting long date ranges into shards and merging the shard responses"""
+import asyncio
+from datetime import date
+
+from mcp_ine import resources as r
+from mcp_ine.sharding import date_shards, merge_shards
+
+
+def bounds(shards):
+    return [tuple(shard.split(':')) for shard in shards]
+
+
+def test_monthly_shards_cover_the_range_without_gaps():
+    shards = date_shards('20000101:20191231', 1, 60)
+    assert shards == ['20000101:20041231', '20050101:20091231', '20100101:20141231', '20150101:20191231']
+
+
+def test_quarterly_and_annual_shards_span_more_months():
+    assert date_shards('19900101:20191231', 3, 60) == ['19900101:20041231', '20050101:20191231']
+    assert date_shards('19000101:20191231', 12, 60) == ['19000101:19591231', '19600101:20191231']
+
+
+def test_unknown_periodicity_shards_monthly():
+    assert len(date_shards('20000101:20191231', None, 60)) == 4
+
+
+def test_mid_month_start_and_end_are_kept():
+    shards = date_shards('20000115:20030610', 1, 12)
+    assert shards[0] == '20000115:20001231'
+    assert shards[-1] == '20030101:20030610'
+    for (_, hi), (lo, _) in zip(bounds(shards), bounds(shards)[1:]):
+        assert (date(int(lo[:4]), int(lo[4:6]), int(lo[6:])) - date(int(hi[:4]), int(hi[4:6]), int(hi[6:]))).days == 1
+
+
+def test_open_range_ends_today():
+    shards = date_shards('20100101:', 1, 60, today=date(2024, 6, 30))
+    assert shards == ['20100101:20141231', '20150101:20191231', '20200101:20240630']
+
+
+def test_short_or_invalid_ranges_are_returned_unchanged():
+    assert date_shards('20200101:20241231', 1, 60) == ['20200101:20241231']
+    assert date_shards('20240101', 1, 1) == ['20240101']
+    assert date_shards('2024:2025', 1, 1) == ['2024:2025']
+    assert date_shards('20250101:20240101', 1, 1) == ['20250101:20240101']
+
+
+def point(fecha, valor):
+    return {"Fecha": fecha, "Valor": valor}
+
+
+def test_merge_keeps_series_order_and_sorts_points():
+    responses = [
+        [{"COD": "B", "Nombre": "b", "Data": [point(3, 1), point(4, 1)]},
+         {"COD": "A", "Nombre": "a", "Data": [point(3, 1)]}],
+        [{"COD": "A", "Nombre": "a", "Data": [point(1, 1), point(2, 1)]},
+         {"COD": "B", "Nombre": "b", "Data": [point(1, 1)]}],
+    ]
+    merged = merge_shards(responses)
+    assert [s['COD'] for s in merged] == ['B', 'A']
+    assert [[p['Fecha'] for p in s['Data']] for s in merged] == [[1, 3, 4], [1, 2, 3]]
+    assert merged[0]['Nombre'] == 'b'
+
+
+def test_merge_deduplicates_boundary_points_by_fecha():
+    merged = merge_shards([{"COD": "A", "Data": [point(1, 1), point(2, 1)]},
+                           {"COD": "A", "Data": [point(2, 2), point(3, 2)]}])
+    assert merged == [{"COD": "A", "Data": [point(1, 1), point(2, 2), point(3, 2)]}]
+
+
+def test_merge_skips_items_without_a_code():
+    assert merge_shards([[{"status": "sin datos"}, "x"], []]) == []
+
+
+def test_table_periodicity_reads_only_the_first_series(monkeypatch):
+    pulled, closed = [], []
+
+    async def stream(function, input_param=None, params=None):
+        try:
+            for i in range(1000):
+                pulled.append(i)
+                yield {"COD": f"T{i}", "FK_Periodicidad": 3}
+        finally:
+            closed.append(function)
+
+    monkeypatch.setattr(r, 'ine_stream_async', stream)
+    monkeypatch.setattr(r, '_table_periodicities', {})
+    assert asyncio.run(r._shard_periodicity_async("DATOS_TABLA", "50902")) == 3
+    assert asyncio.run(r._shard_periodicity_async("DATOS_TABLA", "50902")) == 3
+    assert pulled == [0] and closed == ["SERIES_TABLA"]
@@ -0,0 +1,115 @@
+"""Tests for the local series store and incremental nult refreshes"""
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from mcp_ine import resources as r
+from mcp_ine.common import response_cache, series_store
+from mcp_ine.store import SeriesStore, fecha_date
+
+
+def fecha(year, month):
+    """INE Fecha: ms at Madrid midnight (UTC-1h in winter)"""
+    return int(datetime(year, month, 1, tzinfo=timezone.utc).timestamp() * 1000) - 3600000
+
+
+HISTORY = [fecha(2022 + m // 12, m % 12 + 1) for m in range(36)]
+
+
+def series(cod, fechas, value=1.0):
+    return {"COD": cod, "Nombre": cod, "Data": [{"Fecha": f, "Valor": value} for f in fechas]}
+
+
+def test_fecha_date_is_the_madrid_day():
+    assert fecha_date(fecha(2024, 1)) == '20240101'
+
+
+def test_since_restarts_at_the_revision_window():
+    store = SeriesStore(revision=3)
+    key = store.key('DATOS_SERIE', 'IPC1', {'nult': 12, 'det': 2})
+    assert key == store.key('DATOS_SERIE', 'IPC1', {'det': 2, 'nult': 24})
+    assert store.since(key, 12) is None
+    store.merge(key, [series('IPC1', HISTORY[-12:])])
+    assert store.since(key, 12) == fecha_date(HISTORY[-3])
+
+
+def test_incremental_merge_replaces_revised_points_and_appends_new_ones():
+    store = SeriesStore(revision=3)
+    key = store.key('DATOS_SERIE', 'IPC1')
+    store.merge(key, [series('IPC1', HISTORY[-13:-1], 1.0)])
+    store.merge(key, [series('IPC1', HISTORY[-4:], 2.0)])
+    data = store.read(key, 12)[0]['Data']
+    assert [p['Fecha'] for p in data] == HISTORY[-12:]
+    assert [p['Valor'] for p in data] == [1.0] * 8 + [2.0] * 4
+    assert store.since(key, 12) == fecha_date(HISTORY[-3])
+
+
+def test_larger_nult_forces_a_full_refetch():
+    store = SeriesStore()
+    key = store.key('DATOS_SERIE', 'IPC1')
+    store.merge(key, [series('IPC1', HISTORY[-12:])])
+    assert store.since(key, 12) is not None
+    assert store.since(key, 24) is None
+
+
+def test_full_history_serves_any_nult():
+    store = SeriesStore()
+    key = store.key('DATOS_SERIE', 'IPC1')
+    store.merge(key, [series('IPC1', HISTORY[-5:])], full=True)
+    assert store.since(key, 500) is not None
+
+
+def test_read_keeps_download_order():
+    store = SeriesStore()
+    key = store.key('DATOS_TABLA', '50902')
+    store.merge(key, [series('B', HISTORY[-2:]), series('A', HISTORY[-2:])])
+    store.merge(key, [series('A', HISTORY[-1:]), series('B', HISTORY[-1:])])
+    assert [s['COD'] for s in store.read(key)] == ['B', 'A']
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Fake DATOS_SERIE over a 36-month history; records the params of each request"""
+    requests = []
+
+    async def fake(function, input_param=None, params=None):
+        requests.append(dict(params or {}))
+        fechas = HISTORY
+        if 'nult' in params:
+            fechas = HISTORY[-params['nult']:]
+        elif 'date' in params:
+            start = params['date'].rstrip(':')
+            fechas = [f for f in HISTORY if fecha_date(f) >= start]
+        return series(input_param, fechas, float(len(requests)))
+    monkeypatch.setattr(r, 'ine_request_async', fake)
+    monkeypatch.setattr(r, 'INE_SERIES_STORE', True)
+    return requests
+
+
+def test_nult_requests_refresh_incrementally(upstream):
+    code = 'STORE_INCREMENTAL'
+    first = asyncio.run(r.get_series_data_async(code, nult=12))
+    second = asyncio.run(r.get_series_data_async(code, nult=12))
+    assert upstream[0] == {'nult': 12}
+    assert upstream[1] == {'date': fecha_date(HISTORY[-3]) + ':'}
+    assert [p['Fecha'] for p in second['Data']] == [p['Fecha'] for p in first['Data']] == HISTORY[-12:]
+    assert [p['Valor'] for p in second['Data']] == [1.0] * 9 + [2.0] * 3
+
+
+def test_larger_nult_refetches_the_full_window(upstream):
+    code = 'STORE_WIDER'
+    asyncio.run(r.get_series_data_async(code, nult=6))
+    result = asyncio.run(r.get_series_data_async(code, nult=24))
+    assert upstream[1] == {'nult': 24}
+    assert [p['Fecha'] for p in result['Data']] == HISTORY[-24:]
+
+
+def test_store_survives_a_cache_clear(upstream):
+    code = 'STORE_CLEAR'
+    asyncio.run(r.get_series_data_async(code, nult=12))
+    response_cache.clear()
+    result = asyncio.run(r.get_series_data_async(code, nult=12))
+    assert upstream[1] == {'date': fecha_date(HISTORY[-3]) + ':'}
+    assert len(result['Data']) == 12
+    assert series_store.stats()['datasets'] >= 1
@@ -0,0 +1,112 @@
+"""Tests for the incremental JSON array decoder"""
+import asyncio
+import json
+
+import pytest
+
+from mcp_ine.streaming import ItemParser, iter_json_items, aiter_json_items
+
+ITEMS = [
+    {"COD": "IPC251856", "Nombre": "Índice general. Variación \"anual\".\n", "Data": [
+        {"Fecha": 1704063600000, "Valor": 3.4, "Secreto": False},
+        {"Fecha": 1706742000000, "Valor": -0.25e1, "Secreto": False}]},
+    [[1, [2, [3, []]]], {"a": [{"b": []}]}],
+    "tab\tslash\\ quote\" unicode é€\U0001F600 \\u escaped",
+    12345,
+    -7.5e-3,
+    None,
+    True,
+    {},
+    [],
+]
+BODY = json.dumps(ITEMS, ensure_ascii=False, indent=1).encode('utf-8')
+
+
+def split(body, size):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 64, len(BODY)])
+def test_every_chunk_size_yields_the_same_items(size):
+    assert list(iter_json_items(split(BODY, size))) == ITEMS
+
+
+def test_every_split_point():
+    for cut in range(1, len(BODY)):
+        assert list(iter_json_items([BODY[:cut], BODY[cut:]])) == ITEMS, cut
+
+
+def test_items_arrive_before_the_body_ends():
+    parser = ItemParser()
+    first = json.dumps(ITEMS[0]).encode()
+    assert parser.feed(b'[' + first + b',') == [ITEMS[0]]
+    assert parser.feed(b' 12') == []  # the number could still continue
+    assert parser.feed(b'3,') == [123]
+    assert parser.feed(b'4]') == [4]
+    assert parser.close() == []
+
+
+def test_multibyte_character_split_across_chunks():
+    body = json.dumps(["€uro"], ensure_ascii=False).encode('utf-8')
+    cut = body.index('€'.encode('utf-8')) + 1
+    assert list(iter_json_items([body[:cut], body[cut:]])) == ["€uro"]
+
+
+def test_escapes_split_across_chunks():
+    body = b'["a\\u00e9\\"b\\\\", "c"]'
+    for cut in range(1, len(body)):
+        assert list(iter_json_items([body[:cut], body[cut:]])) == ['aé"b\\', 'c']
+
+
+def test_empty_array_and_whitespace():
+    assert list(iter_json_items([b' \n[', b' ', b']\n'])) == []
+    assert list(iter_json_items([])) == []
+
+
+def test_non_array_body_is_returned_whole():
+    body = json.dumps({"status": "No se han encontrado datos", "items": [1, 2]}).encode()
+    assert list(iter_json_items(split(body, 5))) == [{"status": "No se han encontrado datos", "items": [1, 2]}]
+
+
+@pytest.mark.parametrize('body', [b'[{"a": 1}, {"b": ', b'[1, 2', b'[{"a": 1}', b'[1, 2,', b'{"a": '])
+def test_truncated_body_raises(body):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_items(split(body, 3)))
+
+
+def test_truncated_body_keeps_the_complete_items():
+    items = iter_json_items([b'[{"a": 1}, {"b": 2}, {"c": '])
+    assert next(items) == {"a": 1}
+    assert next(items) == {"b": 2}
+    with pytest.raises(json.JSONDecodeError):
+        next(items)
+
+
+def test_missing_delimiter_raises():
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_items([b'[1 2]']))
+
+
+def test_large_element_is_not_redecoded_per_chunk():
+    item = {"Data": [{"Fecha": i, "Valor": i / 3} for i in range(20000)]}
+    body = json.dumps([item]).encode()
+    parser, attempts = ItemParser(), []
+    raw_decode = parser._decoder.raw_decode
+
+    def counting(s, idx=0):
+        attempts.append(idx)
+        return raw_decode(s, idx)
+    parser._decoder.raw_decode = counting
+    items = [x for chunk in split(body, 256) for x in parser.feed(chunk)] + parser.close()
+    assert items == [item]
+    assert len(attempts) < 40  # doubling retry: logarithmic, not one per chunk (~3000)
+
+
+def test_async_variant():
+    async def chunks():
+        for chunk in split(BODY, 11):
+            yield chunk
+
+    async def run():
+        return [item async for item in aiter_json_items(chunks())]
+    assert asyncio.run(run()) == ITEMS